@@ -1,160 +1,687 @@
-# -------------------------
-# Data models
-# -------------------------
-from uuid import uuid4
-from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-from database_manager import DatabaseManager, create_database
-
-
-@dataclass
-class Patient:
-    name: str
-    email: str
-
-
-@dataclass
-class Appointment:
-    id: str
-    patient: Patient
-    date: str
-    time: str
-    dentist: str
-    status: str = "Pending"
-    booked_at: datetime = field(default_factory=datetime.now)
-
-
-# -------------------------
-# Manager class
-# -------------------------
-class AppointmentManager:
-    def __init__(self):
-        self.appointments: Dict[str, Appointment] = {}
-        self.db = DatabaseManager()
-        # UNCOMMENT ONLY ON FIRST RUN TO CREATE DATABASE:
-        # create_database()
-
-        self.dentists = [
-            "Dr. Jhunsoy Love Jun",
-            "Dr. Jograd Ballesteros",
-            "Dr. Beyoncé Calubaquib",
-            "Dr. Estanislao Manansala",
-            "Dr. Federico Liwanag VII",
-            "Dr. Vergamino Antiporda",
-            "Dr. Princess Payapa Pamplona"
-        ]
-
-        # Admin credentials
-        self.admin_username = "admin"
-        self.admin_password = "admin123"
-
-        # Available time slots
-        self.time_slots = [
-            "08:00 AM", "08:30 AM", "09:00 AM", "09:30 AM",
-            "10:00 AM", "10:30 AM", "11:00 AM", "11:30 AM",
-            "01:00 PM", "01:30 PM", "02:00 PM", "02:30 PM",
-            "03:00 PM", "03:30 PM", "04:00 PM", "04:30 PM",
-            "05:00 PM", "05:30 PM"
-        ]
-
-    def verify_admin(self, username: str, password: str) -> bool:
-        """Verify admin credentials"""
-        return username == self.admin_username and password == self.admin_password
-
-    def reserve(self, patient: Patient, date: str, time: str, dentist: str, reason: str = "") -> Optional[Appointment]:
-        """Reserve appointment - checks database and saves to DB"""
-        # Check database for availability
-        if not self.db.check_slot_available(dentist, date, time):
-            return None
-
-        # Get or create patient in database
-        patient_result = self.db.get_patient_by_email(patient.email)
-        if patient_result:
-            patient_id = patient_result[0]
-        else:
-            self.db.add_patient(patient.name, patient.email, "N/A")
-            patient_result = self.db.get_patient_by_email(patient.email)
-            patient_id = patient_result[0]
-
-        # Create appointment
-        appt_id = str(uuid4())[:8]
-        appointment = Appointment(appt_id, patient, date, time, dentist, "Pending")
-
-        # Save to database
-        self.db.add_appointment(patient_id, appt_id, date, time, dentist, reason)
-
-        # Keep in-memory copy too
-        self.appointments[appt_id] = appointment
-        return appointment
-
-    def is_time_slot_available(self, dentist: str, date: str, time: str) -> bool:
-        """Check if a time slot is available for a specific dentist and date"""
-        return self.db.check_slot_available(dentist, date, time)
-
-    def get_available_slots(self, dentist: str, date: str) -> List[str]:
-        """Get all available time slots for a dentist on a specific date"""
-        available = []
-        for time_slot in self.time_slots:
-            if self.is_time_slot_available(dentist, date, time_slot):
-                available.append(time_slot)
-        return available
-
-    def cancel(self, appt_id: str) -> bool:
-        """Cancel appointment by ID"""
-        if appt_id in self.appointments:
-            del self.appointments[appt_id]
-            return self.db.delete_appointment_by_uuid(appt_id)
-        return False
-
-    def cancel_by_email(self, email: str) -> bool:
-        """Cancel appointment by patient email"""
-        if self.db.delete_appointment_by_email(email):
-            for appt_id, appt in list(self.appointments.items()):
-                if appt.patient.email == email:
-                    del self.appointments[appt_id]
-            return True
-        return False
-
-    def confirm_appointment(self, appt_id: str) -> bool:
-        """Confirm an appointment"""
-        if appt_id in self.appointments:
-            self.appointments[appt_id].status = "Confirmed"
-            self.db.update_appointment_status(appt_id, "Confirmed")
-            return True
-        return False
-
-    def decline_appointment(self, appt_id: str) -> bool:
-        """Decline an appointment"""
-        if appt_id in self.appointments:
-            self.appointments[appt_id].status = "Declined"
-            self.db.update_appointment_status(appt_id, "Declined")
-            return True
-        return False
-
-    def all_appointments(self) -> List[Appointment]:
-        """Retrieve all appointments from database"""
-        results = self.db.get_all_appointments()
-        appointments = []
-        for row in results:
-            appt_id, name, email, date, time, dentist, status, reason = row
-            patient = Patient(name, email)
-            appt = Appointment(appt_id, patient, date, time, dentist, status)
-            appointments.append(appt)
-        return appointments
-
-    def rebook(self, email: str, new_date: str, new_time: str, dentist: str, reason: str = "") -> Optional[Appointment]:
-        """Cancel old appointment by email and book a new one"""
-        # Get old patient info before canceling
-        patient_result = self.db.get_patient_by_email(email)
-        if not patient_result:
-            return None
-
-        name = patient_result[1]
-
-        # Cancel old appointment
-        self.cancel_by_email(email)
-
-        # Create new appointment with same patient info
-        patient = Patient(name=name, email=email)
-        return self.reserve(patient, new_date, new_time, dentist, reason)
\ No newline at end of file
+# -------------------------
+# Data models
+# -------------------------
+from datetime import date, datetime, time, timedelta
+from dataclasses import dataclass, field
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from cache import TTLCache
+from identity_map import IdentityMap
+from ids import IdGenerator, LENGTH as ID_LENGTH
+from prefix_index import PrefixIndex, word_suffixes
+from roster import Roster, DEFAULT_DENTISTS, DEFAULT_HOURS, DEFAULT_BREAKS
+from schedule import Schedule
+from storage import (AppointmentStorage, open_storage, normalize_email, DEFAULT_DURATION, RESERVED, SLOT_TAKEN, RESERVE_FAILED,
+                     UNAVAILABLE, DUPLICATE_ID, NOT_FOUND, ACTIVE_STATUSES, STALE_WATERMARK, ListingView, DEFAULT_VIEW)
+
+
+@dataclass
+class Patient:
+    name: str
+    email: str
+
+
+@dataclass
+class Appointment:
+    id: str
+    patient: Patient
+    date: date
+    time: time
+    dentist: str
+    status: str = "Pending"
+    duration: int = DEFAULT_DURATION  # minutes
+    booked_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class AppointmentDetails:
+    """What the listing leaves out, loaded when one appointment is opened"""
+    reason: str
+    booked_at: Optional[datetime]
+    gender: str
+    patient_since: Optional[datetime]
+
+
+# -------------------------
+# Manager class
+# -------------------------
+class AppointmentManager:
+    def __init__(self, db: Optional[AppointmentStorage] = None):
+        # One Appointment object per id, loaded from the DB on demand
+        self.appointments = IdentityMap(self._load_appointment, maxsize=1000)
+        # Short time-ordered appointment ids - new rows append to the unique index
+        self.ids = IdGenerator()
+        # MySQL unless DENTAL_DB says otherwise, e.g. DENTAL_DB=sqlite:///dental_clinic.db
+        self.db = db or open_storage()
+        # UNCOMMENT ONLY ON FIRST RUN TO CREATE THE MYSQL DATABASE:
+        # from database_manager import create_database; create_database()
+
+        # Read-through caches for what the UI keeps asking; every write below
+        # invalidates just the entries it can affect
+        self.listing_cache = TTLCache(maxsize=64, ttl=10.0)  # keyset pages and the total count
+        self.availability_cache = TTLCache(maxsize=512, ttl=30.0)  # (dentist, date) -> occupied cell mask
+        self.detail_cache = TTLCache(maxsize=128, ttl=60.0)  # appt_id -> AppointmentDetails
+
+        # Dentists, working hours, breaks and leave - loaded once, compiled to
+        # per dentist-day masks of the cells each dentist works
+        self.roster = self._load_roster()
+        self.dentists = self.roster.dentists
+        # Every cell anyone works in; slots as bit positions - a dentist-day is one int mask
+        self.time_slots = self.roster.time_slots
+        self.grid = self.roster.grid
+
+        # Returning patients for as-you-type suggestions - warmed here, kept
+        # current as bookings add patients
+        self.patient_index = PrefixIndex()  # of normalised emails
+        self.known_patients = {}  # normalize_email(email) -> Patient
+        self._load_patients()
+
+        # Admin credentials
+        self.admin_username = "admin"
+        self.admin_password = "admin123"
+
+        # Services and how long each takes, in minutes
+        self.services = {
+            "Check-up / consultation": 30,
+            "Teeth cleaning": 60,
+            "Oral examination & X-rays": 30,
+            "Fluoride treatment": 30,
+            "Sealants": 30,
+            "Fillings": 60,
+            "Crowns and bridges": 90,
+            "Dentures": 60,
+            "Dental implants": 120,
+            "Root canal treatment": 90,
+            "Teeth whitening": 60,
+            "Veneers": 90,
+            "Bonding": 60,
+            "Braces consultation": 30,
+            "Invisalign consultation": 30,
+            "Retainers": 30,
+            "Tooth extraction": 30,
+            "Wisdom tooth removal": 90,
+            "Surgical removal of impacted teeth": 120,
+            "Bone grafting": 120
+        }
+
+    def verify_admin(self, username: str, password: str) -> bool:
+        """Verify admin credentials"""
+        return username == self.admin_username and password == self.admin_password
+
+    def _load_roster(self) -> Roster:
+        """Roster from the DB, seeding the clinic's defaults into an empty one"""
+        roster = self.db.get_roster()
+        if roster is not None and not roster[0]:
+            for dentist in DEFAULT_DENTISTS:
+                self.db.add_dentist(dentist)
+                for weekday, start, end in DEFAULT_HOURS:
+                    self.db.set_working_hours(dentist, weekday, start, end)
+                for weekday, start, end in DEFAULT_BREAKS:
+                    self.db.add_break(dentist, weekday, start, end)
+            roster = self.db.get_roster()
+        leave = self.db.get_leave() if roster else None
+        if not roster or leave is None:
+            # Database unreachable - run on the defaults so the UI still comes up
+            return Roster(DEFAULT_DENTISTS,
+                          [(dentist, *hours) for dentist in DEFAULT_DENTISTS for hours in DEFAULT_HOURS],
+                          [(dentist, *hours) for dentist in DEFAULT_DENTISTS for hours in DEFAULT_BREAKS])
+        return Roster(*roster, leave=leave)
+
+    def _load_patients(self, batch_size: int = 5000):
+        """Fill the patient prefix index from the DB, one keyset page at a time"""
+        after = None
+        while True:
+            rows = self.db.get_patients(after, batch_size)
+            if not rows:
+                return
+            self.known_patients.update((normalize_email(email), Patient(name, email)) for _, name, email in rows)
+            self.patient_index.add_many((normalize_email(email), word_suffixes(name) + [email])
+                                        for _, name, email in rows)
+            after = rows[-1][0]
+
+    def _remember_patient(self, name: str, email: str):
+        key = normalize_email(email)
+        if key not in self.known_patients:
+            self.known_patients[key] = Patient(name, email)
+            self.patient_index.add(key, word_suffixes(name) + [email])
+
+    def suggest_patients(self, text: str, limit: int = 8) -> List[Patient]:
+        """Known patients whose name, a word of it or email starts with text, ignoring case and accents
+
+        Answered from memory; on a miss the DB's name/email indexes are asked,
+        for patients another client added since we warmed up.
+        """
+        keys = self.patient_index.search(text, limit)
+        if not keys and text.strip():
+            for name, email in self.db.find_patients(text.strip(), limit):
+                self._remember_patient(name, email)
+                keys.append(normalize_email(email))
+        return [self.known_patients[key] for key in keys]
+
+    def add_leave(self, dentist: Optional[str], day: date, reason: str = "") -> bool:
+        """Put a dentist on leave for a day - dentist None closes the clinic that day"""
+        if not self.db.set_leave(dentist, day, True, reason):
+            return False
+        self.roster.set_leave(dentist, day, True)
+        return True
+
+    def remove_leave(self, dentist: Optional[str], day: date) -> bool:
+        """Take a leave day (or clinic holiday) back off the calendar"""
+        if not self.db.set_leave(dentist, day, False):
+            return False
+        self.roster.set_leave(dentist, day, False)
+        return True
+
+    def service_duration(self, service: str) -> int:
+        """Minutes a service takes (one slot for anything unknown)"""
+        return self.services.get(service, DEFAULT_DURATION)
+
+    def reserve(self, patient: Patient, date: date, time: time, dentist: str, reason: str = "",
+                gender: str = "N/A", duration: int = DEFAULT_DURATION) -> Optional[Appointment]:
+        """Reserve appointment - None if the slot is taken or the booking failed"""
+        return self.try_reserve(patient, date, time, dentist, reason, gender, duration)[1]
+
+    def try_reserve(self, patient: Patient, date: date, time: time, dentist: str, reason: str = "",
+                    gender: str = "N/A", duration: int = DEFAULT_DURATION) -> Tuple[str, Optional[Appointment]]:
+        """Reserve appointment in a single DB transaction
+
+        Books duration minutes from time; the database rejects any overlap
+        with the dentist's other active bookings.
+        Returns (RESERVED, appointment), (SLOT_TAKEN, None), (UNAVAILABLE, None)
+        when the dentist isn't working then, or (RESERVE_FAILED, None)
+        """
+        if not self.roster.is_working(dentist, date, time, duration):
+            return UNAVAILABLE, None
+        for _ in range(3):
+            appt_id = self.ids.next()
+            status = self.db.reserve_appointment(patient.name, patient.email, gender,
+                                                 appt_id, date, time, dentist, reason, duration)
+            if status != DUPLICATE_ID:
+                break
+            # Likely another process drew the same node - move off it
+            self.ids.renew()
+        else:
+            status = RESERVE_FAILED
+        self._forget_availability(dentist, date)
+        if status != RESERVED:
+            return status, None
+
+        self._forget_listing(slot=(date, time))
+        self._remember_patient(patient.name, patient.email)
+        appointment = Appointment(appt_id, patient, date, time, dentist, "Pending", duration)
+
+        # Keep in-memory copy too
+        appointment = self.appointments.add(appointment)
+        return status, appointment
+
+    def move_appointment(self, appt_id: str, new_date: date, new_time: time, dentist: str,
+                         duration: Optional[int] = None, reason: Optional[str] = None) -> Tuple[str, Optional[Appointment]]:
+        """Move an appointment to a new dentist/date/time in one DB transaction
+
+        Keeps the id, and the duration unless one is given, and goes back to
+        Pending; if the new interval is taken the appointment stays where it
+        was. Returns (RESERVED, appointment), (SLOT_TAKEN, None),
+        (UNAVAILABLE, None), (NOT_FOUND, None) or (RESERVE_FAILED, None)
+        """
+        appt = self.appointments.get(appt_id)
+        if appt is None:
+            return NOT_FOUND, None
+        appt_id = appt.id  # in case it was found by its pre-migration id
+        if duration is None:
+            duration = appt.duration
+        if not self.roster.is_working(dentist, new_date, new_time, duration):
+            return UNAVAILABLE, None
+        old_slot = (appt.dentist, appt.date)
+
+        status = self.db.move_appointment(appt_id, new_date, new_time, dentist, duration, reason)
+        self._forget_availability(dentist, new_date)
+        if status != RESERVED:
+            return status, None
+
+        self._forget(appt_id, old_slot)
+        self._forget_listing(slot=(new_date, new_time))
+        return status, self.appointments.add(Appointment(appt_id, appt.patient, new_date, new_time, dentist,
+                                                         "Pending", duration, appt.booked_at))
+
+    def patient_appointments(self, email: str) -> Optional[List[Appointment]]:
+        """A patient's appointments, newest first - None if the database could not be read"""
+        rows = self.db.get_patient_appointments(email)
+        if rows is None:
+            return None
+        return [self._held(row) for row in rows]
+
+    def active_appointment(self, email: str) -> Optional[Appointment]:
+        """The patient's latest Pending/Confirmed appointment, or None"""
+        return next((appt for appt in self.patient_appointments(email) or () if appt.status in ACTIVE_STATUSES),
+                    None)
+
+    def is_time_slot_available(self, dentist: str, date: date, time: time,
+                               duration: int = DEFAULT_DURATION) -> bool:
+        """Check if duration minutes from time are free for a specific dentist and date"""
+        bit = self.grid.bit(time)
+        if not bit:
+            # Off-grid time (legacy booking) - ask the database directly
+            return self.db.check_slot_available(dentist, date, time, duration)
+        booked = self._booked([dentist], [date])
+        if booked is None:
+            return False
+        free = self.roster.working_mask(dentist, date) & ~booked[(dentist, date)]
+        return bool(self.grid.fits(free, duration) & bit)
+
+    def get_available_slots(self, dentist: str, date: date, duration: int = DEFAULT_DURATION) -> List[time]:
+        """Get the start times where duration minutes fit for a dentist on a specific date"""
+        return self.get_availability([dentist], [date], duration).get((dentist, date), [])
+
+    def get_availability(self, dentists: Iterable[str], dates: Iterable[date],
+                         duration: int = DEFAULT_DURATION) -> Dict[Tuple[str, date], List[time]]:
+        """Get available start times for every dentist/date pair in one query"""
+        dentists, dates = list(dentists), list(dates)
+        booked = self._booked(dentists, dates)
+        if booked is None:
+            # Unknown state - don't offer slots that may already be taken
+            return {(dentist, date): [] for dentist in dentists for date in dates}
+
+        return {pair: self.grid.times(self.grid.fits(self.roster.working_mask(*pair) & ~mask, duration))
+                for pair, mask in booked.items()}
+
+    def schedule(self, dentists: Iterable[str], start: date, end: date) -> Optional[Schedule]:
+        """Occupied-cell bitmasks for dentists from start to end inclusive, over their working hours
+
+        Costs at most one range query; None if the database could not be read.
+        """
+        dentists = list(dentists)
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        booked = self._booked(dentists, dates,
+                              lambda missing, days: self.db.get_booked_range(missing, min(days), max(days)))
+        if booked is None:
+            return None
+        return Schedule(self.grid, dentists, start, end, booked, self.roster.working_mask)
+
+    def next_available(self, count: int = 5, dentists: Optional[Iterable[str]] = None,
+                       earliest: Optional[date] = None, start_time: Optional[time] = None,
+                       end_time: Optional[time] = None, weekdays: Optional[Iterable[int]] = None,
+                       horizon_days: int = 90, duration: int = DEFAULT_DURATION) -> List[Tuple[str, date, time]]:
+        """Earliest free (dentist, date, time) starts for duration minutes, soonest first
+
+        Optional constraints: dentists to consider, earliest date (default
+        today; slots already past today are skipped), a time-of-day window
+        start_time <= time < end_time, and weekdays (Monday = 0). Looks at most
+        horizon_days ahead, a week at first and then twice as many days per
+        range query, so a nearby slot costs one small query.
+        """
+        dentists = list(self.dentists if dentists is None else dentists)
+        weekdays = None if weekdays is None else set(weekdays)
+        today = date.today()
+        start = max(earliest or today, today)
+        last = start + timedelta(days=horizon_days - 1)
+
+        window = self.grid.full
+        if start_time is not None:
+            window &= self.grid.from_time(start_time)
+        if end_time is not None:
+            window &= ~self.grid.from_time(end_time)
+
+        found = []
+        chunk = 7
+        while start <= last and len(found) < count:
+            end = min(start + timedelta(days=chunk - 1), last)
+            schedule = self.schedule(dentists, start, end)
+            if schedule is None:
+                break  # database unreachable - return what we have
+
+            # k-way merge of each dentist's free slots, ordered by (date, time, dentist order)
+            def candidates(index, dentist):
+                for day in schedule.days():
+                    if weekdays is not None and day.weekday() not in weekdays:
+                        continue
+                    mask = schedule.free_mask(dentist, day, duration) & window
+                    if day == today:
+                        mask &= self.grid.from_time(datetime.now().time())
+                    for slot in self.grid.times(mask):
+                        yield day, slot, index, dentist
+
+            for day, slot, _, dentist in merge(*(candidates(i, d) for i, d in enumerate(dentists))):
+                found.append((dentist, day, slot))
+                if len(found) == count:
+                    break
+
+            start = end + timedelta(days=1)
+            chunk *= 2
+        return found
+
+    def availability_matrix(self, start: date, end: date, dentists: Optional[Iterable[str]] = None):
+        """NumPy (dentists × days × slots) occupancy for a calendar view - needs NumPy
+
+        Loaded with one range query via schedule(); None if the database could
+        not be read.
+        """
+        from availability_matrix import AvailabilityMatrix
+        schedule = self.schedule(self.dentists if dentists is None else dentists, start, end)
+        if schedule is None:
+            return None
+        return AvailabilityMatrix.from_schedule(schedule)
+
+    def _booked(self, dentists: List[str], dates: List[date], fetch=None) -> Optional[Dict[Tuple[str, date], int]]:
+        """Occupied-cell mask per dentist/date, querying only the pairs not cached"""
+        booked = {}
+        missing_dentists, missing_dates = {}, {}
+        for dentist in dentists:
+            for date in dates:
+                mask = self.availability_cache.get((dentist, date))
+                if mask is None:
+                    missing_dentists[dentist] = missing_dates[date] = None
+                else:
+                    booked[(dentist, date)] = mask
+
+        if missing_dentists:
+            fetch = fetch or self.db.get_booked_slots
+            fetched = fetch(list(missing_dentists), list(missing_dates))
+            if fetched is None:
+                return None
+            for dentist in missing_dentists:
+                for date in missing_dates:
+                    mask = self.grid.occupied(fetched.get((dentist, date), {}))
+                    self.availability_cache.put((dentist, date), mask)
+                    booked[(dentist, date)] = mask
+        return booked
+
+    def cancel(self, appt_id: str) -> bool:
+        """Cancel appointment by ID"""
+        appt_id = self._current_id(appt_id)
+        slot = self._slot_of(appt_id)
+        # Try to delete from database first
+        result = self.db.delete_appointment_by_uuid(appt_id)
+        if result:
+            self._forget(appt_id, slot, counted=True)
+
+        # Also remove from in-memory if it exists
+        self.appointments.discard(appt_id)
+
+        return result
+
+    def cancel_by_email(self, email: str) -> bool:
+        """Cancel appointment by patient email"""
+        deleted = self.db.delete_appointment_by_email(email)
+        if deleted is False:
+            return False
+        for appt_id, dentist, date, _ in deleted:
+            self._forget(appt_id, (dentist, date), counted=True)
+            self.appointments.discard(appt_id)
+        for appt in self.appointments.by_email(email):
+            self.appointments.discard(appt.id)
+        return True
+
+    def confirm_appointment(self, appt_id: str) -> bool:
+        """Confirm an appointment"""
+        return self._set_status(appt_id, "Confirmed")
+
+    def decline_appointment(self, appt_id: str) -> bool:
+        """Decline an appointment"""
+        return self._set_status(appt_id, "Declined")
+
+    def _set_status(self, appt_id: str, status: str) -> bool:
+        appt = self.appointments.get(appt_id)
+        if appt is None or not self.db.update_appointment_status(appt.id, status):
+            return False
+        appt_id = appt.id
+        appt.status = status
+        self._forget(appt_id, (appt.dentist, appt.date))
+        return True
+
+    def confirm_appointments(self, appt_ids: Iterable[str]) -> bool:
+        """Confirm many appointments in one transaction"""
+        return self._set_status_many(appt_ids, "Confirmed")
+
+    def decline_appointments(self, appt_ids: Iterable[str]) -> bool:
+        """Decline many appointments in one transaction"""
+        return self._set_status_many(appt_ids, "Declined")
+
+    def cancel_appointments(self, appt_ids: Iterable[str]) -> Optional[List[str]]:
+        """Delete many appointments in one transaction - the ids actually deleted, None on failure"""
+        deleted = self.db.delete_appointments(list(appt_ids))
+        if deleted is False:
+            return None
+        self._forget_many(deleted, counted=True)
+        for appt_id, _, _, _ in deleted:
+            self.appointments.discard(appt_id)
+        return [appt_id for appt_id, _, _, _ in deleted]
+
+    def _set_status_many(self, appt_ids: Iterable[str], status: str) -> bool:
+        updated = self.db.update_appointments_status(list(appt_ids), status)
+        if updated is False:
+            return False
+        for appt_id, _, _, _ in updated:
+            appt = self.appointments.peek(appt_id)
+            if appt is not None:
+                appt.status = status
+        self._forget_many(updated)
+        return True
+
+    def _forget_many(self, rows, counted: bool = False):
+        """_forget() for a bulk write's [(appt_id, dentist, date, time)], one cache pass each"""
+        appt_ids = {row[0] for row in rows}
+
+        def stale(key, page):
+            if key[1] != DEFAULT_VIEW:  # filtered, re-sorted and search listings can gain or lose any row
+                return True
+            return counted if key[0] == "count" else any(row[0] in appt_ids for row in page[0])
+        self.listing_cache.invalidate_where(stale)
+        for appt_id, dentist, date, _ in rows:
+            self.detail_cache.invalidate(appt_id)
+            self._forget_availability(dentist, date)
+
+    def all_appointments(self) -> List[Appointment]:
+        """Retrieve all appointments from database, through the page cache"""
+        appointments, after = [], None
+        while True:
+            page, after = self.appointments_page(after, 500)
+            appointments.extend(page)
+            if after is None:
+                return appointments
+
+    def count_appointments(self, view: Optional[ListingView] = None) -> int:
+        """Number of appointments in the database, or passing view's filters"""
+        key = ("count", view or DEFAULT_VIEW)
+        count = self.listing_cache.get(key)
+        if count is None:
+            count = self.db.count_appointments(key[1])
+            self.listing_cache.put(key, count)
+        return count
+
+    def appointments_page(self, after: Optional[tuple] = None, page_size: int = 50,
+                          view: Optional[ListingView] = None) -> Tuple[List[Appointment], Optional[tuple]]:
+        """Get one page of appointments, newest first unless view says otherwise
+
+        Returns (appointments, next_cursor); pass next_cursor back as after to
+        get the following page. next_cursor is None on the last page.
+        """
+        # One extra row tells us whether another page exists
+        window = self.appointments_window(after=after, limit=page_size + 1, view=view)
+        next_cursor = None
+        if len(window) > page_size:
+            window = window[:page_size]
+            next_cursor = window[-1][0]
+        return [appt for _, appt in window], next_cursor
+
+    def appointments_window(self, after: Optional[tuple] = None, before: Optional[tuple] = None,
+                            limit: int = 50, view: Optional[ListingView] = None) -> List[Tuple[tuple, Appointment]]:
+        """Up to limit (cursor, appointment) pairs just past after or just ahead of before, in view's order
+
+        Filtering, search and sorting run in the database, so the cursors are
+        view.cursor() of each row and only pass back to the same view.
+        """
+        view = view or DEFAULT_VIEW
+        key = ("page", view, after, before, limit)
+        page = self.listing_cache.get(key)
+        if page is None:
+            rows = self.db.get_appointments_page(after, limit, before, view)
+            if rows:  # errors also come back empty - don't pin them
+                self.listing_cache.put(key, self._page_entry(rows, after, before, limit, view))
+        else:
+            rows = page[0]
+        return [(view.cursor(row), self._held(row)) for row in rows]
+
+    def _page_entry(self, rows, after, before, limit, view=DEFAULT_VIEW):
+        """(rows, low, high) - a page holds every row with low <= cursor <= high (None = unbounded)"""
+        if view != DEFAULT_VIEW:
+            return rows, None, None  # dropped on any write, see _forget_listing()
+        full = len(rows) == limit
+        if before is not None:
+            return rows, before, self._sort_key(rows[0]) if full else None
+        return rows, self._sort_key(rows[-1]) if full else None, after
+
+    def search_appointments(self, query: str, page: int = 0,
+                            page_size: int = 20) -> Tuple[List[Appointment], bool]:
+        """Full-text search over visit reasons and patient names, best match first
+
+        Returns (appointments, more) for one page; more is True if another
+        page follows.
+        """
+        query = " ".join(query.split())
+        if not query:
+            return [], False
+        key = ("search", query, page, page_size)
+        entry = self.listing_cache.get(key)
+        if entry is None:
+            # One extra row tells us whether another page exists
+            rows = self.db.search_appointments(query, page_size + 1, page * page_size)
+            if rows:
+                self.listing_cache.put(key, (rows, None, None))  # dropped on any write, like filtered pages
+        else:
+            rows = entry[0]
+        return [self._held(row) for row in rows[:page_size]], len(rows) > page_size
+
+    def iter_appointments(self, batch_size: int = 500) -> Iterator[Appointment]:
+        """Stream every appointment newest first with bounded memory"""
+        for row in self.db.iter_appointments(batch_size):
+            yield self._held(row)
+
+    def changes_since(self, watermark=None, view: Optional[ListingView] = None
+                      ) -> Union[Tuple[List[Tuple[tuple, Appointment]], List[str], object], str, None]:
+        """Appointments changed and ids deleted since watermark
+
+        Returns ((cursor, appointment) pairs, deleted ids, new watermark), None
+        if the database could not be read, or STALE_WATERMARK if watermark is
+        older than the deletes kept - reload then. Call with no watermark
+        first to get a starting point. With a view, cursors are in its order
+        and changed rows that no longer pass its filters count as deleted.
+        """
+        view = view or DEFAULT_VIEW
+        changes = self.db.get_changes_since(watermark)
+        if changes is None or changes == STALE_WATERMARK:
+            return changes
+        rows, deleted, new_watermark = changes
+        # Other clients' writes - drop what they touched instead of waiting for the TTL
+        for row in rows:
+            self._forget(row[0], (row[5], row[3]))
+            self._forget_listing(slot=(row[3], row[4]))
+        for appt_id in deleted:
+            self._forget(appt_id, self._slot_of(appt_id) or False, counted=True)
+        for appt_id in deleted:
+            self.appointments.discard(appt_id)
+        changed = [(view.cursor(row), self._held(row)) for row in rows if view.matches(row)]
+        deleted = deleted + [row[0] for row in rows if not view.matches(row)]
+        return changed, deleted, new_watermark
+
+    def appointment_details(self, appt_id: str) -> Optional[AppointmentDetails]:
+        """Reason, booking time and patient details of one appointment, cached - None if not found"""
+        appt_id = self._current_id(appt_id)
+        details = self.detail_cache.get(appt_id)
+        if details is None:
+            row = self.db.get_appointment_details(appt_id)
+            if row is None:
+                return None
+            details = AppointmentDetails(*row)
+            self.detail_cache.put(appt_id, details)
+        return details
+
+    def cache_stats(self) -> Dict[str, dict]:
+        """Hit/miss/eviction counters of the listing, availability and detail caches"""
+        return {"listing": self.listing_cache.stats(), "availability": self.availability_cache.stats(),
+                "details": self.detail_cache.stats()}
+
+    def _current_id(self, appt_id: str) -> str:
+        """The id an appointment has now, given the shorter one it had before the id migration"""
+        if len(appt_id) == ID_LENGTH:
+            return appt_id
+        appt = self.appointments.get(appt_id)
+        return appt.id if appt is not None else appt_id
+
+    def _slot_of(self, appt_id: str) -> Optional[Tuple[str, date]]:
+        """(dentist, date) of an appointment we already know about, without a query"""
+        appt = self.appointments.peek(appt_id)
+        if appt is not None:
+            return appt.dentist, appt.date
+        for page in self.listing_cache.values():
+            if isinstance(page, tuple):
+                for row in page[0]:
+                    if row[0] == appt_id:
+                        return row[5], row[3]
+        return None
+
+    def _forget(self, appt_id: str, slot, counted: bool = False):
+        """Invalidate what a write to one appointment can affect
+
+        slot is its (dentist, date); None means unknown, so every availability
+        entry goes, False skips availability. counted drops the total too.
+        """
+        self._forget_listing(appt_id=appt_id)
+        self.detail_cache.invalidate(appt_id)
+        if counted:
+            self.listing_cache.invalidate(("count", DEFAULT_VIEW))
+        if slot:
+            self._forget_availability(*slot)
+        elif slot is None:
+            self.availability_cache.clear()
+
+    def _forget_listing(self, appt_id: Optional[str] = None, slot: Optional[Tuple[date, time]] = None):
+        """Drop cached pages holding appt_id, or whose range a new (date, time) falls into"""
+        def stale(key, page):
+            if key[1] != DEFAULT_VIEW:  # filtered, re-sorted and search listings can gain or lose any row
+                return True
+            if key[0] == "count":
+                return slot is not None
+            rows, low, high = page
+            if appt_id is not None:
+                return any(row[0] == appt_id for row in rows)
+            return (low is None or low[:2] <= slot) and (high is None or slot <= high[:2])
+        self.listing_cache.invalidate_where(stale)
+
+    def _forget_availability(self, dentist: str, date: date):
+        self.availability_cache.invalidate((dentist, date))
+
+    def _load_appointment(self, appt_id: str) -> Optional[Appointment]:
+        row = self.db.get_appointment_by_uuid(appt_id)
+        return self._appointment_from_row(row) if row else None
+
+    def _held(self, row) -> Appointment:
+        """Appointment for a listing row, reusing (and refreshing) the held object if any"""
+        return self.appointments.refresh(self._appointment_from_row(row))
+
+    @staticmethod
+    def _appointment_from_row(row) -> Appointment:
+        appt_id, name, email, date, time, dentist, status = row[:7]
+        return Appointment(appt_id, Patient(name, email), date, time, dentist, status, row[7])
+
+    @staticmethod
+    def _sort_key(row) -> tuple:
+        """Keyset cursor for a listing row: (date, time, appointment_id)"""
+        return row[3], row[4], row[-1]
+
+    def rebook(self, email: str, new_date: date, new_time: time, dentist: str, reason: str = "",
+               duration: Optional[int] = None) -> Optional[Appointment]:
+        """Move the patient's latest active appointment to a new slot, or book one if they have none
+
+        A moved appointment keeps its duration unless one is given.
+        """
+        appt = self.active_appointment(email)
+        if appt is not None:
+            return self.move_appointment(appt.id, new_date, new_time, dentist, duration, reason or None)[1]
+        if duration is None:
+            duration = DEFAULT_DURATION
+
+        patient_result = self.db.get_patient_by_email(email)
+        if not patient_result:
+            return None
+        patient = Patient(name=patient_result[1], email=email)
+        return self.reserve(patient, new_date, new_time, dentist, reason, duration=duration)
\ No newline at end of file
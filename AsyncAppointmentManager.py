@@ -0,0 +1,152 @@
+# -------------------------
+# asyncio front end for AppointmentManager
+# -------------------------
+from datetime import date, time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from AppointmentManager import Appointment, AppointmentDetails, AppointmentManager, Patient
+from async_database_manager import AsyncDatabaseManager, AsyncRunner
+from schedule import Schedule
+from storage import open_storage, DEFAULT_DURATION, ListingView
+
+
+class AsyncAppointmentManager:
+    """Same operations as AppointmentManager, awaitable.
+
+    Booking logic stays in one place: every call runs the synchronous
+    AppointmentManager method on a bounded AsyncRunner whose size matches the
+    storage backend's concurrency (the MySQL connection pool), so one event
+    loop can accept hundreds of concurrent requests while only pool_size
+    queries hit the database at a time.
+    """
+
+    def __init__(self, manager: Optional[AppointmentManager] = None, pool_size: int = 10):
+        self.manager = manager or AppointmentManager(open_storage(pool_size=pool_size))
+        self.runner = AsyncRunner(self.manager.db.concurrency)
+        self.db = AsyncDatabaseManager(self.manager.db, runner=self.runner)
+
+    @property
+    def dentists(self) -> List[str]:
+        return self.manager.dentists
+
+    @property
+    def time_slots(self) -> List[time]:
+        return self.manager.time_slots
+
+    def verify_admin(self, username: str, password: str) -> bool:
+        return self.manager.verify_admin(username, password)
+
+    async def reserve(self, patient: Patient, date: date, time: time, dentist: str, reason: str = "",
+                      gender: str = "N/A", duration: int = DEFAULT_DURATION) -> Optional[Appointment]:
+        return await self.runner.run(self.manager.reserve, patient, date, time, dentist, reason, gender, duration)
+
+    async def try_reserve(self, patient: Patient, date: date, time: time, dentist: str, reason: str = "",
+                          gender: str = "N/A", duration: int = DEFAULT_DURATION) -> Tuple[str, Optional[Appointment]]:
+        return await self.runner.run(self.manager.try_reserve, patient, date, time, dentist, reason, gender,
+                                     duration)
+
+    async def move_appointment(self, appt_id: str, new_date: date, new_time: time, dentist: str,
+                               duration: Optional[int] = None,
+                               reason: Optional[str] = None) -> Tuple[str, Optional[Appointment]]:
+        return await self.runner.run(self.manager.move_appointment, appt_id, new_date, new_time, dentist,
+                                     duration, reason)
+
+    async def patient_appointments(self, email: str) -> Optional[List[Appointment]]:
+        return await self.runner.run(self.manager.patient_appointments, email)
+
+    async def active_appointment(self, email: str) -> Optional[Appointment]:
+        return await self.runner.run(self.manager.active_appointment, email)
+
+    async def is_time_slot_available(self, dentist: str, date: date, time: time,
+                                     duration: int = DEFAULT_DURATION) -> bool:
+        return await self.runner.run(self.manager.is_time_slot_available, dentist, date, time, duration)
+
+    async def get_available_slots(self, dentist: str, date: date, duration: int = DEFAULT_DURATION) -> List[time]:
+        return await self.runner.run(self.manager.get_available_slots, dentist, date, duration)
+
+    async def get_availability(self, dentists: Iterable[str], dates: Iterable[date],
+                               duration: int = DEFAULT_DURATION) -> Dict[Tuple[str, date], List[time]]:
+        return await self.runner.run(self.manager.get_availability, list(dentists), list(dates), duration)
+
+    async def schedule(self, dentists: Iterable[str], start: date, end: date) -> Optional[Schedule]:
+        return await self.runner.run(self.manager.schedule, list(dentists), start, end)
+
+    async def next_available(self, count: int = 5, dentists: Optional[Iterable[str]] = None,
+                             earliest: Optional[date] = None, start_time: Optional[time] = None,
+                             end_time: Optional[time] = None, weekdays: Optional[Iterable[int]] = None,
+                             horizon_days: int = 90, duration: int = DEFAULT_DURATION) -> List[Tuple[str, date, time]]:
+        return await self.runner.run(self.manager.next_available, count,
+                                     None if dentists is None else list(dentists), earliest,
+                                     start_time, end_time, None if weekdays is None else list(weekdays),
+                                     horizon_days, duration)
+
+    async def availability_matrix(self, start: date, end: date, dentists: Optional[Iterable[str]] = None):
+        return await self.runner.run(self.manager.availability_matrix, start, end,
+                                     None if dentists is None else list(dentists))
+
+    async def add_leave(self, dentist: Optional[str], day: date, reason: str = "") -> bool:
+        return await self.runner.run(self.manager.add_leave, dentist, day, reason)
+
+    async def remove_leave(self, dentist: Optional[str], day: date) -> bool:
+        return await self.runner.run(self.manager.remove_leave, dentist, day)
+
+    async def cancel(self, appt_id: str) -> bool:
+        return await self.runner.run(self.manager.cancel, appt_id)
+
+    async def cancel_by_email(self, email: str) -> bool:
+        return await self.runner.run(self.manager.cancel_by_email, email)
+
+    async def confirm_appointment(self, appt_id: str) -> bool:
+        return await self.runner.run(self.manager.confirm_appointment, appt_id)
+
+    async def decline_appointment(self, appt_id: str) -> bool:
+        return await self.runner.run(self.manager.decline_appointment, appt_id)
+
+    async def confirm_appointments(self, appt_ids: Iterable[str]) -> bool:
+        return await self.runner.run(self.manager.confirm_appointments, list(appt_ids))
+
+    async def decline_appointments(self, appt_ids: Iterable[str]) -> bool:
+        return await self.runner.run(self.manager.decline_appointments, list(appt_ids))
+
+    async def cancel_appointments(self, appt_ids: Iterable[str]) -> Optional[List[str]]:
+        return await self.runner.run(self.manager.cancel_appointments, list(appt_ids))
+
+    async def rebook(self, email: str, new_date: date, new_time: time, dentist: str,
+                     reason: str = "", duration: Optional[int] = None) -> Optional[Appointment]:
+        return await self.runner.run(self.manager.rebook, email, new_date, new_time, dentist, reason, duration)
+
+    async def count_appointments(self, view: Optional[ListingView] = None) -> int:
+        return await self.runner.run(self.manager.count_appointments, view)
+
+    async def appointments_page(self, after: Optional[tuple] = None, page_size: int = 50,
+                                view: Optional[ListingView] = None) -> Tuple[List[Appointment], Optional[tuple]]:
+        return await self.runner.run(self.manager.appointments_page, after, page_size, view)
+
+    async def iter_appointments(self, page_size: int = 500) -> AsyncIterator[Appointment]:
+        """Async generator over every appointment, newest first"""
+        after = None
+        while True:
+            appointments, after = await self.appointments_page(after, page_size)
+            for appt in appointments:
+                yield appt
+            if after is None:
+                return
+
+    async def suggest_patients(self, text: str, limit: int = 8) -> List[Patient]:
+        return await self.runner.run(self.manager.suggest_patients, text, limit)
+
+    async def search_appointments(self, query: str, page: int = 0,
+                                  page_size: int = 20) -> Tuple[List[Appointment], bool]:
+        return await self.runner.run(self.manager.search_appointments, query, page, page_size)
+
+    async def appointment_details(self, appt_id: str) -> Optional[AppointmentDetails]:
+        return await self.runner.run(self.manager.appointment_details, appt_id)
+
+    async def changes_since(self, watermark=None, view: Optional[ListingView] = None):
+        return await self.runner.run(self.manager.changes_since, watermark, view)
+
+    def cache_stats(self) -> Dict[str, dict]:
+        return self.manager.cache_stats()
+
+    def close(self):
+        self.db.close()
@@ -1,1797 +1,2090 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-from uuid import uuid4
-from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-import mysql.connector
-from database_manager import DatabaseManager, create_database
-
-
-# -------------------------
-# Data models
-# -------------------------
-@dataclass
-class Patient:
-    name: str
-    email: str
-
-
-@dataclass
-class Appointment:
-    id: str
-    patient: Patient
-    date: str
-    time: str
-    dentist: str
-    status: str = "Pending"  # Added status field
-    booked_at: datetime = field(default_factory=datetime.now)
-
-
-# -------------------------
-# Manager class
-# -------------------------
-class AppointmentManager:
-    def __init__(self):
-        self.appointments: Dict[str, Appointment] = {}
-        self.db = DatabaseManager()
-        # UNCOMMENT ONLY ON FIRST RUN TO CREATE DATABASE:
-        #create_database()
-
-        self.dentists = [
-            "Dr. Jhunsoy Love Jun",
-            "Dr. Jograd Ballesteros",
-            "Dr. Beyoncé Calubaquib",
-            "Dr. Estanislao Manansala",
-            "Dr. Federico Liwanag VII",
-            "Dr. Vergamino Antiporda",
-            "Dr. Princess Payapa Pamplona"
-        ]
-
-        # Admin credentials
-        self.admin_username = "admin"
-        self.admin_password = "admin123"
-
-        # Available time slots
-        self.time_slots = [
-            "08:00 AM", "08:30 AM", "09:00 AM", "09:30 AM",
-            "10:00 AM", "10:30 AM", "11:00 AM", "11:30 AM",
-            "01:00 PM", "01:30 PM", "02:00 PM", "02:30 PM",
-            "03:00 PM", "03:30 PM", "04:00 PM", "04:30 PM",
-            "05:00 PM", "05:30 PM"
-        ]
-
-    def verify_admin(self, username: str, password: str) -> bool:
-        """Verify admin credentials"""
-        return username == self.admin_username and password == self.admin_password
-
-    def reserve(self, patient: Patient, date: str, time: str, dentist: str, reason: str = "") -> Optional[Appointment]:
-        """Reserve appointment - checks database and saves to DB"""
-        # Check database for availability
-        if not self.db.check_slot_available(dentist, date, time):
-            return None
-
-        # Get or create patient in database
-        patient_result = self.db.get_patient_by_email(patient.email)
-        if patient_result:
-            patient_id = patient_result[0]
-        else:
-            self.db.add_patient(patient.name, patient.email, "N/A")
-            patient_result = self.db.get_patient_by_email(patient.email)
-            patient_id = patient_result[0]
-
-        # Create appointment
-        appt_id = str(uuid4())[:8]
-        appointment = Appointment(appt_id, patient, date, time, dentist, "Pending")
-
-        # Save to database
-        self.db.add_appointment(patient_id, appt_id, date, time, dentist, reason)
-
-        # Keep in-memory copy too
-        self.appointments[appt_id] = appointment
-        return appointment
-
-    def is_time_slot_available(self, dentist: str, date: str, time: str) -> bool:
-        """Check if a time slot is available for a specific dentist and date"""
-        return self.db.check_slot_available(dentist, date, time)
-
-    def get_available_slots(self, dentist: str, date: str) -> List[str]:
-        """Get all available time slots for a dentist on a specific date"""
-        available = []
-        for time_slot in self.time_slots:
-            if self.is_time_slot_available(dentist, date, time_slot):
-                available.append(time_slot)
-        return available
-
-    def cancel(self, appt_id: str) -> bool:
-        """Cancel appointment by ID"""
-        # Try to delete from database first
-        result = self.db.delete_appointment_by_uuid(appt_id)
-
-        # Also remove from in-memory if it exists
-        if appt_id in self.appointments:
-            del self.appointments[appt_id]
-
-        return result
-
-    def cancel_by_email(self, email: str) -> bool:
-        """Cancel appointment by patient email"""
-        if self.db.delete_appointment_by_email(email):
-            for appt_id, appt in list(self.appointments.items()):
-                if appt.patient.email == email:
-                    del self.appointments[appt_id]
-            return True
-        return False
-
-    def confirm_appointment(self, appt_id: str) -> bool:
-        """Confirm an appointment"""
-        if appt_id in self.appointments:
-            self.appointments[appt_id].status = "Confirmed"
-            self.db.update_appointment_status(appt_id, "Confirmed")
-            return True
-        return False
-
-    def decline_appointment(self, appt_id: str) -> bool:
-        """Decline an appointment"""
-        if appt_id in self.appointments:
-            self.appointments[appt_id].status = "Declined"
-            self.db.update_appointment_status(appt_id, "Declined")
-            return True
-        return False
-
-    def all_appointments(self) -> List[Appointment]:
-        """Retrieve all appointments from database"""
-        results = self.db.get_all_appointments()
-        appointments = []
-        for row in results:
-            appt_id, name, email, date, time, dentist, status, reason = row
-            patient = Patient(name, email)
-            appt = Appointment(appt_id, patient, date, time, dentist, status)
-            appointments.append(appt)
-        return appointments
-
-    def rebook(self, email: str, new_date: str, new_time: str, dentist: str, reason: str = "") -> Optional[Appointment]:
-        """Cancel old appointment by email and book a new one"""
-        # Get old patient info before canceling
-        patient_result = self.db.get_patient_by_email(email)
-        if not patient_result:
-            return None
-
-        name = patient_result[1]
-
-        # Cancel old appointment
-        self.cancel_by_email(email)
-
-        # Create new appointment with same patient info
-        patient = Patient(name=name, email=email)
-        return self.reserve(patient, new_date, new_time, dentist, reason)
-
-# -------------------------
-# GUI Application
-# -------------------------
-class DentalApp:
-    def __init__(self, root):
-        self.manager = AppointmentManager()
-        self.root = root
-        self.root.title("ToothPearl Dental Clinic")
-        self.root.geometry("1200x700")
-        self.root.resizable(False, False)
-
-        # ---------- Load background image once ----------
-        try:
-            original_image = Image.open("ASSETS/clinic.bg.png")
-            resized = original_image.resize((1200, 700), Image.LANCZOS)
-            self.bg_photo = ImageTk.PhotoImage(resized)
-            self.bg_label = tk.Label(self.root, image=self.bg_photo)
-            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-        except Exception as e:
-            # fallback if image not found / cannot load
-            print("Warning: Could not load background image:", e)
-            self.bg_label = tk.Label(self.root, bg="white")
-            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-
-        # show the first page
-        self.show_main_menu()
-
-    def clear_container(self):
-        """Destroy only widgets that were created inside the background label."""
-        for widget in self.bg_label.winfo_children():
-            widget.destroy()
-
-    # ---------------- Main Menu ----------------
-    def show_main_menu(self):
-        self.clear_container()
-
-
-
-        # NAV UPPER BUTTONS
-        nav_buttons = [
-            ("SERVICES", self.show_services),
-            ("PRICING", self.show_pricing),
-            ("ABOUT US", self.show_about_us),
-            ("NEED HELP?", self.show_need_help),
-        ]
-
-        for idx, (text, cmd) in enumerate(nav_buttons):
-            btn = tk.Button(
-                self.bg_label,
-                text=text,
-                font=("Arial", 12, "bold"),
-                bg="#FFCC00",
-                fg="black",
-                padx=15,
-                pady=8,
-                relief="flat",
-                bd=0,
-                highlightthickness=0,
-                activebackground="#FFCC00",
-                activeforeground="black",
-                cursor="hand2",
-                command=cmd if cmd else None
-            )
-            btn.place(x=300 + (idx * 180), y=20)
-            btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
-            btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
-
-
-        button_actions = [
-            ("BOOK NOW", self.book_appointment_form),
-            ("CANCEL BOOKING", self.cancel_appointment_form),
-            ("REBOOK", self.rebook_form),
-        ]
-
-        for idx, (text, cmd) in enumerate(button_actions):
-            btn = tk.Button(
-                self.bg_label,
-                text=text,
-                font=("Arial Black", 14),
-                bg="#FFEB3B",
-                fg="black",
-                width=20,
-                height=2,
-                relief="flat",
-                bd=0,
-                highlightthickness=0,
-                activebackground="#FFEB3B",
-                activeforeground="black",
-                cursor="hand2",
-                command=cmd
-            )
-            btn.place(x=50, y=200 + (idx * 100))
-            btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
-            btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
-
-        # EXIT BUTTON
-        exit_btn = tk.Button(
-            self.bg_label,
-            text="EXIT",
-            font=("Arial Black", 14),
-            bg="#FFEB3B",
-            fg="black",
-            width=20,
-            height=2,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#FFEB3B",
-            activeforeground="black",
-            cursor="hand2",
-            command=self.root.quit
-        )
-        exit_btn.place(x=50, y=500)
-        exit_btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
-        exit_btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
-
-        # ADMIN LOGIN BUTTON
-        admin_btn = tk.Button(
-            self.bg_label,
-            text="Log In",
-            font=("Arial", 10, "bold"),
-            bg="#FFCC00",
-            fg="black",
-            width=10,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#FFCC00",
-            activeforeground="black",
-            cursor="hand2",
-            command=self.show_login_page
-        )
-        admin_btn.place(x=1080, y=610)
-        admin_btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
-        admin_btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
-
-    # ---------------- Admin Login Page ----------------
-    def show_login_page(self):
-        self.clear_container()
-
-        # Title frame
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="ADMIN LOGIN",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Content frame
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        # Login form container
-        login_container = tk.Frame(content_frame, bg="#F5F5F5")
-        login_container.place(relx=0.5, rely=0.45, anchor="center")
-
-        # Username field
-        username_frame = tk.Frame(login_container, bg="#F5F5F5")
-        username_frame.pack(pady=20)
-
-        tk.Label(
-            username_frame,
-            text="Username",
-            font=("Arial", 16, "bold"),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=10,
-            width=20
-        ).pack(fill="x", pady=(0, 8))
-
-        username_entry = tk.Entry(
-            username_frame,
-            width=30,
-            font=("Arial", 15),
-            bg="#D9D9D9",
-            relief="flat"
-        )
-        username_entry.pack(ipady=8)
-
-        # Password field
-        password_frame = tk.Frame(login_container, bg="#F5F5F5")
-        password_frame.pack(pady=20)
-
-        tk.Label(
-            password_frame,
-            text="Password",
-            font=("Arial", 16, "bold"),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=10,
-            width=20
-        ).pack(fill="x", pady=(0, 8))
-
-        password_entry = tk.Entry(
-            password_frame,
-            width=30,
-            font=("Arial", 15),
-            bg="#D9D9D9",
-            relief="flat",
-            show="●"
-        )
-        password_entry.pack(ipady=8)
-
-        # Button frame
-        button_frame = tk.Frame(login_container, bg="#F5F5F5")
-        button_frame.pack(pady=30)
-
-        def attempt_login():
-            username = username_entry.get().strip()
-            password = password_entry.get().strip()
-
-            if self.manager.verify_admin(username, password):
-                messagebox.showinfo("Success", "Login successful!")
-                self.show_admin_page()
-            else:
-                messagebox.showerror("Error", "Invalid username or password!")
-                password_entry.delete(0, "end")
-
-        tk.Button(
-            button_frame,
-            text="BACK",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=12,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#EAB308",
-            command=self.show_main_menu,
-            cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        tk.Button(
-            button_frame,
-            text="LOGIN",
-            bg="#4CAF50",
-            fg="white",
-            font=("Arial", 14, "bold"),
-            width=12,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#45a049",
-            command=attempt_login,
-            cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        # Bind Enter key to login
-        password_entry.bind("<Return>", lambda e: attempt_login())
-        username_entry.bind("<Return>", lambda e: password_entry.focus())
-
-    def show_admin_page(self):
-        self.clear_container()
-
-        # Title bar
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="ADMIN DASHBOARD - MANAGE APPOINTMENTS",
-            font=("Arial Black", 28, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Content frame
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        # Table container
-        table_container = tk.Frame(content_frame, bg="#F5F5F5")
-        table_container.pack(fill="both", expand=True, padx=40, pady=20)
-
-        # Style for treeview - Updated with borders
-        # Style for treeview - Updated with borders
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Admin.Treeview",
-                        background="#D9D9D9",
-                        foreground="black",
-                        rowheight=40,
-                        fieldbackground="#D9D9D9",
-                        borderwidth=2,
-                        relief="solid")
-        style.configure("Admin.Treeview.Heading",
-                        background="#4A90E2",
-                        foreground="white",
-                        font=("Arial", 12, "bold"),
-                        borderwidth=2,
-                        relief="solid")
-        style.map("Admin.Treeview",
-                  background=[("selected", "#CFCFCF")],  # light gray
-                  foreground=[("selected", "black")])  # keep text visible
-        style.map("Admin.Treeview.Heading",
-                  background=[("active", "#4A90E2")])
-
-        # Create treeview with border
-        tree_frame = tk.Frame(table_container, bg="#4A90E2", bd=2, relief="solid")
-        tree_frame.pack(fill="both", expand=True)
-
-        tree = ttk.Treeview(
-            tree_frame,
-            columns=("id", "name", "email", "date", "time", "dentist", "status"),
-            show="headings",
-            style="Admin.Treeview",
-            height=10
-        )
-
-        # Define headings
-        tree.heading("id", text="ID")
-        tree.heading("name", text="Patient Name")
-        tree.heading("email", text="Email Address")
-        tree.heading("date", text="Date")
-        tree.heading("time", text="Time")
-        tree.heading("dentist", text="Dentist")
-        tree.heading("status", text="Status")
-
-        # Define column widths and alignments
-        tree.column("id", width=80, anchor="center")
-        tree.column("name", width=150, anchor="w")
-        tree.column("email", width=220, anchor="w")
-        tree.column("date", width=100, anchor="center")
-        tree.column("time", width=100, anchor="center")
-        tree.column("dentist", width=150, anchor="w")
-        tree.column("status", width=100, anchor="center")
-
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-
-        # Pack tree and scrollbar
-        tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Function to refresh the table
-        def refresh_table():
-            # Clear existing items
-            for item in tree.get_children():
-                tree.delete(item)
-
-            # Insert data
-            appointments = self.manager.all_appointments()
-            if appointments:
-                for appt in appointments:
-                    # Color code by status
-                    tag = ""
-                    if appt.status == "Confirmed":
-                        tag = "confirmed"
-                    elif appt.status == "Declined":
-                        tag = "declined"
-                    elif appt.status == "Pending":
-                        tag = "pending"
-
-                    tree.insert("", "end", values=(
-                        appt.id,
-                        appt.patient.name,
-                        appt.patient.email,
-                        appt.date,
-                        appt.time,
-                        appt.dentist,
-                        appt.status
-                    ), tags=(tag,))
-
-            # Configure tags for colors (keeping your original color coding)
-            tree.tag_configure("confirmed", background="#C8E6C9")
-            tree.tag_configure("declined", background="#FFCDD2")
-            tree.tag_configure("pending", background="#FFF9C4")
-
-        # Initial load
-        refresh_table()
-
-        # Action buttons frame
-        action_frame = tk.Frame(content_frame, bg="#F5F5F5")
-        action_frame.pack(pady=15)
-
-        def confirm_selected():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning("Warning", "Please select an appointment to confirm!")
-                return
-
-            item = tree.item(selected[0])
-            appt_id = item['values'][0]
-
-            if self.manager.confirm_appointment(appt_id):
-                messagebox.showinfo("Success", f"Appointment {appt_id} confirmed!")
-                refresh_table()
-            else:
-                messagebox.showerror("Error", "Failed to confirm appointment!")
-
-        def decline_selected():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning("Warning", "Please select an appointment to decline!")
-                return
-
-            item = tree.item(selected[0])
-            appt_id = item['values'][0]
-
-            result = messagebox.askyesno("Confirm Decline",
-                                         f"Are you sure you want to decline appointment {appt_id}?")
-            if result:
-                if self.manager.decline_appointment(appt_id):
-                    messagebox.showinfo("Success", f"Appointment {appt_id} declined!")
-                    refresh_table()
-                else:
-                    messagebox.showerror("Error", "Failed to decline appointment!")
-
-        def delete_selected():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning("Warning", "Please select an appointment to delete!")
-                return
-
-            item = tree.item(selected[0])
-            appt_id = item['values'][0]
-
-            result = messagebox.askyesno("Confirm Delete",
-                                         f"Are you sure you want to permanently delete appointment {appt_id}?")
-            if result:
-                if self.manager.cancel(appt_id):
-                    messagebox.showinfo("Success", f"Appointment {appt_id} deleted!")
-                    refresh_table()
-                else:
-                    messagebox.showerror("Error", "Failed to delete appointment!")
-
-        # Action buttons
-        tk.Button(
-            action_frame,
-            text="✓ CONFIRM",
-            bg="#4CAF50",
-            fg="white",
-            font=("Arial", 12, "bold"),
-            width=15,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#45a049",
-            command=confirm_selected,
-            cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        tk.Button(
-            action_frame,
-            text="✗ DECLINE",
-            bg="#FF9800",
-            fg="white",
-            font=("Arial", 12, "bold"),
-            width=15,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#F57C00",
-            command=decline_selected,
-            cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        tk.Button(
-            action_frame,
-            text="🗑 DELETE",
-            bg="#F44336",
-            fg="white",
-            font=("Arial", 12, "bold"),
-            width=15,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#D32F2F",
-            command=delete_selected,
-            cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        tk.Button(
-            action_frame,
-            text="↻ REFRESH",
-            bg="#2196F3",
-            fg="white",
-            font=("Arial", 12, "bold"),
-            width=15,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#1976D2",
-            command=refresh_table,
-            cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        # Statistics label
-        stats_text = f"Total Appointments: {len(self.manager.all_appointments())}"
-        stats_label = tk.Label(
-            action_frame,
-            text=stats_text,
-            font=("Arial", 11, "bold"),
-            bg="#F5F5F5",
-            fg="#666666"
-        )
-        stats_label.pack(side="left", padx=20)
-
-        # Bottom buttons
-        bottom_frame = tk.Frame(content_frame, bg="#F5F5F5")
-        bottom_frame.pack(side="bottom", pady=15)
-
-        tk.Button(
-            bottom_frame,
-            text="LOGOUT",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=15,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#D4A307",
-            command=self.show_main_menu,
-            cursor="hand2"
-        ).pack()
-
-    # ---------------- Booking Form ----------------
-    def book_appointment_form(self):
-        self.clear_container()
-
-        # Title frame
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="TOOTHPEARL DENTAL CLINIC",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        form_container = tk.Frame(content_frame, bg="#F5F5F5")
-        form_container.place(relx=0.5, rely=0.5, anchor="center")
-
-        # --- helper to create entry with placeholder behavior ---
-        def make_entry_with_placeholder(parent, placeholder, **entry_opts):
-            entry = tk.Entry(parent, **entry_opts)
-            ph = placeholder
-            entry.insert(0, ph)
-            entry.config(fg="grey")
-
-            def on_focus_in(event, e=entry, ph=ph):
-                if e.get() == ph:
-                    e.delete(0, "end")
-                    e.config(fg="black")
-
-            def on_focus_out(event, e=entry, ph=ph):
-                if not e.get().strip():
-                    e.insert(0, ph)
-                    e.config(fg="grey")
-
-            entry.bind("<FocusIn>", on_focus_in)
-            entry.bind("<FocusOut>", on_focus_out)
-            return entry
-
-        # ROW 1
-        row1_frame = tk.Frame(form_container, bg="#F5F5F5")
-        row1_frame.pack(pady=(40, 20))
-
-        name_frame = tk.Frame(row1_frame, bg="#F5F5F5")
-        name_frame.pack(side="left", padx=(0, 60))
-        tk.Label(
-            name_frame,
-            text="Name",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=5
-        ).pack(fill="x", pady=(0, 8))
-
-        name_placeholder = "Ex. Justine Nabunturan"
-        name_entry = make_entry_with_placeholder(
-            name_frame,
-            name_placeholder,
-            width=40, font=("Arial", 15), bg="#D9D9D9", relief="flat"
-        )
-        name_entry.pack(ipady=6)
-
-        dentist_frame = tk.Frame(row1_frame, bg="#F5F5F5")
-        dentist_frame.pack(side="left")
-        tk.Label(
-            dentist_frame,
-            text="Preferred Dentist",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=5
-        ).pack(fill="x", pady=(0, 8))
-
-        dentist_combo = ttk.Combobox(dentist_frame, values=self.manager.dentists, state="readonly",
-                                     width=38, font=("Arial", 14))
-        dentist_combo.set("Ex. Dr. Jhunsuy Love Jun")
-        dentist_combo.pack()
-
-        # ROW 2
-        row2_frame = tk.Frame(form_container, bg="#F5F5F5")
-        row2_frame.pack(pady=20)
-        gender_frame = tk.Frame(row2_frame, bg="#F5F5F5")
-        gender_frame.pack(side="left", padx=(5, 60))
-        tk.Label(
-            gender_frame,
-            text="Gender",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=5
-        ).pack(fill="x", pady=(0, 8))
-
-        radio_container = tk.Frame(gender_frame, bg="#D9D9D9", width=440, height=45)
-        radio_container.pack()
-        radio_container.pack_propagate(False)
-
-        gender_var = tk.StringVar(value="N/A")
-        radio_inner = tk.Frame(radio_container, bg="#D9D9D9")
-        radio_inner.pack(anchor="w", padx=10, pady=8)
-        tk.Radiobutton(radio_inner, text="Male", variable=gender_var, value="Male",
-                       bg="#D9D9D9", font=("Arial", 12), activebackground="#D9D9D9").pack(side="left", padx=(0, 15))
-        tk.Radiobutton(radio_inner, text="Female", variable=gender_var, value="Female",
-                       bg="#D9D9D9", font=("Arial", 12), activebackground="#D9D9D9").pack(side="left", padx=(0, 15))
-        tk.Radiobutton(radio_inner, text="Prefer not to say", variable=gender_var, value="N/A",
-                       bg="#D9D9D9", font=("Arial", 12), activebackground="#D9D9D9").pack(side="left")
-
-        email_frame = tk.Frame(row2_frame, bg="#F5F5F5")
-        email_frame.pack(side="left")
-        tk.Label(
-            email_frame,
-            text="Email address",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=5
-        ).pack(fill="x", pady=(0, 8))
-
-        email_placeholder = "Ex. j.nabunturan1111@umindanao.edu.ph"
-        email_entry = make_entry_with_placeholder(
-            email_frame,
-            email_placeholder,
-            width=40, font=("Arial", 15), bg="#D9D9D9", relief="flat"
-        )
-        email_entry.pack(ipady=6)
-
-        # ROW 3
-        row3_frame = tk.Frame(form_container, bg="#F5F5F5")
-        row3_frame.pack(pady=20)
-        reason_frame = tk.Frame(row3_frame, bg="#F5F5F5")
-        reason_frame.pack(side="left", padx=(0, 60))
-        tk.Label(
-            reason_frame,
-            text="Reason for Visit",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=5
-        ).pack(fill="x", pady=(0, 8))
-
-        reason_placeholder = "Ex. Wisdom tooth Root canal"
-
-        reason_text = tk.Text(
-            reason_frame,
-            width=40,
-            height=5,
-            font=("Arial", 14),
-            bg="#D9D9D9",
-            relief="flat",
-            wrap="word"
-        )
-        reason_text.pack()
-
-        reason_text.insert("1.0", reason_placeholder)
-        reason_text.config(fg="gray")
-
-        def on_focus_in(event):
-            if reason_text.get("1.0", "end-1c") == reason_placeholder:
-                reason_text.delete("1.0", "end")
-                reason_text.config(fg="black")
-
-        def on_focus_out(event):
-            if reason_text.get("1.0", "end-1c").strip() == "":
-                reason_text.insert("1.0", reason_placeholder)
-                reason_text.config(fg="gray")
-
-        reason_text.bind("<FocusIn>", on_focus_in)
-        reason_text.bind("<FocusOut>", on_focus_out)
-
-        # DATE AND TIME SELECTION
-        datetime_frame = tk.Frame(row3_frame, bg="#F5F5F5")
-        datetime_frame.pack(side="left")
-
-        tk.Label(
-            datetime_frame,
-            text="SELECT DATE & TIME",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="w",
-            padx=5
-        ).pack(fill="x", pady=(0, 8))
-
-        datetime_container = tk.Frame(datetime_frame, bg="#D9D9D9", width=440, height=200)
-        datetime_container.pack()
-        datetime_container.pack_propagate(False)
-
-        # --- New Scrollable Date Selectors ---
-        date_inner = tk.Frame(datetime_container, bg="#D9D9D9")
-        date_inner.pack(fill="x", padx=10, pady=(10, 5))
-
-        tk.Label(
-            date_inner,
-            text="Date:",
-            font=("Arial", 12, "bold"),
-            bg="#D9D9D9",
-            fg="black"
-        ).pack(side="left", padx=(0, 10))
-
-        month_var = tk.StringVar(value="1")
-        day_var = tk.StringVar(value="1")
-        year_var = tk.StringVar(value="2025")
-
-        month_spin = tk.Spinbox(date_inner, from_=1, to=12, wrap=True, width=5,
-                                font=("Arial", 12), justify="center", textvariable=month_var,
-                                state="readonly", relief="flat")
-        month_spin.pack(side="left", padx=(0, 5))
-
-        day_spin = tk.Spinbox(date_inner, from_=1, to=31, wrap=True, width=5,
-                              font=("Arial", 12), justify="center", textvariable=day_var,
-                              state="readonly", relief="flat")
-        day_spin.pack(side="left", padx=(0, 5))
-
-        year_spin = tk.Spinbox(date_inner, from_=2025, to=2030, wrap=True, width=7,
-                               font=("Arial", 12), justify="center", textvariable=year_var,
-                               state="readonly", relief="flat")
-        year_spin.pack(side="left", padx=(0, 5))
-
-        def get_selected_date():
-            return f"{month_var.get().zfill(2)}/{day_var.get().zfill(2)}/{year_var.get()}"
-
-        # Time slots
-        time_label = tk.Label(
-            datetime_container,
-            text="Available Times (select dentist & date first):",
-            font=("Arial", 10),
-            bg="#D9D9D9",
-            fg="#666666"
-        )
-        time_label.pack(pady=(5, 5))
-
-        time_canvas = tk.Canvas(datetime_container, bg="#D9D9D9", height=100, highlightthickness=0)
-        time_scrollbar = tk.Scrollbar(datetime_container, orient="vertical", command=time_canvas.yview)
-        time_slots_frame = tk.Frame(time_canvas, bg="#D9D9D9")
-
-        time_canvas.configure(yscrollcommand=time_scrollbar.set)
-        time_canvas.pack(side="left", fill="both", expand=True, padx=(10, 0))
-        time_scrollbar.pack(side="right", fill="y", padx=(0, 10))
-
-        canvas_frame = time_canvas.create_window((0, 0), window=time_slots_frame, anchor="nw")
-
-        selected_time = tk.StringVar(value="")
-
-        def update_time_slots():
-            for widget in time_slots_frame.winfo_children():
-                widget.destroy()
-
-            date = get_selected_date()
-
-            # Show all available slots immediately (ignore dentist)
-            if hasattr(self.manager, "time_slots"):
-                available_slots = self.manager.time_slots
-            else:
-                available_slots = [
-                    "08:00 AM", "08:30 AM", "09:00 AM", "09:30 AM", "10:00 AM",
-                    "10:30 AM", "11:00 AM", "11:30 AM", "01:00 PM", "01:30 PM",
-                    "02:00 PM", "02:30 PM"
-                ]
-
-            # Update label right away with the date
-            time_label.config(
-                text=f"✓ {len(available_slots)} available time slots for {date}",
-                fg="#4CAF50"
-            )
-
-            row, col = 0, 0
-            current_selected = selected_time.get()
-
-            for time_slot in available_slots:
-                is_selected = time_slot == current_selected
-                bg_color = "#FFF59D" if is_selected else "#C8E6C9"
-
-                btn = tk.Button(
-                    time_slots_frame,
-                    text=time_slot,
-                    font=("Arial", 9, "bold" if is_selected else "normal"),
-                    width=10, height=1,
-                    bg=bg_color,
-                    fg="black",
-                    relief="flat",
-                    cursor="hand2",
-                    command=lambda t=time_slot: select_time(t)
-                )
-                btn.grid(row=row, column=col, padx=3, pady=3)
-                col += 1
-                if col > 2:
-                    col = 0
-                    row += 1
-
-            time_slots_frame.update_idletasks()
-            time_canvas.config(scrollregion=time_canvas.bbox("all"))
-
-        def select_time(time):
-            selected_time.set(time)
-            update_time_slots()
-
-        def on_date_change(*args):
-            update_time_slots()
-
-        # ✅ Automatically show times on date change
-        month_var.trace_add("write", on_date_change)
-        day_var.trace_add("write", on_date_change)
-        year_var.trace_add("write", on_date_change)
-
-        # ✅ Keep dentist combo refresh optional (not required)
-        dentist_combo.bind("<<ComboboxSelected>>", lambda e: update_time_slots())
-
-        # ✅ Trigger once immediately so times show on load
-        update_time_slots()
-
-        # ✅ Bind scroll updates
-        month_var.trace_add("write", on_date_change)
-        day_var.trace_add("write", on_date_change)
-        year_var.trace_add("write", on_date_change)
-        dentist_combo.bind("<<ComboboxSelected>>", lambda e: update_time_slots())
-
-        # BUTTON ROW
-        button_frame = tk.Frame(form_container, bg="#F5F5F5")
-        button_frame.pack(pady=(20, 20), anchor="e")
-
-        def confirm_booking():
-            name = name_entry.get().strip()
-            if name == name_placeholder:
-                name = ""
-
-            email = email_entry.get().strip()
-            if email == email_placeholder:
-                email = ""
-
-            date = get_selected_date()
-            time = selected_time.get().strip()
-
-            dentist = dentist_combo.get().strip()
-            if dentist.startswith("Ex. "):
-                dentist = dentist[4:].strip()
-            if dentist == "" or dentist.lower().startswith("dr.") and dentist == "":
-                dentist = ""
-
-            gender = gender_var.get()
-
-            reason = reason_text.get("1.0", "end-1c").strip()
-            if reason == reason_placeholder:
-                reason = ""
-
-            if not all([name, email, date, dentist, gender, reason, time]):
-                messagebox.showerror("Error", "All fields are required, including time slot!")
-                return
-
-            patient = Patient(name, email)
-            appt = self.manager.reserve(patient, date, time, dentist, reason)
-
-            if appt:
-                messagebox.showinfo(
-                    "Success",
-                    f"Appointment booked successfully!\n\nAppointment ID: {appt.id}\nPatient: {name}\nDentist: {dentist}\nDate: {date}\nTime: {time}\n\nStatus: Pending (awaiting admin approval)"
-                )
-                self.show_main_menu()
-            else:
-                messagebox.showwarning("Unavailable", "This time slot is already booked. Please select another time.")
-
-        tk.Button(
-            button_frame, text="BACK", bg="#EAB308", fg="black",
-            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
-            bd=0, highlightthickness=0, activebackground="#EAB308",
-            command=self.show_main_menu, cursor="hand2"
-        ).pack(side="left", padx=10)
-
-        tk.Button(
-            button_frame, text="CONFIRM", bg="#EAB308", fg="black",
-            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
-            bd=0, highlightthickness=0, activebackground="#EAB308",
-            command=confirm_booking, cursor="hand2"
-        ).pack(side="left")
-
-    # ---------------- Cancel ----------------
-    def cancel_appointment_form(self):
-        self.clear_container()
-
-        # Title frame
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="TOOTHPEARL DENTAL CLINIC",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Main background
-        content_frame = tk.Frame(self.bg_label, bg="white")
-        content_frame.pack(fill="both", expand=True)
-
-        # Centered container
-        form_container = tk.Frame(content_frame, bg="white")
-        form_container.place(relx=0.5, rely=0.5, anchor="center")
-
-        # --- helper for entry with placeholder ---
-        def make_entry_with_placeholder(parent, placeholder, **entry_opts):
-            entry = tk.Entry(parent, **entry_opts)
-            entry.insert(0, placeholder)
-            entry.config(fg="grey")
-
-            def on_focus_in(event):
-                if entry.get() == placeholder:
-                    entry.delete(0, "end")
-                    entry.config(fg="black")
-
-            def on_focus_out(event):
-                if not entry.get().strip():
-                    entry.insert(0, placeholder)
-                    entry.config(fg="grey")
-
-            entry.bind("<FocusIn>", on_focus_in)
-            entry.bind("<FocusOut>", on_focus_out)
-            return entry
-
-        # ---------------- INPUT FIELDS ----------------
-
-        # Name
-        tk.Label(
-            form_container,
-            text="Name",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="center"
-        ).pack(fill="x", pady=(10, 5))
-        name_placeholder = "Ex. Justine Nabunturan"
-        name_entry = make_entry_with_placeholder(
-            form_container,
-            name_placeholder,
-            width=45, font=("Arial", 15),
-            bg="#D9D9D9", relief="flat", justify="center"
-        )
-        name_entry.pack(ipady=8, pady=(0, 15))
-
-        # Email
-        tk.Label(
-            form_container,
-            text="Email Address",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="center"
-        ).pack(fill="x", pady=(5, 5))
-        email_placeholder = "Ex. j.nabunturan1111@umindanao.edu.ph"
-        email_entry = make_entry_with_placeholder(
-            form_container,
-            email_placeholder,
-            width=45, font=("Arial", 15),
-            bg="#D9D9D9", relief="flat", justify="center"
-        )
-        email_entry.pack(ipady=8, pady=(0, 15))
-
-        # Reason
-        tk.Label(
-            form_container,
-            text="Reason",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="center"
-        ).pack(fill="x", pady=(5, 5))
-        reason_placeholder = "Ex. Change Date"
-        reason_entry = make_entry_with_placeholder(
-            form_container,
-            reason_placeholder,
-            width=45, font=("Arial", 15),
-            bg="#D9D9D9", relief="flat", justify="center"
-        )
-        reason_entry.pack(ipady=8, pady=(0, 15))
-
-        # ---------------- BUTTONS ----------------
-        button_frame = tk.Frame(form_container, bg="white")
-        button_frame.pack(pady=(20, 10), anchor="e")
-
-        def cancel_now():
-            name = name_entry.get().strip()
-            email = email_entry.get().strip()
-            reason = reason_entry.get().strip()
-
-            if name == name_placeholder:
-                name = ""
-            if email == email_placeholder:
-                email = ""
-            if reason == reason_placeholder:
-                reason = ""
-
-            if not all([name, email, reason]):
-                messagebox.showerror("Error", "All fields are required!")
-                return
-
-            if self.manager.cancel_by_email(email):
-                messagebox.showinfo("Success", f"Appointment for {email} cancelled.")
-                self.show_main_menu()
-            else:
-                messagebox.showerror("Error", "Appointment not found.")
-
-        # BACK button
-        tk.Button(
-            button_frame,
-            text="BACK",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=10, height=1,
-            relief="flat", bd=0,
-            activebackground="#EAB308",
-            cursor="hand2",
-            command=self.show_main_menu
-        ).pack(side="left", padx=10)
-
-        # CONFIRM button
-        tk.Button(
-            button_frame,
-            text="NEXT",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=10, height=1,
-            relief="flat", bd=0,
-            activebackground="#EAB308",
-            cursor="hand2",
-            command=cancel_now
-        ).pack(side="left", padx=10)
-
-    # ---------------- Rebook Form ----------------
-    def rebook_form(self):
-        self.clear_container()
-
-        # Title frame
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="TOOTHPEARL DENTAL CLINIC",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Main background (white, consistent with Cancel)
-        content_frame = tk.Frame(self.bg_label, bg="white")
-        content_frame.pack(fill="both", expand=True)
-
-        form_container = tk.Frame(content_frame, bg="white")
-        form_container.place(relx=0.5, rely=0.5, anchor="center")
-
-        # --- helper for entry with placeholder ---
-        def make_entry_with_placeholder(parent, placeholder, **entry_opts):
-            entry = tk.Entry(parent, **entry_opts)
-            ph = placeholder
-            entry.insert(0, ph)
-            entry.config(fg="grey")
-
-            def on_focus_in(event, e=entry, ph=ph):
-                if e.get() == ph:
-                    e.delete(0, "end")
-                    e.config(fg="black")
-
-            def on_focus_out(event, e=entry, ph=ph):
-                if not e.get().strip():
-                    e.insert(0, ph)
-                    e.config(fg="grey")
-
-            entry.bind("<FocusIn>", on_focus_in)
-            entry.bind("<FocusOut>", on_focus_out)
-            return entry
-
-        # ---------------- INPUT FIELDS ----------------
-
-        # Name
-        tk.Label(
-            form_container,
-            text="Name",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="center"
-        ).pack(fill="x", pady=(10, 5))
-        name_placeholder = "Ex. Justine Nabunturan"
-        name_entry = make_entry_with_placeholder(
-            form_container,
-            name_placeholder,
-            width=45, font=("Arial", 15),
-            bg="#D9D9D9", relief="flat", justify="center"
-        )
-        name_entry.pack(ipady=8, pady=(0, 15))
-
-        # Reason
-        tk.Label(
-            form_container,
-            text="Reason",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="center"
-        ).pack(fill="x", pady=(5, 5))
-        reason_placeholder = "Ex. Change Date"
-        reason_entry = make_entry_with_placeholder(
-            form_container,
-            reason_placeholder,
-            width=45, font=("Arial", 15),
-            bg="#D9D9D9", relief="flat", justify="center"
-        )
-        reason_entry.pack(ipady=8, pady=(0, 15))
-
-        # Email
-        tk.Label(
-            form_container,
-            text="Email Address",
-            font=("Arial", 16),
-            bg="#EAB308",
-            fg="black",
-            anchor="center"
-        ).pack(fill="x", pady=(5, 5))
-        email_placeholder = "Ex. j.nabunturan1111@umindanao.edu.ph"
-        email_entry = make_entry_with_placeholder(
-            form_container,
-            email_placeholder,
-            width=45, font=("Arial", 15),
-            bg="#D9D9D9", relief="flat", justify="center"
-        )
-        email_entry.pack(ipady=8, pady=(0, 15))
-
-        # ---------------- BUTTONS ----------------
-        button_frame = tk.Frame(form_container, bg="white")
-        # lower position + right alignment
-        button_frame.pack(pady=(60, 10), anchor="e", padx=40)
-
-        def next_to_booking():
-            name = name_entry.get().strip()
-            email = email_entry.get().strip()
-            reason = reason_entry.get().strip()
-
-            if name == name_placeholder:
-                name = ""
-            if email == email_placeholder:
-                email = ""
-            if reason == reason_placeholder:
-                reason = ""
-
-            if not all([name, email, reason]):
-                messagebox.showerror("Error", "All fields are required!")
-                return
-
-            # Cancel old appointment and redirect to booking form
-            self.manager.cancel_by_email(email)
-            self.book_appointment_form()
-
-        # BACK button
-        tk.Button(
-            button_frame,
-            text="BACK",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=10, height=1,
-            relief="flat", bd=0,
-            activebackground="#EAB308",
-            cursor="hand2",
-            command=self.show_main_menu
-        ).pack(side="left", padx=10)
-
-        # NEXT button
-        tk.Button(
-            button_frame,
-            text="NEXT",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=10, height=1,
-            relief="flat", bd=0,
-            activebackground="#EAB308",
-            cursor="hand2",
-            command=next_to_booking
-        ).pack(side="left", padx=10)
-
-    # ---------------- Services Page ----------------
-    def show_services(self):
-        self.clear_container()
-
-        # Title bar
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="SERVICES",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Content frame
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        # 4 service columns
-        services = {
-            "General &\nPreventive": [
-                "Dental check-ups / consultations",
-                "Teeth cleaning (prophylaxis)",
-                "Oral examinations & X-rays",
-                "Fluoride treatments",
-                "Sealants (to protect teeth from decay)"
-            ],
-            "Restorative\nDentistry": [
-                "Fillings (for cavities)",
-                "Crowns and bridges",
-                "Dentures (partial or full)",
-                "Dental implants",
-                "Root canal treatment"
-            ],
-            "Cosmetic\nDentistry": [
-                "Teeth whitening",
-                "Veneers",
-                "Bonding (fixing chipped or discolored teeth)",
-                "Smile makeover consultations",
-                "Braces (metal, ceramic, lingual)",
-                "Invisalign or clear aligners",
-                "Retainers"
-            ],
-            "Oral Surgery": [
-                "Tooth extractions (regular or wisdom teeth)",
-                "Surgical removal of impacted teeth",
-                "Bone grafting"
-            ]
-        }
-
-        # Grid layout for 4 columns
-        services_frame = tk.Frame(content_frame, bg="#F5F5F5")
-        services_frame.place(relx=0.5, rely=0.12, anchor="n")
-
-        for i, (title, items) in enumerate(services.items()):
-            col = tk.Frame(services_frame, bg="#D9D9D9", width=260, height=450)
-            col.grid(row=0, column=i, padx=20, pady=10)
-            col.pack_propagate(False)
-
-            # Yellow header
-            tk.Label(
-                col, text=title, font=("Arial", 16, "bold"),
-                bg="#EAB308", fg="black", height=2
-            ).pack(fill="x")
-
-            # Items
-            items_frame = tk.Frame(col, bg="#D9D9D9")
-            items_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-            for item in items:
-                tk.Label(
-                    items_frame, text="• " + item,
-                    font=("Arial", 12), bg="#D9D9D9", fg="black",
-                    anchor="w", justify="left", wraplength=240
-                ).pack(anchor="w", pady=2)
-
-        # Back button
-        tk.Button(
-            content_frame, text="BACK", bg="#EAB308", fg="black",
-            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
-            bd=0, highlightthickness=0, activebackground="#EAB308",
-            command=self.show_main_menu, cursor="hand2"
-        ).pack(side="bottom", pady=20)
-
-    def show_pricing(self):
-        self.clear_container()
-
-        # Title bar
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="PRICING",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Content frame with light gray background
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        # Pricing data structure
-        pricing_data = {
-            "General & Preventive": [
-                ("Dental check-up/consultation", "₱500 - ₱1,000"),
-                ("Teeth cleaning (prophylaxis)", "₱1,000 - ₱2,500"),
-                ("Oral examination & X-rays", "₱800 - ₱3,000"),
-                ("Fluoride treatment", "₱500 - ₱1,500"),
-                ("Sealants", "₱800 - ₱2,000 per tooth")
-            ],
-            "Restorative Dentistry": [
-                ("Fillings", "₱1,500 - ₱5,000 per tooth"),
-                ("Crowns", "₱8,000 - ₱25,000 per tooth"),
-                ("Bridges", "₱15,000 - ₱50,000"),
-                ("Dentures", "₱10,000 - ₱60,000"),
-                ("Dental implants", "₱40,000 - ₱100,000 per tooth"),
-                ("Root canal treatment", "₱5,000 - ₱15,000")
-            ],
-            "Cosmetic Dentistry": [
-                ("Teeth whitening", "₱5,000 - ₱15,000"),
-                ("Veneers", "₱15,000 - ₱40,000 per tooth"),
-                ("Bonding", "₱2,000 - ₱8,000 per tooth"),
-                ("Braces", "₱40,000 - ₱150,000"),
-                ("Invisalign/clear aligners", "₱100,000 - ₱250,000"),
-                ("Retainers", "₱3,000 - ₱10,000")
-            ],
-            "Oral Surgery": [
-                ("Tooth extraction", "₱1,500 - ₱5,000"),
-                ("Wisdom tooth removal", "₱5,000 - ₱15,000"),
-                ("Surgical removal of impacted teeth", "₱8,000 - ₱20,000"),
-                ("Bone grafting", "₱15,000 - ₱40,000")
-            ]
-        }
-
-        # Main container - centered
-        main_container = tk.Frame(content_frame, bg="#F5F5F5")
-        main_container.place(relx=0.5, rely=0.45, anchor="center")
-
-        # Create horizontal frame for all 4 categories side by side
-        categories_frame = tk.Frame(main_container, bg="#F5F5F5")
-        categories_frame.pack()
-
-        # Create all 4 categories in a single row
-        for category, items in pricing_data.items():
-            # Category container
-            cat_container = tk.Frame(categories_frame, bg="#F5F5F5")
-            cat_container.pack(side="left", padx=12)
-
-            # Category header
-            header = tk.Frame(cat_container, bg="#EAB308", width=250, height=55)
-            header.pack(fill="x")
-            header.pack_propagate(False)
-
-            tk.Label(
-                header,
-                text=category,
-                font=("Arial", 13, "bold"),
-                bg="#EAB308",
-                fg="black"
-            ).pack(expand=True)
-
-            # Items container with tall vertical box
-            items_container = tk.Frame(cat_container, bg="#D9D9D9", width=250, height=380)
-            items_container.pack(fill="both")
-            items_container.pack_propagate(False)
-
-            # Items frame with padding
-            items_frame = tk.Frame(items_container, bg="#D9D9D9")
-            items_frame.pack(fill="both", expand=True, padx=12, pady=12)
-
-            for service, price in items:
-                # Service row
-                service_row = tk.Frame(items_frame, bg="#D9D9D9")
-                service_row.pack(fill="x", pady=5)
-
-                tk.Label(
-                    service_row,
-                    text=f"• {service}",
-                    font=("Arial", 10),
-                    bg="#D9D9D9",
-                    fg="black",
-                    anchor="w",
-                    justify="left",
-                    wraplength=220
-                ).pack(anchor="w", fill="x")
-
-                # Price on separate line, indented
-                tk.Label(
-                    service_row,
-                    text=price,
-                    font=("Arial", 9, "bold"),
-                    bg="#D9D9D9",
-                    fg="black",
-                    anchor="w"
-                ).pack(anchor="w", padx=(10, 0))
-
-        # Bottom section
-        bottom_frame = tk.Frame(content_frame, bg="#F5F5F5")
-        bottom_frame.pack(side="bottom", fill="x", pady=15)
-
-        # Disclaimer
-        tk.Label(
-            bottom_frame,
-            text="*Prices are estimates and may vary. Please contact us for accurate quotes.",
-            font=("Arial", 9, "italic"),
-            bg="#F5F5F5",
-            fg="#666666"
-        ).pack(pady=(0, 10))
-
-        # Back button - centered
-        back_btn_frame = tk.Frame(bottom_frame, bg="#F5F5F5")
-        back_btn_frame.pack()
-
-        tk.Button(
-            back_btn_frame,
-            text="BACK",
-            bg="#EAB308",
-            fg="black",
-            font=("Arial", 14, "bold"),
-            width=12,
-            height=1,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
-            activebackground="#D4A307",
-            command=self.show_main_menu,
-            cursor="hand2"
-        ).pack()
-
-    # ---------------- About Us Page ----------------
-    def show_about_us(self):
-        self.clear_container()
-
-        # Title bar
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="ABOUT US",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Content frame
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        # Main container
-        about_container = tk.Frame(content_frame, bg="#F5F5F5")
-        about_container.place(relx=0.5, rely=0.4, anchor="center")
-
-        # About content
-        about_text = """Welcome to ToothPearl Dental Clinic!
-
-At ToothPearl, we believe that everyone deserves a healthy, beautiful smile. Our clinic is dedicated to providing exceptional dental care in a comfortable and welcoming environment.
-
-Our Mission
-To deliver comprehensive, patient-centered dental care using the latest technology and techniques, while ensuring every visit is comfortable and stress-free.
-
-Our Team
-Our experienced team of dentists and hygienists are committed to continuing education and staying current with the latest advancements in dentistry. We treat each patient like family.
-
-Why Choose Us?
-• State-of-the-art equipment and facilities
-• Experienced and caring dental professionals
-• Comprehensive range of dental services
-• Flexible scheduling and emergency care
-• Comfortable and modern clinic environment
-• Patient education and preventive care focus
-
-We look forward to welcoming you to our dental family!"""
-
-        tk.Label(
-            about_container,
-            text=about_text,
-            font=("Arial", 13),
-            bg="#F5F5F5",
-            fg="black",
-            justify="left",
-            wraplength=900
-        ).pack(pady=20, padx=50)
-
-        # Back button
-        tk.Button(
-            content_frame, text="BACK", bg="#EAB308", fg="black",
-            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
-            bd=0, highlightthickness=0, activebackground="#EAB308",
-            command=self.show_main_menu, cursor="hand2"
-        ).pack(side="bottom", pady=20)
-
-    # ---------------- Need Help Page ----------------
-    def show_need_help(self):
-        self.clear_container()
-
-        # Title bar
-        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
-        title_frame.pack(fill="x")
-        title_frame.pack_propagate(False)
-        tk.Label(
-            title_frame,
-            text="NEED HELP?",
-            font=("Arial Black", 32, "bold"),
-            bg="#FFEB3B",
-            fg="black"
-        ).pack(expand=True)
-
-        # Content frame
-        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
-        content_frame.pack(fill="both", expand=True)
-
-        # Main container with grid layout
-        help_container = tk.Frame(content_frame, bg="#F5F5F5")
-        help_container.place(relx=0.5, rely=0.4, anchor="center")
-
-        # Contact info sections in 2x2 grid
-        contact_sections = [
-            ("📞 Phone", [
-                "Main Line: (082) 123-4567",
-                "Emergency: (0917) 123-4567",
-                "Available: Mon-Sat, 8AM-8PM"
-            ]),
-            ("📧 Email", [
-                "General Inquiries: info@toothpearl.com",
-                "Appointments: appointments@toothpearl.com",
-                "We respond within 24 hours"
-            ]),
-            ("📍 Location", [
-                "ToothPearl Dental Clinic",
-                "123 Dental Street, Davao City",
-                "Near City Hall, 2nd Floor"
-            ]),
-            ("🕐 Clinic Hours", [
-                "Monday - Friday: 8:00 AM - 8:00 PM",
-                "Saturday: 9:00 AM - 6:00 PM",
-                "Sunday: Closed (Emergency calls only)"
-            ])
-        ]
-
-        # Create 2x2 grid
-        for idx, (title, items) in enumerate(contact_sections):
-            row = idx // 2
-            col = idx % 2
-
-            # Section frame
-            section = tk.Frame(help_container, bg="#D9D9D9", width=480, height=180)
-            section.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
-            section.pack_propagate(False)
-
-            # Title
-            tk.Label(
-                section,
-                text=title,
-                font=("Arial", 15, "bold"),
-                bg="#EAB308",
-                fg="black",
-                anchor="w",
-                padx=20,
-                pady=10
-            ).pack(fill="x")
-
-            # Items
-            for item in items:
-                tk.Label(
-                    section,
-                    text=item,
-                    font=("Arial", 12),
-                    bg="#D9D9D9",
-                    fg="black",
-                    anchor="w",
-                    padx=25,
-                    pady=5
-                ).pack(fill="x")
-
-        # Emergency note
-        tk.Label(
-            content_frame,
-            text="⚠️ For dental emergencies outside clinic hours, call our emergency hotline.",
-            font=("Arial", 12, "bold"),
-            bg="#FFEB3B",
-            fg="black",
-            pady=15,
-            padx=20
-        ).pack(side="bottom", pady=(0, 50))
-
-        # Back button
-        tk.Button(
-            content_frame, text="BACK", bg="#EAB308", fg="black",
-            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
-            bd=0, highlightthickness=0, activebackground="#EAB308",
-            command=self.show_main_menu, cursor="hand2"
-        ).pack(side="bottom", pady=20)
-
-
-# -------------------------
-# Run the App
-# -------------------------
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = DentalApp(root)
-    root.mainloop()
\ No newline at end of file
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import date as Date, datetime
+from PIL import Image, ImageTk
+from AppointmentManager import (AppointmentManager, Patient, SLOT_TAKEN, UNAVAILABLE, NOT_FOUND, ListingView,
+                                DEFAULT_VIEW, STALE_WATERMARK)
+from admin_table import AppointmentTable
+from autocomplete import Autocomplete
+from db_worker import DBWorker
+
+
+# -------------------------
+# Display formats - the manager and DB only ever see date/time objects
+# -------------------------
+DATE_FORMAT = "%m/%d/%Y"
+TIME_FORMAT = "%I:%M %p"
+
+
+def format_date(value):
+    return value.strftime(DATE_FORMAT)
+
+
+def format_time(value):
+    return value.strftime(TIME_FORMAT)
+
+
+def parse_time(text):
+    return datetime.strptime(text, TIME_FORMAT).time()
+
+
+def parse_date(text):
+    return datetime.strptime(text, DATE_FORMAT).date()
+
+
+def appointment_row(appt):
+    """Admin table values and status colour tag for one appointment"""
+    values = (
+        appt.id,
+        appt.patient.name,
+        appt.patient.email,
+        format_date(appt.date),
+        format_time(appt.time),
+        appt.dentist,
+        appt.status
+    )
+    return values, (appt.status.lower(),)
+
+
+# -------------------------
+# GUI Application
+# -------------------------
+class DentalApp:
+    def __init__(self, root):
+        self.manager = AppointmentManager()
+        self.root = root
+        self.root.title("ToothPearl Dental Clinic")
+        self.root.geometry("1200x700")
+        self.root.resizable(False, False)
+
+        # Database calls run on worker threads so a slow MySQL never freezes the window
+        self.worker = DBWorker(self.root)
+        self.worker.on_busy_change = lambda busy: self.root.config(cursor="watch" if busy else "")
+
+        # ---------- Load background image once ----------
+        try:
+            original_image = Image.open("ASSETS/clinic.bg.png")
+            resized = original_image.resize((1200, 700), Image.LANCZOS)
+            self.bg_photo = ImageTk.PhotoImage(resized)
+            self.bg_label = tk.Label(self.root, image=self.bg_photo)
+            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+        except Exception as e:
+            # fallback if image not found / cannot load
+            print("Warning: Could not load background image:", e)
+            self.bg_label = tk.Label(self.root, bg="white")
+            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+
+        # show the first page
+        self.show_main_menu()
+
+    def attach_patient_autocomplete(self, name_entry, email_entry, name_placeholder, email_placeholder):
+        """Suggest returning patients while either field is typed in; picking one fills both"""
+        def fill(patient):
+            for entry, value in ((name_entry, patient.name), (email_entry, patient.email)):
+                entry.delete(0, "end")
+                entry.insert(0, value)
+                entry.config(fg="black")
+
+        for entry, placeholder in ((name_entry, name_placeholder), (email_entry, email_placeholder)):
+            Autocomplete(entry, self.manager.suggest_patients, fill,
+                         describe=lambda patient: f"{patient.name}  <{patient.email}>",
+                         run=lambda fetch, on_done: self.worker.submit(fetch, on_done=on_done, group="page"),
+                         ignore=(placeholder,), parent=self.bg_label)
+
+    def clear_container(self):
+        """Destroy only widgets that were created inside the background label."""
+        # Reads started by the page being left are stale now
+        self.worker.cancel_group("page")
+        for widget in self.bg_label.winfo_children():
+            widget.destroy()
+
+    # ---------------- Main Menu ----------------
+    def show_main_menu(self):
+        self.clear_container()
+
+
+
+        # NAV UPPER BUTTONS
+        nav_buttons = [
+            ("SERVICES", self.show_services),
+            ("PRICING", self.show_pricing),
+            ("ABOUT US", self.show_about_us),
+            ("NEED HELP?", self.show_need_help),
+        ]
+
+        for idx, (text, cmd) in enumerate(nav_buttons):
+            btn = tk.Button(
+                self.bg_label,
+                text=text,
+                font=("Arial", 12, "bold"),
+                bg="#FFCC00",
+                fg="black",
+                padx=15,
+                pady=8,
+                relief="flat",
+                bd=0,
+                highlightthickness=0,
+                activebackground="#FFCC00",
+                activeforeground="black",
+                cursor="hand2",
+                command=cmd if cmd else None
+            )
+            btn.place(x=300 + (idx * 180), y=20)
+            btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
+            btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
+
+
+        button_actions = [
+            ("BOOK NOW", self.book_appointment_form),
+            ("CANCEL BOOKING", self.cancel_appointment_form),
+            ("REBOOK", self.rebook_form),
+        ]
+
+        for idx, (text, cmd) in enumerate(button_actions):
+            btn = tk.Button(
+                self.bg_label,
+                text=text,
+                font=("Arial Black", 14),
+                bg="#FFEB3B",
+                fg="black",
+                width=20,
+                height=2,
+                relief="flat",
+                bd=0,
+                highlightthickness=0,
+                activebackground="#FFEB3B",
+                activeforeground="black",
+                cursor="hand2",
+                command=cmd
+            )
+            btn.place(x=50, y=200 + (idx * 100))
+            btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
+            btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
+
+        # EXIT BUTTON
+        exit_btn = tk.Button(
+            self.bg_label,
+            text="EXIT",
+            font=("Arial Black", 14),
+            bg="#FFEB3B",
+            fg="black",
+            width=20,
+            height=2,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#FFEB3B",
+            activeforeground="black",
+            cursor="hand2",
+            command=self.root.quit
+        )
+        exit_btn.place(x=50, y=500)
+        exit_btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
+        exit_btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
+
+        # ADMIN LOGIN BUTTON
+        admin_btn = tk.Button(
+            self.bg_label,
+            text="Log In",
+            font=("Arial", 10, "bold"),
+            bg="#FFCC00",
+            fg="black",
+            width=10,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#FFCC00",
+            activeforeground="black",
+            cursor="hand2",
+            command=self.show_login_page
+        )
+        admin_btn.place(x=1080, y=610)
+        admin_btn.bind("<FocusIn>", lambda e: e.widget.config(relief="flat"))
+        admin_btn.bind("<FocusOut>", lambda e: e.widget.config(relief="flat"))
+
+    # ---------------- Admin Login Page ----------------
+    def show_login_page(self):
+        self.clear_container()
+
+        # Title frame
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="ADMIN LOGIN",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Content frame
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        # Login form container
+        login_container = tk.Frame(content_frame, bg="#F5F5F5")
+        login_container.place(relx=0.5, rely=0.45, anchor="center")
+
+        # Username field
+        username_frame = tk.Frame(login_container, bg="#F5F5F5")
+        username_frame.pack(pady=20)
+
+        tk.Label(
+            username_frame,
+            text="Username",
+            font=("Arial", 16, "bold"),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=10,
+            width=20
+        ).pack(fill="x", pady=(0, 8))
+
+        username_entry = tk.Entry(
+            username_frame,
+            width=30,
+            font=("Arial", 15),
+            bg="#D9D9D9",
+            relief="flat"
+        )
+        username_entry.pack(ipady=8)
+
+        # Password field
+        password_frame = tk.Frame(login_container, bg="#F5F5F5")
+        password_frame.pack(pady=20)
+
+        tk.Label(
+            password_frame,
+            text="Password",
+            font=("Arial", 16, "bold"),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=10,
+            width=20
+        ).pack(fill="x", pady=(0, 8))
+
+        password_entry = tk.Entry(
+            password_frame,
+            width=30,
+            font=("Arial", 15),
+            bg="#D9D9D9",
+            relief="flat",
+            show="●"
+        )
+        password_entry.pack(ipady=8)
+
+        # Button frame
+        button_frame = tk.Frame(login_container, bg="#F5F5F5")
+        button_frame.pack(pady=30)
+
+        def attempt_login():
+            username = username_entry.get().strip()
+            password = password_entry.get().strip()
+
+            if self.manager.verify_admin(username, password):
+                messagebox.showinfo("Success", "Login successful!")
+                self.show_admin_page()
+            else:
+                messagebox.showerror("Error", "Invalid username or password!")
+                password_entry.delete(0, "end")
+
+        tk.Button(
+            button_frame,
+            text="BACK",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=12,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#EAB308",
+            command=self.show_main_menu,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        tk.Button(
+            button_frame,
+            text="LOGIN",
+            bg="#4CAF50",
+            fg="white",
+            font=("Arial", 14, "bold"),
+            width=12,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#45a049",
+            command=attempt_login,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        # Bind Enter key to login
+        password_entry.bind("<Return>", lambda e: attempt_login())
+        username_entry.bind("<Return>", lambda e: password_entry.focus())
+
+    def show_admin_page(self):
+        self.clear_container()
+
+        # Title bar
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="ADMIN DASHBOARD - MANAGE APPOINTMENTS",
+            font=("Arial Black", 28, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Content frame
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        # Table container
+        table_container = tk.Frame(content_frame, bg="#F5F5F5")
+        table_container.pack(fill="both", expand=True, padx=40, pady=20)
+
+        # Style for treeview - Updated with borders
+        # Style for treeview - Updated with borders
+        style = ttk.Style()
+        style.theme_use("clam")
+        style.configure("Admin.Treeview",
+                        background="#D9D9D9",
+                        foreground="black",
+                        rowheight=40,
+                        fieldbackground="#D9D9D9",
+                        borderwidth=2,
+                        relief="solid")
+        style.configure("Admin.Treeview.Heading",
+                        background="#4A90E2",
+                        foreground="white",
+                        font=("Arial", 12, "bold"),
+                        borderwidth=2,
+                        relief="solid")
+        style.map("Admin.Treeview",
+                  background=[("selected", "#CFCFCF")],  # light gray
+                  foreground=[("selected", "black")])  # keep text visible
+        style.map("Admin.Treeview.Heading",
+                  background=[("active", "#4A90E2")])
+
+        # Filter bar - filtering, search and sorting all run in the database
+        view = DEFAULT_VIEW
+        filter_frame = tk.Frame(table_container, bg="#F5F5F5")
+        filter_frame.pack(fill="x", pady=(0, 10))
+
+        tk.Label(filter_frame, text="Search:", font=("Arial", 11), bg="#F5F5F5").pack(side="left")
+        search_entry = tk.Entry(filter_frame, font=("Arial", 11), width=20)
+        search_entry.pack(side="left", padx=(5, 15))
+
+        tk.Label(filter_frame, text="Status:", font=("Arial", 11), bg="#F5F5F5").pack(side="left")
+        status_combo = ttk.Combobox(filter_frame, values=["All", "Pending", "Confirmed", "Declined"],
+                                    state="readonly", width=10)
+        status_combo.set("All")
+        status_combo.pack(side="left", padx=(5, 15))
+
+        tk.Label(filter_frame, text="Dentist:", font=("Arial", 11), bg="#F5F5F5").pack(side="left")
+        dentist_filter = ttk.Combobox(filter_frame, values=["All"] + self.manager.dentists, state="readonly",
+                                      width=24)
+        dentist_filter.set("All")
+        dentist_filter.pack(side="left", padx=(5, 15))
+
+        tk.Label(filter_frame, text="From:", font=("Arial", 11), bg="#F5F5F5").pack(side="left")
+        from_entry = tk.Entry(filter_frame, font=("Arial", 11), width=11)
+        from_entry.pack(side="left", padx=(5, 10))
+        tk.Label(filter_frame, text="To:", font=("Arial", 11), bg="#F5F5F5").pack(side="left")
+        to_entry = tk.Entry(filter_frame, font=("Arial", 11), width=11)
+        to_entry.pack(side="left", padx=(5, 15))
+
+        def set_view(new_view):
+            nonlocal view
+            if new_view != view:
+                view = new_view
+                refresh_table()
+
+        def apply_filters():
+            try:
+                start = parse_date(from_entry.get().strip()) if from_entry.get().strip() else None
+                end = parse_date(to_entry.get().strip()) if to_entry.get().strip() else None
+            except ValueError:
+                messagebox.showwarning("Warning", "Dates must be MM/DD/YYYY!")
+                return
+            set_view(ListingView(
+                status=None if status_combo.get() == "All" else status_combo.get(),
+                dentist=None if dentist_filter.get() == "All" else dentist_filter.get(),
+                start=start, end=end, search=search_entry.get().strip() or None,
+                sort=view.sort, descending=view.descending
+            ))
+
+        def clear_filters():
+            search_entry.delete(0, tk.END)
+            from_entry.delete(0, tk.END)
+            to_entry.delete(0, tk.END)
+            status_combo.set("All")
+            dentist_filter.set("All")
+            set_view(ListingView(sort=view.sort, descending=view.descending))
+
+        def sort_by(sort):
+            # Clicking the current sort column again flips its direction
+            descending = not view.descending if sort == view.sort else sort == "date"
+            set_view(ListingView(view.status, view.dentist, view.start, view.end, view.search, sort, descending))
+
+        tk.Button(filter_frame, text="Apply", font=("Arial", 10, "bold"), bg="#4A90E2", fg="white",
+                  command=apply_filters, cursor="hand2").pack(side="left", padx=5)
+        tk.Button(filter_frame, text="Clear", font=("Arial", 10, "bold"), bg="#9E9E9E", fg="white",
+                  command=clear_filters, cursor="hand2").pack(side="left", padx=5)
+        for entry in (search_entry, from_entry, to_entry):
+            entry.bind("<Return>", lambda e: apply_filters())
+
+        # Create treeview with border
+        tree_frame = tk.Frame(table_container, bg="#4A90E2", bd=2, relief="solid")
+        tree_frame.pack(fill="both", expand=True)
+
+        tree = ttk.Treeview(
+            tree_frame,
+            columns=("id", "name", "email", "date", "time", "dentist", "status"),
+            show="headings",
+            style="Admin.Treeview",
+            selectmode="extended",  # shift/ctrl-click to act on many rows at once
+            height=10
+        )
+
+        # Define headings
+        tree.heading("id", text="ID")
+        tree.heading("name", text="Patient Name", command=lambda: sort_by("name"))
+        tree.heading("email", text="Email Address", command=lambda: sort_by("email"))
+        tree.heading("date", text="Date", command=lambda: sort_by("date"))
+        tree.heading("time", text="Time", command=lambda: sort_by("date"))
+        tree.heading("dentist", text="Dentist", command=lambda: sort_by("dentist"))
+        tree.heading("status", text="Status", command=lambda: sort_by("status"))
+
+        # Define column widths and alignments
+        tree.column("id", width=80, anchor="center")
+        tree.column("name", width=150, anchor="w")
+        tree.column("email", width=220, anchor="w")
+        tree.column("date", width=100, anchor="center")
+        tree.column("time", width=100, anchor="center")
+        tree.column("dentist", width=150, anchor="w")
+        tree.column("status", width=100, anchor="center")
+
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+
+        # Pack tree and scrollbar
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Configure tags for colors (keeping your original color coding)
+        tree.tag_configure("confirmed", background="#C8E6C9")
+        tree.tag_configure("declined", background="#FFCDD2")
+        tree.tag_configure("pending", background="#FFF9C4")
+
+        # Detail pane - the listing carries only the table columns, the rest loads on selection
+        detail_label = tk.Label(table_container, text="Select an appointment to see its details.",
+                                font=("Arial", 11), bg="#F5F5F5", fg="#333333", justify="left", anchor="w")
+        detail_label.pack(fill="x", pady=(8, 0))
+        detail_job = None
+
+        def show_details(event=None):
+            nonlocal detail_job
+            if detail_job:
+                self.worker.cancel(detail_job)
+                detail_job = None
+            selected = tree.selection()
+            if len(selected) != 1:
+                detail_label.config(text=f"{len(selected)} appointments selected." if selected
+                                    else "Select an appointment to see its details.")
+                return
+            appt_id = selected[0]
+
+            def on_details(details):
+                if not detail_label.winfo_exists():
+                    return
+                if details is None:
+                    detail_label.config(text=f"Appointment {appt_id}: details unavailable.")
+                    return
+                booked = details.booked_at.strftime("%m/%d/%Y %I:%M %p") if details.booked_at else "-"
+                since = format_date(details.patient_since) if details.patient_since else "-"
+                detail_label.config(text=f"Appointment {appt_id}  |  Booked: {booked}  |  "
+                                         f"Gender: {details.gender or '-'}  |  Patient since: {since}\n"
+                                         f"Reason: {details.reason or '-'}")
+
+            detail_label.config(text="Loading details...")
+            detail_job = self.worker.submit(self.manager.appointment_details, appt_id, on_done=on_details,
+                                            group="page")
+
+        tree.bind("<<TreeviewSelect>>", show_details)
+
+        # Only the rows around the viewport are materialised; more pages load on scroll
+        table = AppointmentTable(
+            tree, scrollbar, lambda **window: self.manager.appointments_window(view=shown, **window),
+            appointment_row,
+            run=lambda fetch, on_done: self.worker.submit(fetch, on_done=on_done, group="page"),
+            descending=DEFAULT_VIEW.descending, order_key=DEFAULT_VIEW.order_key
+        )
+
+        # Watermark of the last load/sync, for incremental refreshes, and the view the table shows
+        watermark = None
+        shown = DEFAULT_VIEW
+        total = 0
+
+        # Function to refresh the table
+        def refresh_table():
+            requested = view
+
+            def load():
+                # Take the watermark first so nothing changed during the reload is missed
+                changes = self.manager.changes_since(view=requested)
+                return (changes[2] if changes else None), self.manager.count_appointments(requested)
+
+            def on_loaded(result):
+                nonlocal watermark, total, shown
+                watermark, total = result
+                # Switch the table over only now - its cursors belong to the view they came from
+                shown = requested
+                stats_label.config(text=f"{'Matching' if shown.filtered else 'Total'} Appointments: {total}")
+                table.reload(descending=shown.descending, order_key=shown.order_key)
+
+            stats_label.config(text="Loading...")
+            self.worker.submit(load, on_done=on_loaded, group="page")
+
+        def apply_changes(background=False):
+            """Patch only the rows changed since the last load or sync"""
+            if watermark is None:
+                refresh_table()
+                return
+
+            def on_changes(changes):
+                nonlocal watermark
+                if changes is None:
+                    return
+                if changes == STALE_WATERMARK:
+                    # Away too long to know every delete since - start over
+                    refresh_table()
+                    return
+                changed, deleted, watermark = changes
+                table.apply_changes(changed, deleted)
+
+            self.worker.submit(self.manager.changes_since, watermark, shown, on_done=on_changes, group="page",
+                               background=background)
+
+        def refresh_count():
+            # Status changes move rows in or out of a status-filtered view
+            requested = shown
+
+            def on_counted(count):
+                nonlocal total
+                if requested == shown and stats_label.winfo_exists():
+                    total = count
+                    stats_label.config(text=f"{'Matching' if shown.filtered else 'Total'} Appointments: {total}")
+
+            self.worker.submit(self.manager.count_appointments, requested, on_done=on_counted, group="page")
+
+        def poll_changes():
+            # Pick up bookings made elsewhere while the dashboard is open
+            if not tree.winfo_exists():
+                return
+            apply_changes(background=True)
+            tree.after(10000, poll_changes)
+
+        # Action buttons frame
+        action_frame = tk.Frame(content_frame, bg="#F5F5F5")
+        action_frame.pack(pady=15)
+
+        def describe(appt_ids):
+            return f"appointment {appt_ids[0]}" if len(appt_ids) == 1 else f"{len(appt_ids)} appointments"
+
+        def confirm_selected():
+            appt_ids = list(tree.selection())
+            if not appt_ids:
+                messagebox.showwarning("Warning", "Please select an appointment to confirm!")
+                return
+
+            def on_confirmed(ok):
+                if not ok:
+                    messagebox.showerror("Error", "Failed to confirm appointment!")
+                    return
+                messagebox.showinfo("Success", f"{describe(appt_ids).capitalize()} confirmed!")
+                if tree.winfo_exists():
+                    if shown.status is not None:
+                        refresh_count()
+                    apply_changes()
+
+            # All of them in one transaction, then one delta for the table
+            self.worker.submit(self.manager.confirm_appointments, appt_ids, on_done=on_confirmed)
+
+        def decline_selected():
+            appt_ids = list(tree.selection())
+            if not appt_ids:
+                messagebox.showwarning("Warning", "Please select an appointment to decline!")
+                return
+
+            result = messagebox.askyesno("Confirm Decline",
+                                         f"Are you sure you want to decline {describe(appt_ids)}?")
+            if not result:
+                return
+
+            def on_declined(ok):
+                if not ok:
+                    messagebox.showerror("Error", "Failed to decline appointment!")
+                    return
+                messagebox.showinfo("Success", f"{describe(appt_ids).capitalize()} declined!")
+                if tree.winfo_exists():
+                    if shown.status is not None:
+                        refresh_count()
+                    apply_changes()
+
+            self.worker.submit(self.manager.decline_appointments, appt_ids, on_done=on_declined)
+
+        def delete_selected():
+            appt_ids = list(tree.selection())
+            if not appt_ids:
+                messagebox.showwarning("Warning", "Please select an appointment to delete!")
+                return
+
+            result = messagebox.askyesno("Confirm Delete",
+                                         f"Are you sure you want to permanently delete {describe(appt_ids)}?")
+            if not result:
+                return
+
+            def on_deleted(deleted):
+                nonlocal total
+                if deleted is None:
+                    messagebox.showerror("Error", "Failed to delete appointment!")
+                    return
+                messagebox.showinfo("Success", f"{describe(appt_ids).capitalize()} deleted!")
+                if tree.winfo_exists():
+                    # Some may already have gone in another session
+                    total -= len(deleted)
+                    stats_label.config(text=f"{'Matching' if shown.filtered else 'Total'} Appointments: {total}")
+                    apply_changes()
+
+            self.worker.submit(self.manager.cancel_appointments, appt_ids, on_done=on_deleted)
+
+        # Action buttons
+        tk.Button(
+            action_frame,
+            text="✓ CONFIRM",
+            bg="#4CAF50",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            width=15,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#45a049",
+            command=confirm_selected,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        tk.Button(
+            action_frame,
+            text="✗ DECLINE",
+            bg="#FF9800",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            width=15,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#F57C00",
+            command=decline_selected,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        tk.Button(
+            action_frame,
+            text="🗑 DELETE",
+            bg="#F44336",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            width=15,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#D32F2F",
+            command=delete_selected,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        tk.Button(
+            action_frame,
+            text="↻ REFRESH",
+            bg="#2196F3",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            width=15,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#1976D2",
+            command=refresh_table,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        tk.Button(
+            action_frame,
+            text="🔍 FIND VISITS",
+            bg="#673AB7",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            width=15,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#5E35B1",
+            command=self.show_visit_search,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        # Statistics label
+        stats_label = tk.Label(
+            action_frame,
+            text="",
+            font=("Arial", 11, "bold"),
+            bg="#F5F5F5",
+            fg="#666666"
+        )
+        stats_label.pack(side="left", padx=20)
+
+        # Initial load
+        refresh_table()
+        tree.after(10000, poll_changes)
+
+        # Bottom buttons
+        bottom_frame = tk.Frame(content_frame, bg="#F5F5F5")
+        bottom_frame.pack(side="bottom", pady=15)
+
+        tk.Button(
+            bottom_frame,
+            text="LOGOUT",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=15,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#D4A307",
+            command=self.show_main_menu,
+            cursor="hand2"
+        ).pack()
+
+    def show_visit_search(self):
+        """Full-text search over visit reasons and patient names, in its own window"""
+        window = tk.Toplevel(self.root)
+        window.title("Find Visits")
+        window.geometry("820x480")
+        window.configure(bg="#F5F5F5")
+
+        search_frame = tk.Frame(window, bg="#F5F5F5")
+        search_frame.pack(fill="x", padx=15, pady=10)
+        tk.Label(search_frame, text="Reason or patient name:", font=("Arial", 11),
+                 bg="#F5F5F5").pack(side="left")
+        query_entry = tk.Entry(search_frame, font=("Arial", 11), width=35)
+        query_entry.pack(side="left", padx=10)
+        query_entry.focus()
+
+        results = ttk.Treeview(window, columns=("id", "name", "date", "time", "dentist", "status"),
+                               show="headings", height=12)
+        for column, heading, width in (("id", "ID", 100), ("name", "Patient Name", 180), ("date", "Date", 100),
+                                       ("time", "Time", 90), ("dentist", "Dentist", 200),
+                                       ("status", "Status", 100)):
+            results.heading(column, text=heading)
+            results.column(column, width=width, anchor="w" if column in ("name", "dentist") else "center")
+        results.pack(fill="both", expand=True, padx=15)
+
+        status_label = tk.Label(window, text="Best matches are listed first.", font=("Arial", 10),
+                                bg="#F5F5F5", fg="#333333", justify="left", anchor="w")
+        status_label.pack(fill="x", padx=15, pady=5)
+
+        query, page = "", 0
+
+        def on_results(result, append):
+            if not window.winfo_exists():
+                return
+            appointments, more = result
+            if not append:
+                results.delete(*results.get_children())
+            for appt in appointments:
+                if results.exists(appt.id):
+                    continue  # offsets shift if bookings change between pages
+                values = appointment_row(appt)[0]
+                results.insert("", "end", iid=appt.id, values=values[:2] + values[3:])
+            more_btn.config(state="normal" if more else "disabled")
+            if not results.get_children():
+                status_label.config(text=f"No visits match \"{query}\".")
+            else:
+                status_label.config(text=f"{len(results.get_children())} visits shown, best matches first.")
+
+        def search(append=False):
+            nonlocal query, page
+            if append:
+                page += 1
+            else:
+                query, page = query_entry.get().strip(), 0
+                if not query:
+                    return
+            self.worker.submit(self.manager.search_appointments, query, page,
+                               on_done=lambda result: on_results(result, append))
+
+        def show_reason(event=None):
+            selected = results.selection()
+            if len(selected) != 1:
+                return
+
+            def on_details(details):
+                if window.winfo_exists() and details is not None:
+                    status_label.config(text=f"Appointment {selected[0]} - Reason: {details.reason or '-'}")
+
+            self.worker.submit(self.manager.appointment_details, selected[0], on_done=on_details)
+
+        tk.Button(search_frame, text="Search", font=("Arial", 10, "bold"), bg="#673AB7", fg="white",
+                  command=search, cursor="hand2").pack(side="left", padx=5)
+        more_btn = tk.Button(search_frame, text="More results", font=("Arial", 10, "bold"), state="disabled",
+                             command=lambda: search(append=True), cursor="hand2")
+        more_btn.pack(side="left", padx=5)
+        query_entry.bind("<Return>", lambda e: search())
+        results.bind("<<TreeviewSelect>>", show_reason)
+
+    # ---------------- Booking Form ----------------
+    def book_appointment_form(self, rebook=None, rebook_reason=""):
+        """Booking form - given an Appointment in rebook, moves it instead of booking a new one"""
+        self.clear_container()
+
+        # Title frame
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="TOOTHPEARL DENTAL CLINIC",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        form_container = tk.Frame(content_frame, bg="#F5F5F5")
+        form_container.place(relx=0.5, rely=0.5, anchor="center")
+
+        # --- helper to create entry with placeholder behavior ---
+        def make_entry_with_placeholder(parent, placeholder, **entry_opts):
+            entry = tk.Entry(parent, **entry_opts)
+            ph = placeholder
+            entry.insert(0, ph)
+            entry.config(fg="grey")
+
+            def on_focus_in(event, e=entry, ph=ph):
+                if e.get() == ph:
+                    e.delete(0, "end")
+                    e.config(fg="black")
+
+            def on_focus_out(event, e=entry, ph=ph):
+                if not e.get().strip():
+                    e.insert(0, ph)
+                    e.config(fg="grey")
+
+            entry.bind("<FocusIn>", on_focus_in)
+            entry.bind("<FocusOut>", on_focus_out)
+            return entry
+
+        # ROW 1
+        row1_frame = tk.Frame(form_container, bg="#F5F5F5")
+        row1_frame.pack(pady=(40, 20))
+
+        name_frame = tk.Frame(row1_frame, bg="#F5F5F5")
+        name_frame.pack(side="left", padx=(0, 60))
+        tk.Label(
+            name_frame,
+            text="Name",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=5
+        ).pack(fill="x", pady=(0, 8))
+
+        name_placeholder = "Ex. Justine Nabunturan"
+        name_entry = make_entry_with_placeholder(
+            name_frame,
+            name_placeholder,
+            width=40, font=("Arial", 15), bg="#D9D9D9", relief="flat"
+        )
+        name_entry.pack(ipady=6)
+        if rebook:
+            name_entry.delete(0, "end")
+            name_entry.insert(0, rebook.patient.name)
+            name_entry.config(fg="black", state="readonly")
+
+        dentist_frame = tk.Frame(row1_frame, bg="#F5F5F5")
+        dentist_frame.pack(side="left")
+        tk.Label(
+            dentist_frame,
+            text="Preferred Dentist",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=5
+        ).pack(fill="x", pady=(0, 8))
+
+        dentist_combo = ttk.Combobox(dentist_frame, values=self.manager.dentists, state="readonly",
+                                     width=38, font=("Arial", 14))
+        dentist_combo.set(rebook.dentist if rebook else "Ex. Dr. Jhunsuy Love Jun")
+        dentist_combo.pack()
+
+        # ROW 2
+        row2_frame = tk.Frame(form_container, bg="#F5F5F5")
+        row2_frame.pack(pady=20)
+        gender_frame = tk.Frame(row2_frame, bg="#F5F5F5")
+        gender_frame.pack(side="left", padx=(5, 60))
+        tk.Label(
+            gender_frame,
+            text="Gender",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=5
+        ).pack(fill="x", pady=(0, 8))
+
+        radio_container = tk.Frame(gender_frame, bg="#D9D9D9", width=440, height=45)
+        radio_container.pack()
+        radio_container.pack_propagate(False)
+
+        gender_var = tk.StringVar(value="N/A")
+        radio_inner = tk.Frame(radio_container, bg="#D9D9D9")
+        radio_inner.pack(anchor="w", padx=10, pady=8)
+        tk.Radiobutton(radio_inner, text="Male", variable=gender_var, value="Male",
+                       bg="#D9D9D9", font=("Arial", 12), activebackground="#D9D9D9").pack(side="left", padx=(0, 15))
+        tk.Radiobutton(radio_inner, text="Female", variable=gender_var, value="Female",
+                       bg="#D9D9D9", font=("Arial", 12), activebackground="#D9D9D9").pack(side="left", padx=(0, 15))
+        tk.Radiobutton(radio_inner, text="Prefer not to say", variable=gender_var, value="N/A",
+                       bg="#D9D9D9", font=("Arial", 12), activebackground="#D9D9D9").pack(side="left")
+
+        email_frame = tk.Frame(row2_frame, bg="#F5F5F5")
+        email_frame.pack(side="left")
+        tk.Label(
+            email_frame,
+            text="Email address",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=5
+        ).pack(fill="x", pady=(0, 8))
+
+        email_placeholder = "Ex. j.nabunturan1111@umindanao.edu.ph"
+        email_entry = make_entry_with_placeholder(
+            email_frame,
+            email_placeholder,
+            width=40, font=("Arial", 15), bg="#D9D9D9", relief="flat"
+        )
+        email_entry.pack(ipady=6)
+        if rebook:
+            email_entry.delete(0, "end")
+            email_entry.insert(0, rebook.patient.email)
+            email_entry.config(fg="black", state="readonly")
+        else:
+            self.attach_patient_autocomplete(name_entry, email_entry, name_placeholder, email_placeholder)
+
+        # ROW 3
+        row3_frame = tk.Frame(form_container, bg="#F5F5F5")
+        row3_frame.pack(pady=20)
+        reason_frame = tk.Frame(row3_frame, bg="#F5F5F5")
+        reason_frame.pack(side="left", padx=(0, 60))
+        tk.Label(
+            reason_frame,
+            text="Reason for Visit",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=5
+        ).pack(fill="x", pady=(0, 8))
+
+        # A move keeps the appointment's length unless another service is picked
+        keep_length = f"Same as before ({rebook.duration} min)" if rebook else None
+        service_combo = ttk.Combobox(reason_frame, values=([keep_length] if rebook else []) + list(self.manager.services),
+                                     state="readonly", width=38, font=("Arial", 12))
+        service_combo.set(keep_length or "Check-up / consultation")
+        service_combo.pack(pady=(0, 8))
+
+        def get_duration():
+            if rebook and service_combo.get() == keep_length:
+                return rebook.duration
+            return self.manager.service_duration(service_combo.get())
+
+        reason_placeholder = "Ex. Wisdom tooth Root canal"
+
+        reason_text = tk.Text(
+            reason_frame,
+            width=40,
+            height=4,
+            font=("Arial", 14),
+            bg="#D9D9D9",
+            relief="flat",
+            wrap="word"
+        )
+        reason_text.pack()
+
+        if rebook_reason:
+            reason_text.insert("1.0", rebook_reason)
+        else:
+            reason_text.insert("1.0", reason_placeholder)
+            reason_text.config(fg="gray")
+
+        def on_focus_in(event):
+            if reason_text.get("1.0", "end-1c") == reason_placeholder:
+                reason_text.delete("1.0", "end")
+                reason_text.config(fg="black")
+
+        def on_focus_out(event):
+            if reason_text.get("1.0", "end-1c").strip() == "":
+                reason_text.insert("1.0", reason_placeholder)
+                reason_text.config(fg="gray")
+
+        reason_text.bind("<FocusIn>", on_focus_in)
+        reason_text.bind("<FocusOut>", on_focus_out)
+
+        # DATE AND TIME SELECTION
+        datetime_frame = tk.Frame(row3_frame, bg="#F5F5F5")
+        datetime_frame.pack(side="left")
+
+        tk.Label(
+            datetime_frame,
+            text="SELECT DATE & TIME",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="w",
+            padx=5
+        ).pack(fill="x", pady=(0, 8))
+
+        datetime_container = tk.Frame(datetime_frame, bg="#D9D9D9", width=440, height=200)
+        datetime_container.pack()
+        datetime_container.pack_propagate(False)
+
+        # --- New Scrollable Date Selectors ---
+        date_inner = tk.Frame(datetime_container, bg="#D9D9D9")
+        date_inner.pack(fill="x", padx=10, pady=(10, 5))
+
+        tk.Label(
+            date_inner,
+            text="Date:",
+            font=("Arial", 12, "bold"),
+            bg="#D9D9D9",
+            fg="black"
+        ).pack(side="left", padx=(0, 10))
+
+        month_var = tk.StringVar(value=str(rebook.date.month) if rebook else "1")
+        day_var = tk.StringVar(value=str(rebook.date.day) if rebook else "1")
+        year_var = tk.StringVar(value=str(rebook.date.year) if rebook else "2025")
+
+        month_spin = tk.Spinbox(date_inner, from_=1, to=12, wrap=True, width=5,
+                                font=("Arial", 12), justify="center", textvariable=month_var,
+                                state="readonly", relief="flat")
+        month_spin.pack(side="left", padx=(0, 5))
+
+        day_spin = tk.Spinbox(date_inner, from_=1, to=31, wrap=True, width=5,
+                              font=("Arial", 12), justify="center", textvariable=day_var,
+                              state="readonly", relief="flat")
+        day_spin.pack(side="left", padx=(0, 5))
+
+        year_spin = tk.Spinbox(date_inner, from_=2025, to=2030, wrap=True, width=7,
+                               font=("Arial", 12), justify="center", textvariable=year_var,
+                               state="readonly", relief="flat")
+        year_spin.pack(side="left", padx=(0, 5))
+
+        earliest_btn = tk.Button(date_inner, text="EARLIEST", font=("Arial", 9, "bold"),
+                                 bg="#EAB308", fg="black", relief="flat", cursor="hand2",
+                                 activebackground="#EAB308", command=lambda: find_earliest())
+        earliest_btn.pack(side="left", padx=(5, 0))
+
+        def get_selected_date():
+            """Selected date, or None for impossible dates such as 02/31"""
+            try:
+                return Date(int(year_var.get()), int(month_var.get()), int(day_var.get()))
+            except ValueError:
+                return None
+
+        # Time slots
+        time_label = tk.Label(
+            datetime_container,
+            text="Available Times (select dentist & date first):",
+            font=("Arial", 10),
+            bg="#D9D9D9",
+            fg="#666666"
+        )
+        time_label.pack(pady=(5, 5))
+
+        time_canvas = tk.Canvas(datetime_container, bg="#D9D9D9", height=100, highlightthickness=0)
+        time_scrollbar = tk.Scrollbar(datetime_container, orient="vertical", command=time_canvas.yview)
+        time_slots_frame = tk.Frame(time_canvas, bg="#D9D9D9")
+
+        time_canvas.configure(yscrollcommand=time_scrollbar.set)
+        time_canvas.pack(side="left", fill="both", expand=True, padx=(10, 0))
+        time_scrollbar.pack(side="right", fill="y", padx=(0, 10))
+
+        canvas_frame = time_canvas.create_window((0, 0), window=time_slots_frame, anchor="nw")
+
+        selected_time = tk.StringVar(value="")
+
+        shown_date, shown_slots = None, []
+        slot_job = None
+
+        def update_time_slots():
+            nonlocal slot_job
+            if slot_job:
+                # A newer date/dentist replaces the request still in flight
+                self.worker.cancel(slot_job)
+                slot_job = None
+
+            date = get_selected_date()
+            if date is None:
+                for widget in time_slots_frame.winfo_children():
+                    widget.destroy()
+                time_label.config(text="✗ That date does not exist", fg="#F44336")
+                time_canvas.config(scrollregion=(0, 0, 0, 0))
+                return
+
+            # One availability query once a dentist is picked, otherwise show every slot
+            dentist = dentist_combo.get().strip()
+            if dentist in self.manager.dentists:
+                time_label.config(text="Checking availability...", fg="#666666")
+                slot_job = self.worker.submit(self.manager.get_available_slots, dentist, date, get_duration(),
+                                              on_done=lambda slots: render_time_slots(date, slots),
+                                              group="page")
+            else:
+                render_time_slots(date, self.manager.time_slots)
+
+        def render_time_slots(date, available_slots):
+            nonlocal shown_date, shown_slots
+            shown_date, shown_slots = date, available_slots
+            for widget in time_slots_frame.winfo_children():
+                widget.destroy()
+
+            # Update label right away with the date
+            time_label.config(
+                text=f"✓ {len(available_slots)} available time slots for {format_date(date)} "
+                     f"({get_duration()} min)",
+                fg="#4CAF50"
+            )
+
+            row, col = 0, 0
+            current_selected = selected_time.get()
+
+            for slot in available_slots:
+                time_slot = format_time(slot)
+                is_selected = time_slot == current_selected
+                bg_color = "#FFF59D" if is_selected else "#C8E6C9"
+
+                btn = tk.Button(
+                    time_slots_frame,
+                    text=time_slot,
+                    font=("Arial", 9, "bold" if is_selected else "normal"),
+                    width=10, height=1,
+                    bg=bg_color,
+                    fg="black",
+                    relief="flat",
+                    cursor="hand2",
+                    command=lambda t=time_slot: select_time(t)
+                )
+                btn.grid(row=row, column=col, padx=3, pady=3)
+                col += 1
+                if col > 2:
+                    col = 0
+                    row += 1
+
+            time_slots_frame.update_idletasks()
+            time_canvas.config(scrollregion=time_canvas.bbox("all"))
+
+        def select_time(time):
+            selected_time.set(time)
+            render_time_slots(shown_date, shown_slots)
+
+        def find_earliest():
+            """Jump to the earliest free slot - for the chosen dentist, or anyone"""
+            dentist = dentist_combo.get().strip()
+            dentists = [dentist] if dentist in self.manager.dentists else None
+
+            def on_found(found):
+                if not earliest_btn.winfo_exists():
+                    return
+                earliest_btn.config(state="normal", text="EARLIEST")
+                if not found:
+                    messagebox.showinfo("No Slots", "No free slot in the next 90 days.")
+                    return
+                dentist, date, time = found[0]
+                dentist_combo.set(dentist)
+                selected_time.set(format_time(time))
+                # Day first so an intermediate date like 02/31 never shows up
+                day_var.set("1")
+                year_var.set(str(date.year))
+                month_var.set(str(date.month))
+                day_var.set(str(date.day))
+
+            earliest_btn.config(state="disabled", text="SEARCHING...")
+            duration = get_duration()  # read widgets here, not on the worker
+            self.worker.submit(lambda: self.manager.next_available(1, dentists, duration=duration),
+                               on_done=on_found, group="page")
+
+        def on_date_change(*args):
+            update_time_slots()
+
+        # ✅ Automatically show times on date change
+        month_var.trace_add("write", on_date_change)
+        day_var.trace_add("write", on_date_change)
+        year_var.trace_add("write", on_date_change)
+
+        # ✅ Keep dentist combo refresh optional (not required)
+        dentist_combo.bind("<<ComboboxSelected>>", lambda e: update_time_slots())
+
+        def on_service_change(event):
+            # A longer service may not fit where the chosen time is
+            selected_time.set("")
+            update_time_slots()
+
+        service_combo.bind("<<ComboboxSelected>>", on_service_change)
+
+        # ✅ Trigger once immediately so times show on load
+        update_time_slots()
+
+        # ✅ Bind scroll updates
+        month_var.trace_add("write", on_date_change)
+        day_var.trace_add("write", on_date_change)
+        year_var.trace_add("write", on_date_change)
+        dentist_combo.bind("<<ComboboxSelected>>", lambda e: update_time_slots())
+
+        # BUTTON ROW
+        button_frame = tk.Frame(form_container, bg="#F5F5F5")
+        button_frame.pack(pady=(20, 20), anchor="e")
+
+        def confirm_booking():
+            name = name_entry.get().strip()
+            if name == name_placeholder:
+                name = ""
+
+            email = email_entry.get().strip()
+            if email == email_placeholder:
+                email = ""
+
+            date = get_selected_date()
+            time = selected_time.get().strip()
+            time = parse_time(time) if time else None
+
+            dentist = dentist_combo.get().strip()
+            if dentist.startswith("Ex. "):
+                dentist = dentist[4:].strip()
+            if dentist == "" or dentist.lower().startswith("dr.") and dentist == "":
+                dentist = ""
+
+            gender = gender_var.get()
+
+            reason = reason_text.get("1.0", "end-1c").strip()
+            if reason == reason_placeholder:
+                reason = ""
+
+            if not all([name, email, date, dentist, gender, reason, time]):
+                messagebox.showerror("Error", "All fields are required, including time slot!")
+                return
+
+            def on_reserved(result):
+                status, appt = result
+                if appt:
+                    messagebox.showinfo(
+                        "Success",
+                        f"Appointment {'moved' if rebook else 'booked'} successfully!\n\nAppointment ID: {appt.id}\nPatient: {name}\nDentist: {dentist}\nDate: {format_date(date)}\nTime: {format_time(time)} ({appt.duration} min)\n\nStatus: Pending (awaiting admin approval)"
+                    )
+                    self.show_main_menu()
+                    return
+
+                if not confirm_btn.winfo_exists():
+                    return  # user already left the form
+                confirm_btn.config(state="normal", text="CONFIRM")
+                if status == SLOT_TAKEN:
+                    messagebox.showwarning("Unavailable", "This time slot is already booked. Please select another time.")
+                    update_time_slots()
+                elif status == UNAVAILABLE:
+                    messagebox.showwarning("Unavailable", "The dentist isn't working at that time. Please select another time.")
+                    update_time_slots()
+                elif status == NOT_FOUND:
+                    messagebox.showerror("Error", "This appointment no longer exists.")
+                    self.show_main_menu()
+                else:
+                    messagebox.showerror("Error", "Could not save the booking. Please try again.")
+
+            # Writes are never cancelled - the button stays disabled until the result is in
+            confirm_btn.config(state="disabled", text="SAVING...")
+            if rebook:
+                # One transaction - the old slot is kept unless the new one is booked
+                self.worker.submit(self.manager.move_appointment, rebook.id, date, time, dentist,
+                                   get_duration(), reason, on_done=on_reserved)
+                return
+            patient = Patient(name, email)
+            self.worker.submit(self.manager.try_reserve, patient, date, time, dentist, reason, gender,
+                               get_duration(), on_done=on_reserved)
+
+        tk.Button(
+            button_frame, text="BACK", bg="#EAB308", fg="black",
+            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
+            bd=0, highlightthickness=0, activebackground="#EAB308",
+            command=self.show_main_menu, cursor="hand2"
+        ).pack(side="left", padx=10)
+
+        confirm_btn = tk.Button(
+            button_frame, text="CONFIRM", bg="#EAB308", fg="black",
+            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
+            bd=0, highlightthickness=0, activebackground="#EAB308",
+            command=confirm_booking, cursor="hand2"
+        )
+        confirm_btn.pack(side="left")
+
+    # ---------------- Cancel ----------------
+    def cancel_appointment_form(self):
+        self.clear_container()
+
+        # Title frame
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="TOOTHPEARL DENTAL CLINIC",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Main background
+        content_frame = tk.Frame(self.bg_label, bg="white")
+        content_frame.pack(fill="both", expand=True)
+
+        # Centered container
+        form_container = tk.Frame(content_frame, bg="white")
+        form_container.place(relx=0.5, rely=0.5, anchor="center")
+
+        # --- helper for entry with placeholder ---
+        def make_entry_with_placeholder(parent, placeholder, **entry_opts):
+            entry = tk.Entry(parent, **entry_opts)
+            entry.insert(0, placeholder)
+            entry.config(fg="grey")
+
+            def on_focus_in(event):
+                if entry.get() == placeholder:
+                    entry.delete(0, "end")
+                    entry.config(fg="black")
+
+            def on_focus_out(event):
+                if not entry.get().strip():
+                    entry.insert(0, placeholder)
+                    entry.config(fg="grey")
+
+            entry.bind("<FocusIn>", on_focus_in)
+            entry.bind("<FocusOut>", on_focus_out)
+            return entry
+
+        # ---------------- INPUT FIELDS ----------------
+
+        # Name
+        tk.Label(
+            form_container,
+            text="Name",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="center"
+        ).pack(fill="x", pady=(10, 5))
+        name_placeholder = "Ex. Justine Nabunturan"
+        name_entry = make_entry_with_placeholder(
+            form_container,
+            name_placeholder,
+            width=45, font=("Arial", 15),
+            bg="#D9D9D9", relief="flat", justify="center"
+        )
+        name_entry.pack(ipady=8, pady=(0, 15))
+
+        # Email
+        tk.Label(
+            form_container,
+            text="Email Address",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="center"
+        ).pack(fill="x", pady=(5, 5))
+        email_placeholder = "Ex. j.nabunturan1111@umindanao.edu.ph"
+        email_entry = make_entry_with_placeholder(
+            form_container,
+            email_placeholder,
+            width=45, font=("Arial", 15),
+            bg="#D9D9D9", relief="flat", justify="center"
+        )
+        email_entry.pack(ipady=8, pady=(0, 15))
+        self.attach_patient_autocomplete(name_entry, email_entry, name_placeholder, email_placeholder)
+
+        # Reason
+        tk.Label(
+            form_container,
+            text="Reason",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="center"
+        ).pack(fill="x", pady=(5, 5))
+        reason_placeholder = "Ex. Change Date"
+        reason_entry = make_entry_with_placeholder(
+            form_container,
+            reason_placeholder,
+            width=45, font=("Arial", 15),
+            bg="#D9D9D9", relief="flat", justify="center"
+        )
+        reason_entry.pack(ipady=8, pady=(0, 15))
+
+        # ---------------- BUTTONS ----------------
+        button_frame = tk.Frame(form_container, bg="white")
+        button_frame.pack(pady=(20, 10), anchor="e")
+
+        def cancel_now():
+            name = name_entry.get().strip()
+            email = email_entry.get().strip()
+            reason = reason_entry.get().strip()
+
+            if name == name_placeholder:
+                name = ""
+            if email == email_placeholder:
+                email = ""
+            if reason == reason_placeholder:
+                reason = ""
+
+            if not all([name, email, reason]):
+                messagebox.showerror("Error", "All fields are required!")
+                return
+
+            def on_cancelled(ok):
+                if ok:
+                    messagebox.showinfo("Success", f"Appointment for {email} cancelled.")
+                    self.show_main_menu()
+                    return
+                if next_btn.winfo_exists():
+                    next_btn.config(state="normal", text="NEXT")
+                messagebox.showerror("Error", "Appointment not found.")
+
+            next_btn.config(state="disabled", text="...")
+            self.worker.submit(self.manager.cancel_by_email, email, on_done=on_cancelled)
+
+        # BACK button
+        tk.Button(
+            button_frame,
+            text="BACK",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=10, height=1,
+            relief="flat", bd=0,
+            activebackground="#EAB308",
+            cursor="hand2",
+            command=self.show_main_menu
+        ).pack(side="left", padx=10)
+
+        # CONFIRM button
+        next_btn = tk.Button(
+            button_frame,
+            text="NEXT",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=10, height=1,
+            relief="flat", bd=0,
+            activebackground="#EAB308",
+            cursor="hand2",
+            command=cancel_now
+        )
+        next_btn.pack(side="left", padx=10)
+
+    # ---------------- Rebook Form ----------------
+    def rebook_form(self):
+        self.clear_container()
+
+        # Title frame
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="TOOTHPEARL DENTAL CLINIC",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Main background (white, consistent with Cancel)
+        content_frame = tk.Frame(self.bg_label, bg="white")
+        content_frame.pack(fill="both", expand=True)
+
+        form_container = tk.Frame(content_frame, bg="white")
+        form_container.place(relx=0.5, rely=0.5, anchor="center")
+
+        # --- helper for entry with placeholder ---
+        def make_entry_with_placeholder(parent, placeholder, **entry_opts):
+            entry = tk.Entry(parent, **entry_opts)
+            ph = placeholder
+            entry.insert(0, ph)
+            entry.config(fg="grey")
+
+            def on_focus_in(event, e=entry, ph=ph):
+                if e.get() == ph:
+                    e.delete(0, "end")
+                    e.config(fg="black")
+
+            def on_focus_out(event, e=entry, ph=ph):
+                if not e.get().strip():
+                    e.insert(0, ph)
+                    e.config(fg="grey")
+
+            entry.bind("<FocusIn>", on_focus_in)
+            entry.bind("<FocusOut>", on_focus_out)
+            return entry
+
+        # ---------------- INPUT FIELDS ----------------
+
+        # Name
+        tk.Label(
+            form_container,
+            text="Name",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="center"
+        ).pack(fill="x", pady=(10, 5))
+        name_placeholder = "Ex. Justine Nabunturan"
+        name_entry = make_entry_with_placeholder(
+            form_container,
+            name_placeholder,
+            width=45, font=("Arial", 15),
+            bg="#D9D9D9", relief="flat", justify="center"
+        )
+        name_entry.pack(ipady=8, pady=(0, 15))
+
+        # Reason
+        tk.Label(
+            form_container,
+            text="Reason",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="center"
+        ).pack(fill="x", pady=(5, 5))
+        reason_placeholder = "Ex. Change Date"
+        reason_entry = make_entry_with_placeholder(
+            form_container,
+            reason_placeholder,
+            width=45, font=("Arial", 15),
+            bg="#D9D9D9", relief="flat", justify="center"
+        )
+        reason_entry.pack(ipady=8, pady=(0, 15))
+
+        # Email
+        tk.Label(
+            form_container,
+            text="Email Address",
+            font=("Arial", 16),
+            bg="#EAB308",
+            fg="black",
+            anchor="center"
+        ).pack(fill="x", pady=(5, 5))
+        email_placeholder = "Ex. j.nabunturan1111@umindanao.edu.ph"
+        email_entry = make_entry_with_placeholder(
+            form_container,
+            email_placeholder,
+            width=45, font=("Arial", 15),
+            bg="#D9D9D9", relief="flat", justify="center"
+        )
+        email_entry.pack(ipady=8, pady=(0, 15))
+        self.attach_patient_autocomplete(name_entry, email_entry, name_placeholder, email_placeholder)
+
+        # ---------------- BUTTONS ----------------
+        button_frame = tk.Frame(form_container, bg="white")
+        # lower position + right alignment
+        button_frame.pack(pady=(60, 10), anchor="e", padx=40)
+
+        def next_to_booking():
+            name = name_entry.get().strip()
+            email = email_entry.get().strip()
+            reason = reason_entry.get().strip()
+
+            if name == name_placeholder:
+                name = ""
+            if email == email_placeholder:
+                email = ""
+            if reason == reason_placeholder:
+                reason = ""
+
+            if not all([name, email, reason]):
+                messagebox.showerror("Error", "All fields are required!")
+                return
+
+            def on_found(appt):
+                if not next_btn.winfo_exists():
+                    return
+                if appt is None:
+                    next_btn.config(state="normal", text="NEXT")
+                    messagebox.showerror("Error", "No active appointment found for this email.")
+                    return
+                # The booking form moves this appointment once a new slot is confirmed
+                self.book_appointment_form(rebook=appt, rebook_reason=reason)
+
+            next_btn.config(state="disabled", text="...")
+            self.worker.submit(self.manager.active_appointment, email, on_done=on_found)
+
+        # BACK button
+        tk.Button(
+            button_frame,
+            text="BACK",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=10, height=1,
+            relief="flat", bd=0,
+            activebackground="#EAB308",
+            cursor="hand2",
+            command=self.show_main_menu
+        ).pack(side="left", padx=10)
+
+        # NEXT button
+        next_btn = tk.Button(
+            button_frame,
+            text="NEXT",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=10, height=1,
+            relief="flat", bd=0,
+            activebackground="#EAB308",
+            cursor="hand2",
+            command=next_to_booking
+        )
+        next_btn.pack(side="left", padx=10)
+
+    # ---------------- Services Page ----------------
+    def show_services(self):
+        self.clear_container()
+
+        # Title bar
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="SERVICES",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Content frame
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        # 4 service columns
+        services = {
+            "General &\nPreventive": [
+                "Dental check-ups / consultations",
+                "Teeth cleaning (prophylaxis)",
+                "Oral examinations & X-rays",
+                "Fluoride treatments",
+                "Sealants (to protect teeth from decay)"
+            ],
+            "Restorative\nDentistry": [
+                "Fillings (for cavities)",
+                "Crowns and bridges",
+                "Dentures (partial or full)",
+                "Dental implants",
+                "Root canal treatment"
+            ],
+            "Cosmetic\nDentistry": [
+                "Teeth whitening",
+                "Veneers",
+                "Bonding (fixing chipped or discolored teeth)",
+                "Smile makeover consultations",
+                "Braces (metal, ceramic, lingual)",
+                "Invisalign or clear aligners",
+                "Retainers"
+            ],
+            "Oral Surgery": [
+                "Tooth extractions (regular or wisdom teeth)",
+                "Surgical removal of impacted teeth",
+                "Bone grafting"
+            ]
+        }
+
+        # Grid layout for 4 columns
+        services_frame = tk.Frame(content_frame, bg="#F5F5F5")
+        services_frame.place(relx=0.5, rely=0.12, anchor="n")
+
+        for i, (title, items) in enumerate(services.items()):
+            col = tk.Frame(services_frame, bg="#D9D9D9", width=260, height=450)
+            col.grid(row=0, column=i, padx=20, pady=10)
+            col.pack_propagate(False)
+
+            # Yellow header
+            tk.Label(
+                col, text=title, font=("Arial", 16, "bold"),
+                bg="#EAB308", fg="black", height=2
+            ).pack(fill="x")
+
+            # Items
+            items_frame = tk.Frame(col, bg="#D9D9D9")
+            items_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+            for item in items:
+                tk.Label(
+                    items_frame, text="• " + item,
+                    font=("Arial", 12), bg="#D9D9D9", fg="black",
+                    anchor="w", justify="left", wraplength=240
+                ).pack(anchor="w", pady=2)
+
+        # Back button
+        tk.Button(
+            content_frame, text="BACK", bg="#EAB308", fg="black",
+            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
+            bd=0, highlightthickness=0, activebackground="#EAB308",
+            command=self.show_main_menu, cursor="hand2"
+        ).pack(side="bottom", pady=20)
+
+    def show_pricing(self):
+        self.clear_container()
+
+        # Title bar
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="PRICING",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Content frame with light gray background
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        # Pricing data structure
+        pricing_data = {
+            "General & Preventive": [
+                ("Dental check-up/consultation", "₱500 - ₱1,000"),
+                ("Teeth cleaning (prophylaxis)", "₱1,000 - ₱2,500"),
+                ("Oral examination & X-rays", "₱800 - ₱3,000"),
+                ("Fluoride treatment", "₱500 - ₱1,500"),
+                ("Sealants", "₱800 - ₱2,000 per tooth")
+            ],
+            "Restorative Dentistry": [
+                ("Fillings", "₱1,500 - ₱5,000 per tooth"),
+                ("Crowns", "₱8,000 - ₱25,000 per tooth"),
+                ("Bridges", "₱15,000 - ₱50,000"),
+                ("Dentures", "₱10,000 - ₱60,000"),
+                ("Dental implants", "₱40,000 - ₱100,000 per tooth"),
+                ("Root canal treatment", "₱5,000 - ₱15,000")
+            ],
+            "Cosmetic Dentistry": [
+                ("Teeth whitening", "₱5,000 - ₱15,000"),
+                ("Veneers", "₱15,000 - ₱40,000 per tooth"),
+                ("Bonding", "₱2,000 - ₱8,000 per tooth"),
+                ("Braces", "₱40,000 - ₱150,000"),
+                ("Invisalign/clear aligners", "₱100,000 - ₱250,000"),
+                ("Retainers", "₱3,000 - ₱10,000")
+            ],
+            "Oral Surgery": [
+                ("Tooth extraction", "₱1,500 - ₱5,000"),
+                ("Wisdom tooth removal", "₱5,000 - ₱15,000"),
+                ("Surgical removal of impacted teeth", "₱8,000 - ₱20,000"),
+                ("Bone grafting", "₱15,000 - ₱40,000")
+            ]
+        }
+
+        # Main container - centered
+        main_container = tk.Frame(content_frame, bg="#F5F5F5")
+        main_container.place(relx=0.5, rely=0.45, anchor="center")
+
+        # Create horizontal frame for all 4 categories side by side
+        categories_frame = tk.Frame(main_container, bg="#F5F5F5")
+        categories_frame.pack()
+
+        # Create all 4 categories in a single row
+        for category, items in pricing_data.items():
+            # Category container
+            cat_container = tk.Frame(categories_frame, bg="#F5F5F5")
+            cat_container.pack(side="left", padx=12)
+
+            # Category header
+            header = tk.Frame(cat_container, bg="#EAB308", width=250, height=55)
+            header.pack(fill="x")
+            header.pack_propagate(False)
+
+            tk.Label(
+                header,
+                text=category,
+                font=("Arial", 13, "bold"),
+                bg="#EAB308",
+                fg="black"
+            ).pack(expand=True)
+
+            # Items container with tall vertical box
+            items_container = tk.Frame(cat_container, bg="#D9D9D9", width=250, height=380)
+            items_container.pack(fill="both")
+            items_container.pack_propagate(False)
+
+            # Items frame with padding
+            items_frame = tk.Frame(items_container, bg="#D9D9D9")
+            items_frame.pack(fill="both", expand=True, padx=12, pady=12)
+
+            for service, price in items:
+                # Service row
+                service_row = tk.Frame(items_frame, bg="#D9D9D9")
+                service_row.pack(fill="x", pady=5)
+
+                tk.Label(
+                    service_row,
+                    text=f"• {service}",
+                    font=("Arial", 10),
+                    bg="#D9D9D9",
+                    fg="black",
+                    anchor="w",
+                    justify="left",
+                    wraplength=220
+                ).pack(anchor="w", fill="x")
+
+                # Price on separate line, indented
+                tk.Label(
+                    service_row,
+                    text=price,
+                    font=("Arial", 9, "bold"),
+                    bg="#D9D9D9",
+                    fg="black",
+                    anchor="w"
+                ).pack(anchor="w", padx=(10, 0))
+
+        # Bottom section
+        bottom_frame = tk.Frame(content_frame, bg="#F5F5F5")
+        bottom_frame.pack(side="bottom", fill="x", pady=15)
+
+        # Disclaimer
+        tk.Label(
+            bottom_frame,
+            text="*Prices are estimates and may vary. Please contact us for accurate quotes.",
+            font=("Arial", 9, "italic"),
+            bg="#F5F5F5",
+            fg="#666666"
+        ).pack(pady=(0, 10))
+
+        # Back button - centered
+        back_btn_frame = tk.Frame(bottom_frame, bg="#F5F5F5")
+        back_btn_frame.pack()
+
+        tk.Button(
+            back_btn_frame,
+            text="BACK",
+            bg="#EAB308",
+            fg="black",
+            font=("Arial", 14, "bold"),
+            width=12,
+            height=1,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+            activebackground="#D4A307",
+            command=self.show_main_menu,
+            cursor="hand2"
+        ).pack()
+
+    # ---------------- About Us Page ----------------
+    def show_about_us(self):
+        self.clear_container()
+
+        # Title bar
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="ABOUT US",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Content frame
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        # Main container
+        about_container = tk.Frame(content_frame, bg="#F5F5F5")
+        about_container.place(relx=0.5, rely=0.4, anchor="center")
+
+        # About content
+        about_text = """Welcome to ToothPearl Dental Clinic!
+
+At ToothPearl, we believe that everyone deserves a healthy, beautiful smile. Our clinic is dedicated to providing exceptional dental care in a comfortable and welcoming environment.
+
+Our Mission
+To deliver comprehensive, patient-centered dental care using the latest technology and techniques, while ensuring every visit is comfortable and stress-free.
+
+Our Team
+Our experienced team of dentists and hygienists are committed to continuing education and staying current with the latest advancements in dentistry. We treat each patient like family.
+
+Why Choose Us?
+• State-of-the-art equipment and facilities
+• Experienced and caring dental professionals
+• Comprehensive range of dental services
+• Flexible scheduling and emergency care
+• Comfortable and modern clinic environment
+• Patient education and preventive care focus
+
+We look forward to welcoming you to our dental family!"""
+
+        tk.Label(
+            about_container,
+            text=about_text,
+            font=("Arial", 13),
+            bg="#F5F5F5",
+            fg="black",
+            justify="left",
+            wraplength=900
+        ).pack(pady=20, padx=50)
+
+        # Back button
+        tk.Button(
+            content_frame, text="BACK", bg="#EAB308", fg="black",
+            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
+            bd=0, highlightthickness=0, activebackground="#EAB308",
+            command=self.show_main_menu, cursor="hand2"
+        ).pack(side="bottom", pady=20)
+
+    # ---------------- Need Help Page ----------------
+    def show_need_help(self):
+        self.clear_container()
+
+        # Title bar
+        title_frame = tk.Frame(self.bg_label, bg="#FFEB3B", height=100)
+        title_frame.pack(fill="x")
+        title_frame.pack_propagate(False)
+        tk.Label(
+            title_frame,
+            text="NEED HELP?",
+            font=("Arial Black", 32, "bold"),
+            bg="#FFEB3B",
+            fg="black"
+        ).pack(expand=True)
+
+        # Content frame
+        content_frame = tk.Frame(self.bg_label, bg="#F5F5F5")
+        content_frame.pack(fill="both", expand=True)
+
+        # Main container with grid layout
+        help_container = tk.Frame(content_frame, bg="#F5F5F5")
+        help_container.place(relx=0.5, rely=0.4, anchor="center")
+
+        # Contact info sections in 2x2 grid
+        contact_sections = [
+            ("📞 Phone", [
+                "Main Line: (082) 123-4567",
+                "Emergency: (0917) 123-4567",
+                "Available: Mon-Sat, 8AM-8PM"
+            ]),
+            ("📧 Email", [
+                "General Inquiries: info@toothpearl.com",
+                "Appointments: appointments@toothpearl.com",
+                "We respond within 24 hours"
+            ]),
+            ("📍 Location", [
+                "ToothPearl Dental Clinic",
+                "123 Dental Street, Davao City",
+                "Near City Hall, 2nd Floor"
+            ]),
+            ("🕐 Clinic Hours", [
+                "Monday - Friday: 8:00 AM - 8:00 PM",
+                "Saturday: 9:00 AM - 6:00 PM",
+                "Sunday: Closed (Emergency calls only)"
+            ])
+        ]
+
+        # Create 2x2 grid
+        for idx, (title, items) in enumerate(contact_sections):
+            row = idx // 2
+            col = idx % 2
+
+            # Section frame
+            section = tk.Frame(help_container, bg="#D9D9D9", width=480, height=180)
+            section.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
+            section.pack_propagate(False)
+
+            # Title
+            tk.Label(
+                section,
+                text=title,
+                font=("Arial", 15, "bold"),
+                bg="#EAB308",
+                fg="black",
+                anchor="w",
+                padx=20,
+                pady=10
+            ).pack(fill="x")
+
+            # Items
+            for item in items:
+                tk.Label(
+                    section,
+                    text=item,
+                    font=("Arial", 12),
+                    bg="#D9D9D9",
+                    fg="black",
+                    anchor="w",
+                    padx=25,
+                    pady=5
+                ).pack(fill="x")
+
+        # Emergency note
+        tk.Label(
+            content_frame,
+            text="⚠️ For dental emergencies outside clinic hours, call our emergency hotline.",
+            font=("Arial", 12, "bold"),
+            bg="#FFEB3B",
+            fg="black",
+            pady=15,
+            padx=20
+        ).pack(side="bottom", pady=(0, 50))
+
+        # Back button
+        tk.Button(
+            content_frame, text="BACK", bg="#EAB308", fg="black",
+            font=("Arial", 14, "bold"), width=12, height=1, relief="flat",
+            bd=0, highlightthickness=0, activebackground="#EAB308",
+            command=self.show_main_menu, cursor="hand2"
+        ).pack(side="bottom", pady=20)
+
+
+# -------------------------
+# Run the App
+# -------------------------
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = DentalApp(root)
+    root.mainloop()
+    app.worker.shutdown()
\ No newline at end of file
@@ -0,0 +1,187 @@
+class AppointmentTable:
+    """Windowed view of the appointment list on top of a ttk.Treeview.
+
+    At most max_rows appointments are materialised at once. Scrolling close to
+    the bottom pages the following rows in from the database and trims the top
+    of the window; scrolling close to the top pages the preceding rows back in
+    and trims the bottom. Rows run by descending cursor, or ascending when
+    descending is False. Items use the appointment id as their iid.
+
+    Pages are fetched through run(fetch, on_done), which may call on_done
+    later (e.g. from a background worker); the default runs fetch inline.
+    """
+
+    def __init__(self, tree, scrollbar, load_window, row_values, page_size=100, max_rows=500, edge=0.15,
+                 run=None, descending=True, order_key=tuple):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.load_window = load_window  # (after=, before=, limit=) -> [(cursor, appointment)]
+        self.row_values = row_values  # appointment -> (values, tags)
+        self.run = run or (lambda fetch, on_done: on_done(fetch()))
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.edge = edge
+        self.descending = descending  # sort direction of the view being shown
+        self.order_key = order_key  # cursor -> what the view orders it by, e.g. text without case
+
+        self.cursors = {}  # iid -> keyset cursor of that row
+        self.more_above = False
+        self.more_below = True
+        self._loading = False
+        self._generation = 0  # bumped by reload() so late pages are ignored
+
+        tree.configure(yscrollcommand=self._on_view_change)
+
+    def reload(self, descending=None, order_key=None):
+        """Drop every row and load the first page again, switching sort direction/order if given"""
+        if descending is not None:
+            self.descending = descending
+        if order_key is not None:
+            self.order_key = order_key
+        self._generation += 1
+        self.tree.delete(*self.tree.get_children())
+        self.cursors.clear()
+        self.more_above = False
+        self.more_below = True
+        self._request(below=True)
+
+    def apply_changes(self, changed, deleted):
+        """Patch the window in place from a delta instead of reloading it
+
+        changed holds (cursor, appointment) pairs: rows already shown are
+        updated (and moved if their sort position changed), new rows are
+        inserted only if they fall inside the loaded window. Deleted ids are
+        removed. Applying the same delta twice is harmless.
+        """
+        for iid in deleted:
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+                self.cursors.pop(iid, None)
+
+        for cursor, appt in changed:
+            if self.tree.exists(appt.id):
+                values, tags = self.row_values(appt)
+                self.tree.item(appt.id, values=values, tags=tags)
+                if self.cursors[appt.id] == cursor:
+                    continue
+                self.tree.delete(appt.id)
+                del self.cursors[appt.id]
+
+            index = self._position(cursor)
+            if index is not None:
+                self._insert(index, cursor, appt)
+
+    def _position(self, cursor):
+        """Index a row with this cursor belongs at, or None if outside the window"""
+        children = self.tree.get_children()
+        if not children:
+            return None if self.more_below or self.more_above else 0
+
+        # Rows are in view order: by descending cursor, or ascending for an ascending view,
+        # compared the way the database orders them rather than by Python's string order
+        cursor = self.order_key(cursor)
+        low, high = 0, len(children)
+        while low < high:
+            mid = (low + high) // 2
+            shown = self.order_key(self.cursors[children[mid]])
+            if (shown > cursor) if self.descending else (shown < cursor):
+                low = mid + 1
+            else:
+                high = mid
+        # Past either end of the window it only belongs here if nothing is left to load on that side
+        if low == 0 and self.more_above:
+            return None
+        if low == len(children) and self.more_below:
+            return None
+        return low
+
+    def _on_view_change(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._loading:
+            return
+        if float(last) >= 1 - self.edge and self.more_below:
+            self._loading = True
+            self.tree.after_idle(self._request, True)
+        elif float(first) <= self.edge and self.more_above:
+            self._loading = True
+            self.tree.after_idle(self._request, False)
+
+    def _request(self, below):
+        """Fetch the page just past the bottom (or top) edge of the window"""
+        children = self.tree.get_children()
+        if not children:
+            below = True
+        edge = (self.cursors[children[-1]] if below else self.cursors[children[0]]) if children else None
+        if below:
+            def fetch():
+                return self.load_window(after=edge, limit=self.page_size + 1)
+        else:
+            def fetch():
+                return self.load_window(before=edge, limit=self.page_size + 1)
+
+        generation = self._generation
+        self._loading = True
+
+        def on_done(window):
+            if generation != self._generation:
+                return
+            self._loading = False
+            if self._edge_cursor(below) == edge:  # skip if the window moved meanwhile
+                self._show(below, window)
+
+        self.run(fetch, on_done)
+
+    def _edge_cursor(self, below):
+        children = self.tree.get_children()
+        if not children:
+            return None
+        return self.cursors[children[-1] if below else children[0]]
+
+    def _show(self, below, window):
+        anchor = self._first_visible()
+        if below:
+            self.more_below = len(window) > self.page_size
+            for cursor, appt in window[:self.page_size]:
+                self._insert("end", cursor, appt)
+            if self._trim(from_top=True):
+                self.more_above = True
+        else:
+            # The page comes in view order, so the rows nearest the window are at the end
+            self.more_above = len(window) > self.page_size
+            for cursor, appt in reversed(window[-self.page_size:]):
+                self._insert(0, cursor, appt)
+            if self._trim(from_top=False):
+                self.more_below = True
+        self._restore(anchor)
+
+    def _insert(self, index, cursor, appt):
+        if self.tree.exists(appt.id):
+            return
+        values, tags = self.row_values(appt)
+        self.tree.insert("", index, iid=appt.id, values=values, tags=tags)
+        self.cursors[appt.id] = cursor
+
+    def _trim(self, from_top):
+        children = self.tree.get_children()
+        excess = len(children) - self.max_rows
+        if excess <= 0:
+            return False
+        doomed = children[:excess] if from_top else children[-excess:]
+        self.tree.delete(*doomed)
+        for iid in doomed:
+            self.cursors.pop(iid, None)
+        return True
+
+    def _first_visible(self):
+        children = self.tree.get_children()
+        if not children:
+            return None
+        first = self.tree.yview()[0]
+        return children[min(int(first * len(children)), len(children) - 1)]
+
+    def _restore(self, anchor):
+        """Keep the row that was at the top of the viewport in place"""
+        children = self.tree.get_children()
+        if anchor is None or not children or not self.tree.exists(anchor):
+            return
+        self.tree.yview_moveto(self.tree.index(anchor) / len(children))
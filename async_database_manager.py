@@ -0,0 +1,165 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from storage import open_storage, BATCH_SIZE, DEFAULT_DURATION
+
+
+class AsyncRunner:
+    """Runs blocking calls for asyncio code on a bounded thread pool.
+
+    Only max_workers calls are ever in flight; every other caller waits on an
+    asyncio.Semaphore, so a thousand pending bookings cost a thousand cheap
+    coroutines rather than a thousand threads.
+    """
+
+    def __init__(self, max_workers=10):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-async")
+        self._slots = None  # created on first use, inside the running loop
+        self._waiting = 0
+        self._in_flight = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) executed on a worker thread"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self):
+        """Calls in flight and coroutines queued for a slot"""
+        return {"max_workers": self.max_workers, "in_flight": self._in_flight, "waiting": self._waiting}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class AsyncDatabaseManager:
+    """asyncio variant of an AppointmentStorage backend with the same operations.
+
+    Calls go through an AsyncRunner sized to the backend's concurrency (the
+    connection pool for MySQL), so a worker thread never has to wait for a
+    connection.
+    """
+
+    def __init__(self, db=None, pool_size=10, pool_timeout=10.0, runner=None):
+        self.db = db or open_storage(pool_size=pool_size, pool_timeout=pool_timeout)
+        self.runner = runner or AsyncRunner(self.db.concurrency)
+
+    async def add_patient(self, name, email, gender):
+        return await self.runner.run(self.db.add_patient, name, email, gender)
+
+    async def get_patient_by_email(self, email):
+        return await self.runner.run(self.db.get_patient_by_email, email)
+
+    async def get_patients(self, after=None, limit=BATCH_SIZE):
+        return await self.runner.run(self.db.get_patients, after, limit)
+
+    async def find_patients(self, prefix, limit=10):
+        return await self.runner.run(self.db.find_patients, prefix, limit)
+
+    async def get_appointment_by_uuid(self, appointment_uuid):
+        return await self.runner.run(self.db.get_appointment_by_uuid, appointment_uuid)
+
+    async def get_appointment_details(self, appointment_uuid):
+        return await self.runner.run(self.db.get_appointment_details, appointment_uuid)
+
+    async def reserve_appointment(self, name, email, gender, appointment_uuid, date, time, dentist, reason,
+                                  duration=DEFAULT_DURATION):
+        return await self.runner.run(self.db.reserve_appointment, name, email, gender,
+                                     appointment_uuid, date, time, dentist, reason, duration)
+
+    async def move_appointment(self, appointment_uuid, date, time, dentist, duration=DEFAULT_DURATION, reason=None):
+        return await self.runner.run(self.db.move_appointment, appointment_uuid, date, time, dentist, duration,
+                                     reason)
+
+    async def get_patient_appointments(self, email):
+        return await self.runner.run(self.db.get_patient_appointments, email)
+
+    async def check_slot_available(self, dentist, date, time, duration=DEFAULT_DURATION):
+        return await self.runner.run(self.db.check_slot_available, dentist, date, time, duration)
+
+    async def get_booked_slots(self, dentists, dates):
+        return await self.runner.run(self.db.get_booked_slots, list(dentists), list(dates))
+
+    async def get_booked_range(self, dentists, start, end):
+        return await self.runner.run(self.db.get_booked_range, list(dentists), start, end)
+
+    async def get_booked_times(self, dentist, date):
+        return await self.runner.run(self.db.get_booked_times, dentist, date)
+
+    async def update_appointment_status(self, appointment_uuid, status):
+        return await self.runner.run(self.db.update_appointment_status, appointment_uuid, status)
+
+    async def update_appointments_status(self, appointment_uuids, status):
+        return await self.runner.run(self.db.update_appointments_status, list(appointment_uuids), status)
+
+    async def delete_appointments(self, appointment_uuids):
+        return await self.runner.run(self.db.delete_appointments, list(appointment_uuids))
+
+    async def delete_appointment_by_email(self, email):
+        return await self.runner.run(self.db.delete_appointment_by_email, email)
+
+    async def delete_appointment_by_uuid(self, appointment_uuid):
+        return await self.runner.run(self.db.delete_appointment_by_uuid, appointment_uuid)
+
+    async def count_appointments(self, view=None):
+        return await self.runner.run(self.db.count_appointments, view)
+
+    async def get_appointments_page(self, after=None, limit=50, before=None, view=None):
+        return await self.runner.run(self.db.get_appointments_page, after, limit, before, view)
+
+    async def iter_appointments(self, batch_size=500):
+        """Async generator over every appointment, one keyset page per round trip"""
+        after = None
+        while True:
+            rows = await self.get_appointments_page(after, batch_size)
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][3], rows[-1][4], rows[-1][-1])
+
+    async def search_appointments(self, query, limit=20, offset=0):
+        return await self.runner.run(self.db.search_appointments, query, limit, offset)
+
+    async def get_changes_since(self, watermark=None):
+        return await self.runner.run(self.db.get_changes_since, watermark)
+
+    async def get_roster(self):
+        return await self.runner.run(self.db.get_roster)
+
+    async def get_leave(self):
+        return await self.runner.run(self.db.get_leave)
+
+    async def add_dentist(self, name):
+        return await self.runner.run(self.db.add_dentist, name)
+
+    async def set_working_hours(self, dentist, weekday, start, end):
+        return await self.runner.run(self.db.set_working_hours, dentist, weekday, start, end)
+
+    async def add_break(self, dentist, weekday, start, end):
+        return await self.runner.run(self.db.add_break, dentist, weekday, start, end)
+
+    async def set_leave(self, dentist, day, on_leave=True, reason=""):
+        return await self.runner.run(self.db.set_leave, dentist, day, on_leave, reason)
+
+    def pool_stats(self):
+        stats = self.db.pool_stats()
+        stats.update(("async_" + key, value) for key, value in self.runner.stats().items())
+        return stats
+
+    def close(self):
+        self.runner.close()
+        self.db.close()
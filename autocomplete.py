@@ -0,0 +1,110 @@
+import tkinter as tk
+
+# Keys that move around the entry or the list rather than change the text
+_NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "Escape", "Tab", "Shift_L", "Shift_R",
+                    "Control_L", "Control_R", "Alt_L", "Alt_R", "Home", "End"}
+
+
+class Autocomplete:
+    """As-you-type suggestions dropped down under an entry.
+
+    Keystrokes are debounced: a lookup starts only once typing pauses for
+    delay ms, and results for text that has changed since are dropped, so a
+    fast typist costs one query. Down moves into the list; a click or Enter
+    there hands the suggestion to on_pick. Lookups go through
+    run(fetch, on_done), like AppointmentTable's pages.
+    """
+
+    def __init__(self, entry, suggest, on_pick, describe=str, run=None, delay=150, min_chars=2, rows=6,
+                 ignore=(), parent=None):
+        self.entry = entry
+        self.suggest = suggest  # text -> [suggestion]
+        self.on_pick = on_pick  # suggestion -> None
+        self.describe = describe  # suggestion -> list text
+        self.run = run or (lambda fetch, on_done: on_done(fetch()))
+        self.delay = delay
+        self.min_chars = min_chars
+        self.rows = rows
+        self.ignore = set(ignore)  # e.g. the entry's placeholder
+        self.suggestions = []
+        self._job = None
+
+        # Lives in an outer ancestor of the entry, placed over it, so frames around the entry don't clip it
+        self.listbox = tk.Listbox(parent or self._outermost(), height=rows, font=entry.cget("font"),
+                                  activestyle="none", relief="solid", bd=1)
+        entry.bind("<KeyRelease>", self._on_key, add="+")
+        entry.bind("<Down>", self._enter_list, add="+")
+        entry.bind("<Escape>", lambda e: self.hide(), add="+")
+        entry.bind("<FocusOut>", lambda e: entry.after(200, self._hide_unless_focused), add="+")
+        entry.bind("<Destroy>", lambda e: self._cancel(), add="+")
+        self.listbox.bind("<ButtonRelease-1>", self._pick)
+        self.listbox.bind("<Return>", self._pick)
+        self.listbox.bind("<Escape>", lambda e: (self.hide(), self.entry.focus_set()))
+        self.listbox.bind("<FocusOut>", lambda e: self.listbox.after(200, self._hide_unless_focused))
+
+    def _outermost(self):
+        """The entry's outermost ancestor below the toplevel"""
+        widget = self.entry
+        while widget.master is not None and widget.master != widget.winfo_toplevel():
+            widget = widget.master
+        return widget
+
+    def hide(self):
+        self.listbox.place_forget()
+
+    def _cancel(self):
+        if self._job is not None:
+            self.entry.after_cancel(self._job)
+            self._job = None
+
+    def _on_key(self, event):
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        self._cancel()
+        text = self.entry.get().strip()
+        if len(text) < self.min_chars or text in self.ignore:
+            self.hide()
+            return
+        self._job = self.entry.after(self.delay, self._lookup, text)
+
+    def _lookup(self, text):
+        self._job = None
+        self.run(lambda: self.suggest(text), lambda suggestions: self._show(text, suggestions))
+
+    def _show(self, text, suggestions):
+        if not self.entry.winfo_exists() or self.entry.get().strip() != text:
+            return  # typed on since - a newer lookup is on its way
+        self.suggestions = suggestions or []
+        self.listbox.delete(0, "end")
+        for suggestion in self.suggestions:
+            self.listbox.insert("end", self.describe(suggestion))
+        if not self.suggestions:
+            self.hide()
+            return
+        self.listbox.config(height=min(len(self.suggestions), self.rows))
+        self.listbox.place(in_=self.entry, x=0, rely=1.0, relwidth=1.0)
+        self.listbox.lift()
+
+    def _enter_list(self, event):
+        if self.listbox.winfo_ismapped() and self.suggestions:
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, "end")
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+            return "break"
+
+    def _pick(self, event=None):
+        selected = self.listbox.curselection()
+        if not selected:
+            return
+        suggestion = self.suggestions[selected[0]]
+        self.hide()
+        self.entry.focus_set()
+        self.on_pick(suggestion)
+
+    def _hide_unless_focused(self):
+        if not self.listbox.winfo_exists():
+            return
+        focused = self.listbox.focus_get()
+        if focused not in (self.entry, self.listbox):
+            self.hide()
@@ -0,0 +1,79 @@
+from datetime import time
+
+
+def _numpy():
+    """NumPy is optional - only the calendar views need it"""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("The availability matrix needs NumPy: pip install numpy") from e
+    return numpy
+
+
+class AvailabilityMatrix:
+    """Occupancy of every (dentist, day, slot) in a date range as one NumPy array.
+
+    occupied[d, n, s] is True when dentists[d] has an active booking on
+    days[n] at slots[s]; working[d, n, s] when they are rostered on then
+    (all True if not given). The helpers below are whole-array operations, so a
+    month for the whole clinic is answered without a per-slot loop.
+    """
+
+    def __init__(self, dentists, days, slots, occupied, working=None):
+        self.dentists = list(dentists)
+        self.days = list(days)
+        self.slots = list(slots)
+        self.occupied = occupied
+        self.working = _numpy().ones_like(occupied) if working is None else working
+
+    @classmethod
+    def from_schedule(cls, schedule):
+        """Unpack a Schedule's per dentist-day bitmasks into a boolean array"""
+        np = _numpy()
+        days = list(schedule.days())
+        bits = np.arange(len(schedule.grid), dtype=np.int64)
+
+        def unpack(mask_of):
+            masks = np.array([[mask_of(dentist, day) for day in days] for dentist in schedule.dentists],
+                             dtype=np.int64).reshape(len(schedule.dentists), len(days))
+            return (masks[:, :, None] >> bits) & 1 == 1
+
+        occupied = unpack(lambda dentist, day: schedule.booked.get((dentist, day), 0))
+        working = unpack(schedule.working)
+        slots = [time(offset // 60, offset % 60) for offset in schedule.grid.offsets]
+        return cls(schedule.dentists, days, slots, occupied, working)
+
+    @property
+    def free(self):
+        return self.working & ~self.occupied
+
+    def free_counts(self):
+        """(dentists × days) number of free slots"""
+        return self.free.sum(axis=2)
+
+    def free_per_day(self):
+        """(days,) free slots across the whole clinic"""
+        return self.free.sum(axis=(0, 2))
+
+    def utilisation(self):
+        """(dentists,) share of working slots booked over the range, 0.0-1.0"""
+        np = _numpy()
+        working = self.working.sum(axis=(1, 2))
+        booked = (self.working & self.occupied).sum(axis=(1, 2))
+        return np.divide(booked, working, out=np.zeros(len(self.dentists)), where=working > 0)
+
+    def earliest_free(self):
+        """(dentists × days) index of the first free slot, -1 where fully booked"""
+        np = _numpy()
+        free = self.free
+        first = free.argmax(axis=2)
+        return np.where(free.any(axis=2), first, -1)
+
+    def earliest_free_time(self, dentist, day):
+        """First free start time for one dentist on one day, or None"""
+        index = self.earliest_free()[self.dentists.index(dentist), self.days.index(day)]
+        return self.slots[index] if index >= 0 else None
+
+    def any_dentist_free(self):
+        """(days × slots) True where at least one dentist is free"""
+        return self.free.any(axis=0)
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector import Error
+
+
+class PoolTimeoutError(Error):
+    """Raised when no pooled connection frees up before the checkout timeout"""
+
+
+class PooledConnection:
+    """Connection checked out of a ConnectionPool - close() hands it back"""
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def is_connected(self):
+        """True until the connection has been returned to the pool"""
+        return self._connection is not None
+
+    def close(self):
+        """Return the underlying connection to the pool"""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections shared by one DatabaseManager.
+
+    Connections are opened lazily up to pool_size. A checkout reuses the most
+    recently returned connection, pings it first if it sat idle for longer than
+    ping_interval seconds, and waits up to timeout seconds when every
+    connection is in use.
+    """
+
+    def __init__(self, pool_size=5, timeout=10.0, ping_interval=30.0, max_lifetime=3600.0, **connect_args):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.max_lifetime = max_lifetime
+        self._connect_args = connect_args
+
+        self._idle = deque()  # (connection, last_used)
+        self._opened_at = {}  # id(connection) -> open time
+        self._size = 0  # idle + checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "opened": 0,
+            "discarded": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+        }
+
+    def get_connection(self):
+        """Check out a healthy connection, opening a new one if below pool_size"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise Error("Connection pool is closed")
+                    if self._idle:
+                        connection, last_used = self._idle.pop()
+                        break
+                    if self._size < self.pool_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.timeout:.1f}s "
+                            f"({self.pool_size} in use)")
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+
+            if connection is None:
+                connection = self._open()
+            elif not self._is_healthy(connection, last_used):
+                self._discard(connection)
+                continue
+
+            with self._cond:
+                self._stats["checkouts"] += 1
+            return PooledConnection(self, connection)
+
+    def release(self, connection):
+        """Take a connection back, rolling back anything left uncommitted"""
+        if connection.unread_result:
+            # A half-read unbuffered result can't be reused - drop the connection
+            self._discard(connection)
+            return
+
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except Error:
+            self._discard(connection)
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(connection)
+
+    def close(self):
+        """Close every idle connection; checked-out ones close on release"""
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self):
+        """Snapshot of pool size and checkout counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                pool_size=self.pool_size,
+                open=self._size,
+                idle=len(self._idle),
+                in_use=self._size - len(self._idle),
+            )
+            return stats
+
+    def _open(self):
+        try:
+            connection = mysql.connector.connect(**self._connect_args)
+        except Error:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._opened_at[id(connection)] = time.monotonic()
+            self._stats["opened"] += 1
+        return connection
+
+    def _is_healthy(self, connection, last_used):
+        now = time.monotonic()
+        if now - self._opened_at.get(id(connection), now) > self.max_lifetime:
+            return False
+        if now - last_used <= self.ping_interval:
+            return True
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+        with self._cond:
+            self._opened_at.pop(id(connection), None)
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
@@ -1,4 +1,4 @@
-
-class AdminConfig:
-    USERNAME = "admin"
+
+class AdminConfig:
+    USERNAME = "admin"
     PASSWORD = "admin123"
\ No newline at end of file
@@ -1,262 +1,1452 @@
-import mysql.connector
-from mysql.connector import Error
-
-
-def create_database():
-    """Create database and tables - Run this once"""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
-
-        cursor = connection.cursor()
-
-        # Create database
-        cursor.execute("CREATE DATABASE IF NOT EXISTS dental_clinic")
-        cursor.execute("USE dental_clinic")
-
-        # Create patients table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS patients (
-                patient_id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                gender VARCHAR(20),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Create appointments table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS appointments (
-                appointment_id INT AUTO_INCREMENT PRIMARY KEY,
-                appointment_uuid VARCHAR(10) UNIQUE NOT NULL,
-                patient_id INT NOT NULL,
-                appointment_date VARCHAR(20) NOT NULL,
-                appointment_time VARCHAR(20) NOT NULL,
-                dentist VARCHAR(100) NOT NULL,
-                status VARCHAR(20) DEFAULT 'Pending',
-                reason_for_visit TEXT,
-                booked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (patient_id) REFERENCES patients(patient_id) ON DELETE CASCADE,
-                INDEX idx_date_dentist (appointment_date, dentist),
-                INDEX idx_patient (patient_id)
-            )
-        """)
-
-        connection.commit()
-        print("✓ Database and tables created successfully!")
-
-    except Error as e:
-        print(f"Error: {e}")
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
-
-
-class DatabaseManager:
-    def __init__(self):
-        self.host = "localhost"
-        self.user = "root"
-        self.password = ""
-        self.database = "dental_clinic"
-
-    def get_connection(self):
-        """Get database connection"""
-        try:
-            connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
-            return connection
-        except Error as e:
-            print(f"Connection Error: {e}")
-            return None
-
-    def add_patient(self, name, email, gender):
-        """Add new patient to database"""
-        connection = self.get_connection()
-        if not connection:
-            return False
-
-        try:
-            cursor = connection.cursor()
-            insert_query = "INSERT INTO patients (name, email, gender) VALUES (%s, %s, %s)"
-            cursor.execute(insert_query, (name, email, gender))
-            connection.commit()
-            return True
-        except Error as e:
-            print(f"Error adding patient: {e}")
-            return False
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def get_patient_by_email(self, email):
-        """Get patient ID from email"""
-        connection = self.get_connection()
-        if not connection:
-            return None
-
-        try:
-            cursor = connection.cursor()
-            cursor.execute("SELECT patient_id, name FROM patients WHERE email = %s", (email,))
-            result = cursor.fetchone()
-            return result
-        except Error as e:
-            print(f"Error fetching patient: {e}")
-            return None
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def add_appointment(self, patient_id, appointment_uuid, date, time, dentist, reason):
-        """Add new appointment to database"""
-        connection = self.get_connection()
-        if not connection:
-            return False
-
-        try:
-            cursor = connection.cursor()
-            insert_query = """
-                INSERT INTO appointments 
-                (patient_id, appointment_uuid, appointment_date, appointment_time, dentist, status, reason_for_visit)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_query,
-                           (patient_id, appointment_uuid, date, time, dentist, "Pending", reason))
-            connection.commit()
-            return True
-        except Error as e:
-            print(f"Error adding appointment: {e}")
-            return False
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def get_all_appointments(self):
-        """Retrieve all appointments"""
-        connection = self.get_connection()
-        if not connection:
-            return []
-
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT a.appointment_uuid, p.name, p.email, a.appointment_date, 
-                       a.appointment_time, a.dentist, a.status, a.reason_for_visit
-                FROM appointments a
-                JOIN patients p ON a.patient_id = p.patient_id
-                ORDER BY a.appointment_date DESC
-            """)
-            results = cursor.fetchall()
-            return results
-        except Error as e:
-            print(f"Error fetching appointments: {e}")
-            return []
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def check_slot_available(self, dentist, date, time):
-        """Check if time slot is available"""
-        connection = self.get_connection()
-        if not connection:
-            return True
-
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM appointments 
-                WHERE dentist = %s AND appointment_date = %s 
-                AND appointment_time = %s AND status IN ('Pending', 'Confirmed')
-            """, (dentist, date, time))
-            result = cursor.fetchone()
-            return result[0] == 0
-        except Error as e:
-            print(f"Error checking slot: {e}")
-            return True
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def update_appointment_status(self, appointment_uuid, status):
-        """Update appointment status"""
-        connection = self.get_connection()
-        if not connection:
-            return False
-
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                UPDATE appointments SET status = %s 
-                WHERE appointment_uuid = %s
-            """, (status, appointment_uuid))
-            connection.commit()
-            return True
-        except Error as e:
-            print(f"Error updating status: {e}")
-            return False
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def delete_appointment_by_email(self, email):
-        """Delete patient's appointment by email"""
-        connection = self.get_connection()
-        if not connection:
-            return False
-
-        try:
-            cursor = connection.cursor()
-            cursor.execute("SELECT patient_id FROM patients WHERE email = %s", (email,))
-            result = cursor.fetchone()
-
-            if not result:
-                return False
-
-            patient_id = result[0]
-            cursor.execute("""
-                DELETE FROM appointments WHERE patient_id = %s
-            """, (patient_id,))
-            connection.commit()
-            return True
-        except Error as e:
-            print(f"Error deleting appointment: {e}")
-            return False
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def delete_appointment_by_uuid(self, appointment_uuid):
-        """Delete specific appointment by UUID"""
-        connection = self.get_connection()
-        if not connection:
-            return False
-
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                DELETE FROM appointments WHERE appointment_uuid = %s
-            """, (appointment_uuid,))
-            connection.commit()
-            return True
-        except Error as e:
-            print(f"Error deleting appointment: {e}")
-            return False
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
\ No newline at end of file
+from datetime import datetime, timedelta
+
+import mysql.connector
+from mysql.connector import Error, IntegrityError, errorcode
+
+from connection_pool import ConnectionPool
+from intervals import DayIntervals, minutes
+from ids import IdGenerator, MIGRATION_NODE
+from storage import (AppointmentStorage, chunks, like_prefix, listing_clauses, normalize_email, BATCH_SIZE, DEFAULT_VIEW, DEFAULT_DURATION, RESERVED, SLOT_TAKEN, RESERVE_FAILED, DUPLICATE_ID,
+                     NOT_FOUND, ACTIVE_STATUSES, STALE_WATERMARK, TOMBSTONE_RETENTION_SECONDS)
+
+
+# Listing indexes over appointment date/time: filter or sort column first, then the keyset order
+_LISTING_INDEXES = [
+    ("idx_date_time", "(appointment_date, appointment_time)"),
+    ("idx_status_date", "(status, appointment_date, appointment_time)"),
+    ("idx_dentist_date", "(dentist, appointment_date, appointment_time)"),
+]
+
+# A write that lost a lock fight is retried; if it keeps losing, the slot is reported taken
+_LOCK_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+_LOCK_ATTEMPTS = 3
+_LOCKED = "locked"
+
+# Dentist roster: working hours per weekday, recurring breaks, leave and clinic holidays
+_ROSTER_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS dentists (
+        dentist_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) UNIQUE NOT NULL,
+        active BOOLEAN NOT NULL DEFAULT TRUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dentist_hours (
+        dentist_id INT NOT NULL,
+        weekday TINYINT NOT NULL,
+        start_time TIME NOT NULL,
+        end_time TIME NOT NULL,
+        PRIMARY KEY (dentist_id, weekday),
+        FOREIGN KEY (dentist_id) REFERENCES dentists(dentist_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dentist_breaks (
+        break_id INT AUTO_INCREMENT PRIMARY KEY,
+        dentist_id INT NOT NULL,
+        weekday TINYINT NOT NULL,
+        start_time TIME NOT NULL,
+        end_time TIME NOT NULL,
+        INDEX idx_dentist_weekday (dentist_id, weekday),
+        FOREIGN KEY (dentist_id) REFERENCES dentists(dentist_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dentist_leave (
+        dentist_id INT NOT NULL,
+        leave_date DATE NOT NULL,
+        reason VARCHAR(255),
+        PRIMARY KEY (dentist_id, leave_date),
+        FOREIGN KEY (dentist_id) REFERENCES dentists(dentist_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS clinic_holidays (
+        holiday_date DATE PRIMARY KEY,
+        name VARCHAR(100)
+    )
+    """
+]
+
+
+def create_database():
+    """Create database and tables - Run this once"""
+    try:
+        connection = mysql.connector.connect(
+            host="localhost",
+            user="root",
+            password=""
+        )
+
+        cursor = connection.cursor()
+
+        # Create database
+        cursor.execute("CREATE DATABASE IF NOT EXISTS dental_clinic")
+        cursor.execute("USE dental_clinic")
+
+        # Create patients table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS patients (
+                patient_id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                email VARCHAR(100) UNIQUE NOT NULL,
+                email_normalized VARCHAR(100) NOT NULL,
+                gender VARCHAR(20),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE KEY uq_email_normalized (email_normalized),
+                INDEX idx_name (name),
+                FULLTEXT INDEX ft_name (name)
+            )
+        """)
+
+        # Create appointments table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS appointments (
+                appointment_id INT AUTO_INCREMENT PRIMARY KEY,
+                appointment_uuid VARCHAR(10) UNIQUE NOT NULL,
+                legacy_uuid VARCHAR(10),
+                patient_id INT NOT NULL,
+                appointment_date DATE NOT NULL,
+                appointment_time TIME NOT NULL,
+                duration_minutes SMALLINT NOT NULL DEFAULT 30,
+                dentist VARCHAR(100) NOT NULL,
+                status VARCHAR(20) DEFAULT 'Pending',
+                reason_for_visit TEXT,
+                booked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                slot_lock TINYINT GENERATED ALWAYS AS
+                    (IF(status IN ('Pending', 'Confirmed'), 1, NULL)) STORED,
+                updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+                    ON UPDATE CURRENT_TIMESTAMP(6),
+                FOREIGN KEY (patient_id) REFERENCES patients(patient_id) ON DELETE CASCADE,
+                UNIQUE KEY uq_active_slot (dentist, appointment_date, appointment_time, slot_lock),
+                INDEX idx_date_dentist (appointment_date, dentist),
+                INDEX idx_date_time (appointment_date, appointment_time),
+                INDEX idx_status_date (status, appointment_date, appointment_time),
+                INDEX idx_dentist_date (dentist, appointment_date, appointment_time),
+                INDEX idx_patient (patient_id),
+                INDEX idx_updated_at (updated_at),
+                INDEX idx_legacy_uuid (legacy_uuid),
+                FULLTEXT INDEX ft_reason (reason_for_visit)
+            )
+        """)
+
+        # Deleted appointment ids, so clients syncing deltas can drop them
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS appointment_tombstones (
+                appointment_uuid VARCHAR(10) PRIMARY KEY,
+                deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+                INDEX idx_deleted_at (deleted_at)
+            )
+        """)
+
+        for statement in _ROSTER_TABLES:
+            cursor.execute(statement)
+
+        connection.commit()
+        print("✓ Database and tables created successfully!")
+
+    except Error as e:
+        print(f"Error: {e}")
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+
+def _as_time(value):
+    """MySQL TIME columns come back as timedelta - turn them into datetime.time"""
+    if isinstance(value, timedelta):
+        return (datetime.min + value).time()
+    return value
+
+
+# Listing columns, in the order every listing method returns them
+APPOINTMENT_COLUMNS = """
+    a.appointment_uuid, p.name, p.email, a.appointment_date,
+    a.appointment_time, a.dentist, a.status, a.duration_minutes, a.appointment_id
+"""
+
+
+# Record tombstones for the rows a DELETE is about to remove (same WHERE clause)
+_TOMBSTONE_INSERT = """
+    INSERT INTO appointment_tombstones (appointment_uuid)
+    SELECT appointment_uuid FROM appointments
+"""
+
+
+def _listing_row(row):
+    return row[:4] + (_as_time(row[4]),) + row[5:]
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def _index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index))
+    return cursor.fetchone()[0] > 0
+
+
+def upgrade_database():
+    """Bring a database created by an older create_database() up to date - safe to re-run"""
+    connection = None
+    try:
+        connection = mysql.connector.connect(
+            host="localhost",
+            user="root",
+            password="",
+            database="dental_clinic"
+        )
+        cursor = connection.cursor()
+
+        # Slot uniqueness for active bookings: slot_lock is NULL for declined
+        # rows, and NULLs never collide in a UNIQUE index
+        if not _column_exists(cursor, "appointments", "slot_lock"):
+            cursor.execute("""
+                ALTER TABLE appointments ADD COLUMN slot_lock TINYINT GENERATED ALWAYS AS
+                    (IF(status IN ('Pending', 'Confirmed'), 1, NULL)) STORED
+            """)
+        if not _index_exists(cursor, "appointments", "uq_active_slot"):
+            # The old check-then-insert could double-book a slot, and the key can't be added over that
+            _decline_double_bookings(connection, cursor)
+            cursor.execute("""
+                ALTER TABLE appointments ADD UNIQUE KEY uq_active_slot
+                    (dentist, appointment_date, appointment_time, slot_lock)
+            """)
+
+        # Keyset pagination walks (date, time, appointment_id), optionally under a
+        # status/dentist filter; patient search is a name or email prefix
+        for name, columns in _LISTING_INDEXES:
+            if not _index_exists(cursor, "appointments", name):
+                cursor.execute(f"ALTER TABLE appointments ADD INDEX {name} {columns}")
+        if not _index_exists(cursor, "patients", "idx_name"):
+            cursor.execute("ALTER TABLE patients ADD INDEX idx_name (name)")
+
+        # Change tracking for incremental refreshes
+        if not _column_exists(cursor, "appointments", "updated_at"):
+            cursor.execute("""
+                ALTER TABLE appointments
+                ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+                    ON UPDATE CURRENT_TIMESTAMP(6),
+                ADD INDEX idx_updated_at (updated_at)
+            """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS appointment_tombstones (
+                appointment_uuid VARCHAR(10) PRIMARY KEY,
+                deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+                INDEX idx_deleted_at (deleted_at)
+            )
+        """)
+
+        # Services take different times; existing bookings were all one 30-minute slot
+        if not _column_exists(cursor, "appointments", "duration_minutes"):
+            cursor.execute("""
+                ALTER TABLE appointments
+                ADD COLUMN duration_minutes SMALLINT NOT NULL DEFAULT 30 AFTER appointment_time
+            """)
+
+        for statement in _ROSTER_TABLES:
+            cursor.execute(statement)
+
+        # Full-text search over visit reasons and patient names (the first
+        # FULLTEXT index on a table rebuilds it, once)
+        if not _index_exists(cursor, "appointments", "ft_reason"):
+            cursor.execute("ALTER TABLE appointments ADD FULLTEXT INDEX ft_reason (reason_for_visit)")
+        if not _index_exists(cursor, "patients", "ft_name"):
+            cursor.execute("ALTER TABLE patients ADD FULLTEXT INDEX ft_name (name)")
+
+        # Lookups go through the normalised email; existing rows are filled in
+        # primary-key chunks, then the duplicates it exposes are merged so the
+        # index can become UNIQUE before any new code writes through it
+        if not _column_exists(cursor, "patients", "email_normalized"):
+            cursor.execute("""
+                ALTER TABLE patients ADD COLUMN email_normalized VARCHAR(100) AFTER email,
+                ADD INDEX idx_email_normalized (email_normalized)
+            """)
+        cursor.execute("SELECT COALESCE(MIN(patient_id), 0), COALESCE(MAX(patient_id), 0) FROM patients")
+        low, high = cursor.fetchone()
+        for start in range(low, high + 1, 1000):
+            cursor.execute("""
+                UPDATE patients SET email_normalized = LOWER(TRIM(email))
+                WHERE patient_id BETWEEN %s AND %s AND email_normalized IS NULL
+            """, (start, start + 999))
+            connection.commit()
+        merged = _merge_duplicate_patients(connection, cursor)
+        if merged:
+            print(f"✓ Merged {merged} duplicate patients")
+
+        # Time-ordered ids: re-key rows still carrying a random 8-character id,
+        # oldest first, keeping the old one in legacy_uuid so lookups still find it
+        if not _column_exists(cursor, "appointments", "legacy_uuid"):
+            cursor.execute("ALTER TABLE appointments ADD COLUMN legacy_uuid VARCHAR(10) AFTER appointment_uuid")
+        if not _index_exists(cursor, "appointments", "idx_legacy_uuid"):
+            cursor.execute("ALTER TABLE appointments ADD INDEX idx_legacy_uuid (legacy_uuid)")
+        generator = IdGenerator(MIGRATION_NODE)
+        # An earlier run may have stopped part way - don't hand out its ids again
+        cursor.execute("SELECT MAX(appointment_uuid) FROM appointments WHERE legacy_uuid IS NOT NULL")
+        last_id = cursor.fetchone()[0]
+        if last_id:
+            generator.resume_after(last_id)
+        cursor.execute("""
+            SELECT appointment_id, UNIX_TIMESTAMP(COALESCE(booked_at, NOW())) FROM appointments
+            WHERE legacy_uuid IS NULL AND CHAR_LENGTH(appointment_uuid) <> 10
+            ORDER BY booked_at, appointment_id
+        """)
+        rekeyed = [(generator.next(int(booked)), appointment_id) for appointment_id, booked in cursor.fetchall()]
+        for batch in chunks(rekeyed):
+            cursor.executemany("""
+                UPDATE appointments SET legacy_uuid = appointment_uuid, appointment_uuid = %s
+                WHERE appointment_id = %s
+            """, batch)
+            connection.commit()
+
+        connection.commit()
+        print("✓ Database upgraded successfully!")
+
+    except Error as e:
+        print(f"Error: {e}")
+    finally:
+        if connection and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+
+def _column_type(cursor, table, column):
+    cursor.execute("""
+        SELECT DATA_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    result = cursor.fetchone()
+    return result[0].lower() if result else None
+
+
+def migrate_appointment_datetimes(chunk_size=1000):
+    """Convert VARCHAR appointment_date/appointment_time to DATE/TIME - safe to re-run
+
+    Shadow columns are added online, back-filled in primary-key chunks (one
+    short transaction each, so the table stays writable), and swapped in with
+    a single ALTER at the end. Both the old 'MM/DD/YYYY' / '08:00 AM' strings
+    and ISO values written by newer code are understood. Run upgrade_database()
+    first so the uq_active_slot key exists.
+    """
+    connection = None
+    try:
+        connection = mysql.connector.connect(
+            host="localhost",
+            user="root",
+            password="",
+            database="dental_clinic"
+        )
+        cursor = connection.cursor()
+
+        if _column_type(cursor, "appointments", "appointment_date") == "date":
+            print("✓ Appointment dates are already native DATE/TIME")
+            return
+
+        if not _column_exists(cursor, "appointments", "appointment_day"):
+            cursor.execute("""
+                ALTER TABLE appointments
+                ADD COLUMN appointment_day DATE NULL,
+                ADD COLUMN appointment_clock TIME NULL,
+                ALGORITHM=INPLACE, LOCK=NONE
+            """)
+
+        backfill = """
+            UPDATE appointments SET
+                appointment_day = COALESCE(STR_TO_DATE(appointment_date, '%%m/%%d/%%Y'),
+                                           STR_TO_DATE(appointment_date, '%%Y-%%m-%%d')),
+                appointment_clock = COALESCE(STR_TO_DATE(appointment_time, '%%h:%%i %%p'),
+                                             STR_TO_DATE(appointment_time, '%%H:%%i:%%s'))
+            WHERE appointment_id BETWEEN %s AND %s AND appointment_day IS NULL
+        """
+
+        cursor.execute("SELECT COALESCE(MIN(appointment_id), 0), COALESCE(MAX(appointment_id), 0) FROM appointments")
+        low, high = cursor.fetchone()
+        for start in range(low, high + 1, chunk_size):
+            cursor.execute(backfill, (start, start + chunk_size - 1))
+            connection.commit()
+
+        # Catch rows booked while the back-fill was running
+        cursor.execute("SELECT COALESCE(MAX(appointment_id), 0) FROM appointments")
+        cursor.execute(backfill, (high + 1, cursor.fetchone()[0]))
+        connection.commit()
+
+        cursor.execute("""
+            SELECT COUNT(*) FROM appointments
+            WHERE appointment_day IS NULL OR appointment_clock IS NULL
+        """)
+        unparsed = cursor.fetchone()[0]
+        if unparsed:
+            print(f"Error: {unparsed} appointments have unreadable dates/times - fix them and re-run")
+            return
+
+        # Swap the columns in; the unique/lookup indexes move with them
+        listing = [(name, columns) for name, columns in _LISTING_INDEXES
+                   if _index_exists(cursor, "appointments", name)]
+        cursor.execute(f"""
+            ALTER TABLE appointments
+            DROP INDEX uq_active_slot,
+            DROP INDEX idx_date_dentist,
+            {"".join(f"DROP INDEX {name}, " for name, _ in listing)}
+            DROP COLUMN appointment_date,
+            DROP COLUMN appointment_time,
+            CHANGE COLUMN appointment_day appointment_date DATE NOT NULL,
+            CHANGE COLUMN appointment_clock appointment_time TIME NOT NULL,
+            ADD UNIQUE KEY uq_active_slot (dentist, appointment_date, appointment_time, slot_lock),
+            ADD INDEX idx_date_dentist (appointment_date, dentist),
+            {"".join(f"ADD INDEX {name} {columns}, " for name, columns in listing)}
+            ALGORITHM=INPLACE, LOCK=NONE
+        """)
+        connection.commit()
+        print("✓ Appointment dates migrated to DATE/TIME")
+
+    except Error as e:
+        print(f"Error: {e}")
+    finally:
+        if connection and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+
+def _decline_double_bookings(connection, cursor, chunk_size=500):
+    """Decline every active booking of a (dentist, date, time) but the oldest, chunk_size slots per transaction"""
+    declined, last = [], None
+    while True:
+        cursor.execute(f"""
+            SELECT dentist, appointment_date, appointment_time FROM appointments
+            WHERE status IN ('Pending', 'Confirmed')
+            {"AND (dentist, appointment_date, appointment_time) > (%s, %s, %s)" if last else ""}
+            GROUP BY dentist, appointment_date, appointment_time HAVING COUNT(*) > 1
+            ORDER BY dentist, appointment_date, appointment_time LIMIT %s
+        """, (*(last or ()), chunk_size))
+        slots = cursor.fetchall()
+        if not slots:
+            break
+        last = slots[-1]
+
+        cursor.execute(f"""
+            SELECT appointment_id, appointment_uuid, dentist, appointment_date, appointment_time
+            FROM appointments
+            WHERE status IN ('Pending', 'Confirmed')
+            AND (dentist, appointment_date, appointment_time) IN ({", ".join(["(%s, %s, %s)"] * len(slots))})
+            ORDER BY booked_at, appointment_id FOR UPDATE
+        """, [value for slot in slots for value in slot])
+        kept, doomed = set(), []
+        for appointment_id, appointment_uuid, *slot in cursor.fetchall():
+            if tuple(slot) in kept:
+                doomed.append(appointment_id)
+                declined.append((appointment_uuid, *slot))
+            else:
+                kept.add(tuple(slot))
+        cursor.execute(f"""
+            UPDATE appointments SET status = 'Declined'
+            WHERE appointment_id IN ({", ".join(["%s"] * len(doomed))})
+        """, doomed)
+        connection.commit()
+
+    for appointment_uuid, dentist, day, clock in declined:
+        print(f"Declined double booking {appointment_uuid}: {dentist} {day} {clock}")
+    if declined:
+        print(f"✓ Declined {len(declined)} double bookings, keeping the oldest of each slot")
+
+
+def merge_duplicate_patients(chunk_size=500):
+    """Merge patients whose emails differ only in case or spacing, then make email_normalized UNIQUE
+
+    upgrade_database() already does this; safe to re-run on its own.
+    """
+    connection = None
+    try:
+        connection = mysql.connector.connect(
+            host="localhost",
+            user="root",
+            password="",
+            database="dental_clinic"
+        )
+        cursor = connection.cursor()
+        merged = _merge_duplicate_patients(connection, cursor, chunk_size)
+        print(f"✓ Merged {merged} duplicate patients")
+
+    except Error as e:
+        print(f"Error: {e}")
+    finally:
+        if connection and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+
+def _merge_duplicate_patients(connection, cursor, chunk_size=500):
+    """Fold case/spacing variants of an email into one patient and make email_normalized UNIQUE - number merged
+
+    The oldest patient of each group keeps its row and takes over the others'
+    appointments. Groups are walked in email_normalized order, chunk_size at
+    a time, each chunk one short transaction locking only its own rows.
+    """
+    if _index_exists(cursor, "patients", "uq_email_normalized"):
+        return 0
+    merged = 0
+    for attempt in range(3):
+        # Rows written meanwhile by code that doesn't fill email_normalized
+        cursor.execute("UPDATE patients SET email_normalized = LOWER(TRIM(email)) WHERE email_normalized IS NULL")
+        connection.commit()
+
+        last = ""
+        while True:
+            cursor.execute("""
+                SELECT email_normalized FROM patients WHERE email_normalized > %s
+                GROUP BY email_normalized HAVING COUNT(*) > 1
+                ORDER BY email_normalized LIMIT %s
+            """, (last, chunk_size))
+            groups = [row[0] for row in cursor.fetchall()]
+            if not groups:
+                break
+            last = groups[-1]
+
+            cursor.execute(f"""
+                SELECT patient_id, email_normalized FROM patients
+                WHERE email_normalized IN ({", ".join(["%s"] * len(groups))})
+                ORDER BY patient_id FOR UPDATE
+            """, groups)
+            keep, merges = {}, []
+            for patient_id, email in cursor.fetchall():
+                if email in keep:
+                    merges.append((keep[email], patient_id))
+                else:
+                    keep[email] = patient_id
+            if merges:
+                cursor.executemany("UPDATE appointments SET patient_id = %s WHERE patient_id = %s", merges)
+                cursor.execute(f"""
+                    DELETE FROM patients WHERE patient_id IN ({", ".join(["%s"] * len(merges))})
+                """, [duplicate for _, duplicate in merges])
+            connection.commit()
+            merged += len(merges)
+
+        try:
+            cursor.execute("""
+                ALTER TABLE patients
+                MODIFY email_normalized VARCHAR(100) NOT NULL,
+                ADD UNIQUE KEY uq_email_normalized (email_normalized),
+                DROP INDEX idx_email_normalized
+            """)
+            return merged
+        except Error as e:
+            # A NULL or a new duplicate slipped in after the pass above - go round again
+            if e.errno not in (errorcode.ER_DUP_ENTRY, errorcode.ER_INVALID_USE_OF_NULL) or attempt == 2:
+                raise
+
+
+class DatabaseManager(AppointmentStorage):
+    def __init__(self, pool_size=5, pool_timeout=10.0, connect_timeout=5):
+        self.concurrency = pool_size
+        self.host = "localhost"
+        self.user = "root"
+        self.password = ""
+        self.database = "dental_clinic"
+
+        # One pool shared by every method - connections are reused instead of
+        # paying a TCP + auth handshake per query
+        self.pool = ConnectionPool(
+            pool_size=pool_size,
+            timeout=pool_timeout,
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            connection_timeout=connect_timeout
+        )
+
+    def get_connection(self):
+        """Check a connection out of the pool (close() returns it)"""
+        try:
+            return self.pool.get_connection()
+        except Error as e:
+            print(f"Connection Error: {e}")
+            return None
+
+    def pool_stats(self):
+        """Connection pool counters (open/idle/in use, waits, timeouts)"""
+        return self.pool.stats()
+
+    def close(self):
+        """Close all pooled connections"""
+        self.pool.close()
+
+    def add_patient(self, name, email, gender):
+        """Add new patient to database"""
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            insert_query = "INSERT INTO patients (name, email, email_normalized, gender) VALUES (%s, %s, %s, %s)"
+            cursor.execute(insert_query, (name, email, normalize_email(email), gender))
+            connection.commit()
+            return True
+        except Error as e:
+            print(f"Error adding patient: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_patient_by_email(self, email):
+        """Get patient ID from email"""
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT patient_id, name FROM patients WHERE email_normalized = %s",
+                           (normalize_email(email),))
+            result = cursor.fetchone()
+            return result
+        except Error as e:
+            print(f"Error fetching patient: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_patients(self, after=None, limit=BATCH_SIZE):
+        """Get one keyset page of patients by patient_id"""
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT patient_id, name, email FROM patients
+                WHERE patient_id > %s ORDER BY patient_id LIMIT %s
+            """, (after or 0, limit))
+            return cursor.fetchall()
+        except Error as e:
+            print(f"Error fetching patients: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def find_patients(self, prefix, limit=10):
+        """Get patients whose name or email starts with prefix
+
+        The default collation ignores case (and accents), so idx_name and the
+        email UNIQUE index serve the prefix LIKEs directly; one query per
+        index keeps both seeks instead of an OR that scans.
+        """
+        connection = self.get_connection()
+        if not connection:
+            return []
+
+        try:
+            cursor = connection.cursor()
+            pattern = like_prefix(prefix)
+            cursor.execute("""
+                (SELECT name, email FROM patients WHERE name LIKE %s ESCAPE '!' ORDER BY name LIMIT %s)
+                UNION
+                (SELECT name, email FROM patients WHERE email LIKE %s ESCAPE '!' ORDER BY email LIMIT %s)
+                ORDER BY name
+                LIMIT %s
+            """, (pattern, limit, pattern, limit, limit))
+            return cursor.fetchall()
+        except Error as e:
+            print(f"Error searching patients: {e}")
+            return []
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_appointment_by_uuid(self, appointment_uuid):
+        """Get one appointment as a listing row, or None - also by the id it had before re-keying"""
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                SELECT {APPOINTMENT_COLUMNS}
+                FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                WHERE a.appointment_uuid = %s OR a.legacy_uuid = %s
+            """, (appointment_uuid, appointment_uuid))
+            row = cursor.fetchone()
+            return _listing_row(row) if row else None
+        except Error as e:
+            print(f"Error fetching appointment: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_appointment_details(self, appointment_uuid):
+        """Get the columns the listing leaves out - (reason, booked_at, gender, patient_created_at)"""
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT a.reason_for_visit, a.booked_at, p.gender, p.created_at
+                FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                WHERE a.appointment_uuid = %s OR a.legacy_uuid = %s
+            """, (appointment_uuid, appointment_uuid))
+            return cursor.fetchone()
+        except Error as e:
+            print(f"Error fetching appointment details: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def reserve_appointment(self, name, email, gender, appointment_uuid, date, time, dentist, reason,
+                            duration=DEFAULT_DURATION):
+        """Upsert the patient and book duration minutes from time in one transaction
+
+        Returns RESERVED, SLOT_TAKEN (another active booking overlaps the
+        interval, or the dentist's day stayed locked), DUPLICATE_ID or
+        RESERVE_FAILED
+        """
+        for _ in range(_LOCK_ATTEMPTS):
+            status = self._reserve_once(name, email, gender, appointment_uuid, date, time, dentist, reason,
+                                        duration)
+            if status != _LOCKED:
+                return status
+        return SLOT_TAKEN
+
+    def _reserve_once(self, name, email, gender, appointment_uuid, date, time, dentist, reason, duration):
+        connection = self.get_connection()
+        if not connection:
+            return RESERVE_FAILED
+
+        try:
+            cursor = connection.cursor()
+            connection.start_transaction()
+
+            # The dentist's lock first, so bookings for one dentist queue up in the same order
+            if self._day_intervals(cursor, dentist, date).conflicts(minutes(time), minutes(time) + duration):
+                return SLOT_TAKEN
+
+            # LAST_INSERT_ID(expr) makes lastrowid the existing id when the email is taken
+            cursor.execute("""
+                INSERT INTO patients (name, email, email_normalized, gender) VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE patient_id = LAST_INSERT_ID(patient_id)
+            """, (name, email, normalize_email(email), gender))
+            patient_id = cursor.lastrowid
+
+            cursor.execute("""
+                INSERT INTO appointments
+                (patient_id, appointment_uuid, appointment_date, appointment_time, duration_minutes,
+                 dentist, status, reason_for_visit)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, (patient_id, appointment_uuid, date, time, duration, dentist, "Pending", reason))
+            connection.commit()
+            return RESERVED
+        except IntegrityError as e:
+            # Uncommitted work is rolled back when the connection goes back to the pool
+            if e.errno == errorcode.ER_DUP_ENTRY and "uq_active_slot" in str(e):
+                return SLOT_TAKEN
+            if e.errno == errorcode.ER_DUP_ENTRY and "appointment_uuid" in str(e):
+                return DUPLICATE_ID
+            print(f"Error reserving appointment: {e}")
+            return RESERVE_FAILED
+        except Error as e:
+            if e.errno in _LOCK_ERRORS:
+                return _LOCKED
+            print(f"Error reserving appointment: {e}")
+            return RESERVE_FAILED
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def move_appointment(self, appointment_uuid, date, time, dentist, duration=DEFAULT_DURATION, reason=None):
+        """Move a booking to a new dentist/date/time in one transaction, keeping its id
+
+        Returns RESERVED, SLOT_TAKEN (the new interval overlaps another active
+        booking, or the dentist's day stayed locked), NOT_FOUND or
+        RESERVE_FAILED; on anything but RESERVED the appointment is left where
+        it was.
+        """
+        for _ in range(_LOCK_ATTEMPTS):
+            status = self._move_once(appointment_uuid, date, time, dentist, duration, reason)
+            if status != _LOCKED:
+                return status
+        return SLOT_TAKEN
+
+    def _move_once(self, appointment_uuid, date, time, dentist, duration, reason):
+        connection = self.get_connection()
+        if not connection:
+            return RESERVE_FAILED
+
+        try:
+            cursor = connection.cursor()
+            connection.start_transaction()
+
+            cursor.execute("SELECT appointment_id FROM appointments WHERE appointment_uuid = %s FOR UPDATE",
+                           (appointment_uuid,))
+            row = cursor.fetchone()
+            if not row:
+                return NOT_FOUND
+            appointment_id = row[0]
+
+            # The booking being moved doesn't conflict with itself
+            day = self._day_intervals(cursor, dentist, date, exclude=appointment_id)
+            if day.conflicts(minutes(time), minutes(time) + duration):
+                return SLOT_TAKEN
+
+            cursor.execute("""
+                UPDATE appointments
+                SET dentist = %s, appointment_date = %s, appointment_time = %s, duration_minutes = %s,
+                    status = 'Pending', reason_for_visit = COALESCE(%s, reason_for_visit)
+                WHERE appointment_id = %s
+            """, (dentist, date, time, duration, reason, appointment_id))
+            connection.commit()
+            return RESERVED
+        except IntegrityError as e:
+            if e.errno == errorcode.ER_DUP_ENTRY and "uq_active_slot" in str(e):
+                return SLOT_TAKEN
+            print(f"Error moving appointment: {e}")
+            return RESERVE_FAILED
+        except Error as e:
+            if e.errno in _LOCK_ERRORS:
+                return _LOCKED
+            print(f"Error moving appointment: {e}")
+            return RESERVE_FAILED
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def _day_intervals(self, cursor, dentist, date, exclude=None):
+        """The dentist's active bookings that day, minus appointment_id exclude
+
+        Locks the dentist's roster row first, so writers for one dentist take
+        turns instead of racing for gap locks in uq_active_slot (which only
+        knows start times) and deadlocking. The day's rows are locked too, for
+        dentists not in the roster.
+        """
+        cursor.execute("SELECT dentist_id FROM dentists WHERE name = %s FOR UPDATE", (dentist,))
+        cursor.fetchall()
+        cursor.execute("""
+            SELECT appointment_time, duration_minutes FROM appointments
+            WHERE dentist = %s AND appointment_date = %s AND status IN ('Pending', 'Confirmed')
+            AND appointment_id <> %s
+            FOR UPDATE
+        """, (dentist, date, exclude or 0))
+        return DayIntervals.from_booked({_as_time(start): length for start, length in cursor.fetchall()})
+
+    def _reactivation_conflicts(self, cursor, appointment_uuids, status):
+        """True if status would make an inactive one of appointment_uuids overlap an active booking"""
+        if status not in ACTIVE_STATUSES:
+            return False
+        ids = ", ".join(["%s"] * len(appointment_uuids))
+        cursor.execute(f"""
+            SELECT appointment_id, dentist, appointment_date, appointment_time, duration_minutes
+            FROM appointments
+            WHERE appointment_uuid IN ({ids}) AND status NOT IN ('Pending', 'Confirmed')
+            FOR UPDATE
+        """, appointment_uuids)
+        days = {}
+        for appointment_id, dentist, day, start, duration in cursor.fetchall():
+            if (dentist, day) not in days:
+                days[(dentist, day)] = self._day_intervals(cursor, dentist, day, exclude=appointment_id)
+            start = minutes(_as_time(start))
+            if days[(dentist, day)].conflicts(start, start + duration):
+                return True
+            # Taken for the rest of this batch too
+            days[(dentist, day)].add(start, start + duration)
+        return False
+
+    def get_patient_appointments(self, email):
+        """Get one patient's appointments as listing rows, newest first"""
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                SELECT {APPOINTMENT_COLUMNS}
+                FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                WHERE p.email_normalized = %s
+                ORDER BY a.appointment_date DESC, a.appointment_time DESC, a.appointment_id DESC
+            """, (normalize_email(email),))
+            return [_listing_row(row) for row in cursor.fetchall()]
+        except Error as e:
+            print(f"Error fetching appointments: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def count_appointments(self, view=None):
+        """Count all appointments, or those passing view's filters"""
+        connection = self.get_connection()
+        if not connection:
+            return 0
+
+        try:
+            cursor = connection.cursor()
+            if view is None or not view.filtered:
+                cursor.execute("SELECT COUNT(*) FROM appointments")
+            else:
+                where, _, params = listing_clauses(view)
+                cursor.execute(f"""
+                    SELECT COUNT(*) FROM appointments a
+                    JOIN patients p ON a.patient_id = p.patient_id
+                    {where}
+                """, params)
+            return cursor.fetchone()[0]
+        except Error as e:
+            print(f"Error counting appointments: {e}")
+            return 0
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_appointments_page(self, after=None, limit=50, before=None, view=None):
+        """Get one page of appointments in view's order (default newest first)
+
+        after is the cursor of the last row already seen (None for the first
+        page); before instead returns the limit rows just above that cursor,
+        still in view order. Filters and the keyset condition seek the
+        composite indexes (idx_status_date, idx_dentist_date, idx_date_time,
+        idx_name) instead of counting past an OFFSET.
+        """
+        connection = self.get_connection()
+        if not connection:
+            return []
+
+        try:
+            cursor = connection.cursor()
+            upwards = after is None and before is not None
+            where, order, params = listing_clauses(view or DEFAULT_VIEW, after if after is not None else before,
+                                                   before=upwards)
+            cursor.execute(f"""
+                SELECT {APPOINTMENT_COLUMNS}
+                FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                {where}
+                {order}
+                LIMIT %s
+            """, (*params, limit))
+            rows = [_listing_row(row) for row in cursor.fetchall()]
+            if upwards:
+                # Walked upwards from the cursor - flip back to view order
+                rows.reverse()
+            return rows
+        except Error as e:
+            print(f"Error fetching appointments: {e}")
+            return []
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def iter_appointments(self, batch_size=500):
+        """Yield every appointment newest first, streamed from an unbuffered cursor
+
+        Only batch_size rows are held in memory at a time. The connection stays
+        checked out until the generator is exhausted or closed.
+        """
+        connection = self.get_connection()
+        if not connection:
+            return
+
+        exhausted = False
+        try:
+            cursor = connection.cursor(buffered=False)
+            cursor.execute(f"""
+                SELECT {APPOINTMENT_COLUMNS}
+                FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                ORDER BY a.appointment_date DESC, a.appointment_time DESC, a.appointment_id DESC
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _listing_row(row)
+            exhausted = True
+        except Error as e:
+            print(f"Error streaming appointments: {e}")
+        finally:
+            if connection.is_connected():
+                # An abandoned stream leaves unread rows; the pool drops that connection
+                if exhausted:
+                    cursor.close()
+                connection.close()
+
+    def search_appointments(self, query, limit=20, offset=0):
+        """Full-text search over reasons and patient names, best match first
+
+        The two tables' FULLTEXT indexes can't serve one MATCH, and an OR of
+        two would scan, so each is matched on its own and the relevance of an
+        appointment is the sum over both.
+        """
+        if not query.strip():
+            return []
+        connection = self.get_connection()
+        if not connection:
+            return []
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                SELECT {APPOINTMENT_COLUMNS}
+                FROM (
+                    SELECT appointment_id, SUM(score) AS score FROM (
+                        SELECT appointment_id, MATCH(reason_for_visit) AGAINST (%s) AS score
+                        FROM appointments
+                        WHERE MATCH(reason_for_visit) AGAINST (%s)
+                        UNION ALL
+                        SELECT a.appointment_id, MATCH(p.name) AGAINST (%s)
+                        FROM patients p
+                        JOIN appointments a ON a.patient_id = p.patient_id
+                        WHERE MATCH(p.name) AGAINST (%s)
+                    ) matches
+                    GROUP BY appointment_id
+                ) hits
+                JOIN appointments a ON a.appointment_id = hits.appointment_id
+                JOIN patients p ON a.patient_id = p.patient_id
+                ORDER BY hits.score DESC, a.appointment_date DESC, a.appointment_time DESC, a.appointment_id DESC
+                LIMIT %s OFFSET %s
+            """, (query, query, query, query, limit, offset))
+            return [_listing_row(row) for row in cursor.fetchall()]
+        except Error as e:
+            print(f"Error searching appointments: {e}")
+            return []
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_changes_since(self, watermark=None, overlap_seconds=5):
+        """Get appointments changed and ids deleted since a watermark
+
+        Returns (changed_rows, deleted_uuids, new_watermark) or None on error;
+        pass new_watermark back on the next call. With no watermark only the
+        current one is returned. The lookback overlap covers transactions that
+        stamped updated_at before the previous call but committed after it, so
+        the same change may be reported twice - apply deltas idempotently.
+        Returns STALE_WATERMARK for a watermark older than the tombstones kept.
+        """
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT NOW(6)")
+            new_watermark = cursor.fetchone()[0]
+            cursor.execute("""
+                DELETE FROM appointment_tombstones WHERE deleted_at < %s - INTERVAL %s SECOND
+            """, (new_watermark, TOMBSTONE_RETENTION_SECONDS))
+            connection.commit()
+            if watermark is None:
+                return [], [], new_watermark
+            if watermark < new_watermark - timedelta(seconds=TOMBSTONE_RETENTION_SECONDS - overlap_seconds):
+                return STALE_WATERMARK
+
+            cursor.execute(f"""
+                SELECT {APPOINTMENT_COLUMNS}
+                FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                WHERE a.updated_at >= %s - INTERVAL %s SECOND
+            """, (watermark, overlap_seconds))
+            changed = [_listing_row(row) for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT appointment_uuid FROM appointment_tombstones
+                WHERE deleted_at >= %s - INTERVAL %s SECOND
+            """, (watermark, overlap_seconds))
+            deleted = [row[0] for row in cursor.fetchall()]
+            return changed, deleted, new_watermark
+        except Error as e:
+            print(f"Error fetching changes: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def check_slot_available(self, dentist, date, time, duration=DEFAULT_DURATION):
+        """Check if duration minutes from time are free (False when the DB can't be reached)"""
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT appointment_time, duration_minutes FROM appointments 
+                WHERE dentist = %s AND appointment_date = %s 
+                AND status IN ('Pending', 'Confirmed')
+            """, (dentist, date))
+            day = DayIntervals.from_booked({_as_time(start): length for start, length in cursor.fetchall()})
+            return not day.conflicts(minutes(time), minutes(time) + duration)
+        except Error as e:
+            print(f"Error checking slot: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_booked_slots(self, dentists, dates):
+        """Get booked times for many dentists/dates in a single query
+
+        Returns {(dentist, date): {time: duration_minutes}} for every pair with
+        an active (Pending/Confirmed) booking, or None if the query failed
+        """
+        dentists = list(dict.fromkeys(dentists))
+        dates = list(dict.fromkeys(dates))
+        if not dentists or not dates:
+            return {}
+
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                SELECT dentist, appointment_date, appointment_time, duration_minutes FROM appointments
+                WHERE dentist IN ({", ".join(["%s"] * len(dentists))})
+                AND appointment_date IN ({", ".join(["%s"] * len(dates))})
+                AND status IN ('Pending', 'Confirmed')
+            """, (*dentists, *dates))
+            booked = {}
+            for dentist, date, time, duration in cursor.fetchall():
+                booked.setdefault((dentist, date), {})[_as_time(time)] = duration
+            return booked
+        except Error as e:
+            print(f"Error fetching booked slots: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_booked_range(self, dentists, start, end):
+        """Get booked times for many dentists over a date range in a single query
+
+        Same result as get_booked_slots() for every date from start to end
+        inclusive, as a range scan instead of an IN list
+        """
+        dentists = list(dict.fromkeys(dentists))
+        if not dentists or start > end:
+            return {}
+
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                SELECT dentist, appointment_date, appointment_time, duration_minutes FROM appointments
+                WHERE appointment_date BETWEEN %s AND %s
+                AND dentist IN ({", ".join(["%s"] * len(dentists))})
+                AND status IN ('Pending', 'Confirmed')
+            """, (start, end, *dentists))
+            booked = {}
+            for dentist, date, time, duration in cursor.fetchall():
+                booked.setdefault((dentist, date), {})[_as_time(time)] = duration
+            return booked
+        except Error as e:
+            print(f"Error fetching booked slots: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def update_appointment_status(self, appointment_uuid, status):
+        """Update appointment status, refusing to reactivate a booking over another one"""
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            connection.start_transaction()
+            if self._reactivation_conflicts(cursor, [appointment_uuid], status):
+                # Uncommitted work is rolled back when the connection goes back to the pool
+                print("Error updating status: slot already booked")
+                return False
+            cursor.execute("""
+                UPDATE appointments SET status = %s 
+                WHERE appointment_uuid = %s
+            """, (status, appointment_uuid))
+            connection.commit()
+            return True
+        except Error as e:
+            print(f"Error updating status: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def update_appointments_status(self, appointment_uuids, status):
+        """Update many appointments' status in one transaction - [(uuid, dentist, date, time)] updated"""
+        return self._bulk_write(appointment_uuids, "updating status", [
+            "UPDATE appointments SET status = %s WHERE appointment_uuid IN ({ids})"
+        ], (status,), check=lambda cursor, batch: self._reactivation_conflicts(cursor, batch, status))
+
+    def delete_appointments(self, appointment_uuids):
+        """Delete many appointments in one transaction - [(uuid, dentist, date, time)] deleted"""
+        return self._bulk_write(appointment_uuids, "deleting appointments", [
+            f"""
+            {_TOMBSTONE_INSERT} WHERE appointment_uuid IN ({{ids}})
+            ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)
+            """,
+            "DELETE FROM appointments WHERE appointment_uuid IN ({ids})"
+        ])
+
+    def _bulk_write(self, appointment_uuids, action, statements, params=(), check=None):
+        """Lock the rows, then run statements (with {ids} as placeholders) per batch of ids, all in one transaction
+
+        check(cursor, batch), if given, runs before each batch's statements; if
+        it returns True (slot already booked) the whole transaction is dropped.
+        """
+        appointment_uuids = list(dict.fromkeys(appointment_uuids))
+        if not appointment_uuids:
+            return []
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            connection.start_transaction()
+            affected = []
+            for batch in chunks(appointment_uuids):
+                ids = ", ".join(["%s"] * len(batch))
+                cursor.execute(f"""
+                    SELECT appointment_uuid, dentist, appointment_date, appointment_time
+                    FROM appointments WHERE appointment_uuid IN ({ids})
+                    FOR UPDATE
+                """, batch)
+                affected += [(uuid, dentist, day, _as_time(clock)) for uuid, dentist, day, clock in cursor.fetchall()]
+                if check and check(cursor, batch):
+                    # Uncommitted work is rolled back when the connection goes back to the pool
+                    print(f"Error {action}: slot already booked")
+                    return False
+                for statement in statements:
+                    cursor.execute(statement.format(ids=ids), (*params, *batch))
+            connection.commit()
+            return affected
+        except Error as e:
+            # Uncommitted work is rolled back when the connection goes back to the pool
+            print(f"Error {action}: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def delete_appointment_by_email(self, email):
+        """Delete patient's appointments by email - [(uuid, dentist, date, time)] deleted"""
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT patient_id FROM patients WHERE email_normalized = %s", (normalize_email(email),))
+            result = cursor.fetchone()
+
+            if not result:
+                return False
+
+            patient_id = result[0]
+            cursor.execute("""
+                SELECT appointment_uuid, dentist, appointment_date, appointment_time
+                FROM appointments WHERE patient_id = %s FOR UPDATE
+            """, (patient_id,))
+            deleted = [(uuid, dentist, day, _as_time(clock)) for uuid, dentist, day, clock in cursor.fetchall()]
+            cursor.execute(f"""
+                {_TOMBSTONE_INSERT} WHERE patient_id = %s
+                ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)
+            """, (patient_id,))
+            cursor.execute("""
+                DELETE FROM appointments WHERE patient_id = %s
+            """, (patient_id,))
+            connection.commit()
+            return deleted
+        except Error as e:
+            print(f"Error deleting appointment: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def delete_appointment_by_uuid(self, appointment_uuid):
+        """Delete specific appointment by UUID, or by the id it had before re-keying"""
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                {_TOMBSTONE_INSERT} WHERE appointment_uuid = %s OR legacy_uuid = %s
+                ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)
+            """, (appointment_uuid, appointment_uuid))
+            cursor.execute("""
+                DELETE FROM appointments WHERE appointment_uuid = %s OR legacy_uuid = %s
+            """, (appointment_uuid, appointment_uuid))
+            connection.commit()
+            return True
+        except Error as e:
+            print(f"Error deleting appointment: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    # ---------------- Roster ----------------
+
+    def get_roster(self):
+        """Active dentists plus their weekly hours and breaks
+
+        Returns (dentists, hours, breaks) with hours/breaks as
+        [(dentist, weekday, start, end)], or None if the query failed
+        """
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT name FROM dentists WHERE active ORDER BY dentist_id")
+            dentists = [row[0] for row in cursor.fetchall()]
+            periods = []
+            for table in ("dentist_hours", "dentist_breaks"):
+                cursor.execute(f"""
+                    SELECT d.name, t.weekday, t.start_time, t.end_time
+                    FROM {table} t JOIN dentists d ON t.dentist_id = d.dentist_id
+                    WHERE d.active
+                """)
+                periods.append([(name, weekday, _as_time(start), _as_time(end))
+                                for name, weekday, start, end in cursor.fetchall()])
+            return dentists, periods[0], periods[1]
+        except Error as e:
+            print(f"Error fetching roster: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def get_leave(self):
+        """Leave days as [(dentist, date)], with dentist None for clinic holidays"""
+        connection = self.get_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT d.name, l.leave_date FROM dentist_leave l
+                JOIN dentists d ON l.dentist_id = d.dentist_id
+                UNION ALL
+                SELECT NULL, holiday_date FROM clinic_holidays
+            """)
+            return cursor.fetchall()
+        except Error as e:
+            print(f"Error fetching leave: {e}")
+            return None
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    def add_dentist(self, name):
+        """Add a dentist (or re-activate one) - True on success"""
+        return self._write_roster("""
+            INSERT INTO dentists (name) VALUES (%s)
+            ON DUPLICATE KEY UPDATE active = TRUE
+        """, (name,))
+
+    def set_working_hours(self, dentist, weekday, start, end):
+        """Set a dentist's hours for a weekday (Monday = 0); start None makes it a day off"""
+        if start is None:
+            return self._write_roster("""
+                DELETE h FROM dentist_hours h JOIN dentists d ON h.dentist_id = d.dentist_id
+                WHERE d.name = %s AND h.weekday = %s
+            """, (dentist, weekday))
+        return self._write_roster("""
+            INSERT INTO dentist_hours (dentist_id, weekday, start_time, end_time)
+            SELECT dentist_id, %s, %s, %s FROM dentists WHERE name = %s
+            ON DUPLICATE KEY UPDATE start_time = VALUES(start_time), end_time = VALUES(end_time)
+        """, (weekday, start, end, dentist))
+
+    def add_break(self, dentist, weekday, start, end):
+        """Add a recurring break to a dentist's weekday"""
+        return self._write_roster("""
+            INSERT INTO dentist_breaks (dentist_id, weekday, start_time, end_time)
+            SELECT dentist_id, %s, %s, %s FROM dentists WHERE name = %s
+        """, (weekday, start, end, dentist))
+
+    def set_leave(self, dentist, day, on_leave=True, reason=""):
+        """Put a dentist on leave for a day (or take them off it); dentist None closes the clinic"""
+        if dentist is None:
+            if on_leave:
+                return self._write_roster("INSERT IGNORE INTO clinic_holidays (holiday_date, name) VALUES (%s, %s)",
+                                          (day, reason))
+            return self._write_roster("DELETE FROM clinic_holidays WHERE holiday_date = %s", (day,))
+        if on_leave:
+            return self._write_roster("""
+                INSERT IGNORE INTO dentist_leave (dentist_id, leave_date, reason)
+                SELECT dentist_id, %s, %s FROM dentists WHERE name = %s
+            """, (day, reason, dentist))
+        return self._write_roster("""
+            DELETE l FROM dentist_leave l JOIN dentists d ON l.dentist_id = d.dentist_id
+            WHERE d.name = %s AND l.leave_date = %s
+        """, (dentist, day))
+
+    def _write_roster(self, query, params):
+        connection = self.get_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            connection.commit()
+            return True
+        except Error as e:
+            print(f"Error updating roster: {e}")
+            return False
+        finally:
+            if connection.is_connected():
+                cursor.close()
+                connection.close()
@@ -0,0 +1,100 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DBWorker:
+    """Runs blocking database calls off the Tk event thread.
+
+    submit() runs fn on a worker thread. Its result (or exception) is queued
+    and delivered to on_done/on_error from root.after on the Tk thread, so
+    callbacks can touch widgets. Jobs can be tagged with a group; cancelling a
+    job (or its group) drops its callbacks even if the query is already
+    running, which is how stale requests are discarded when the user moves on.
+    """
+
+    def __init__(self, root, max_workers=4, poll_ms=20):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self.on_busy_change = None  # called with True/False as work starts and drains
+
+        self._results = queue.Queue()
+        self._jobs = {}  # job id -> (group, future, on_done, on_error, background); Tk thread only
+        self._next_id = 0
+        self._busy = False
+        self._after_id = self.root.after(self.poll_ms, self._drain)
+
+    @property
+    def busy(self):
+        """True while any foreground job is pending"""
+        return any(not job[4] for job in self._jobs.values())
+
+    def submit(self, fn, *args, on_done=None, on_error=None, group=None, background=False):
+        """Run fn(*args) on a worker thread and return a job id
+
+        Background jobs (e.g. periodic polls) don't count towards busy.
+        """
+        self._next_id += 1
+        job_id = self._next_id
+        future = self.executor.submit(fn, *args)
+        self._jobs[job_id] = (group, future, on_done, on_error, background)
+        # Runs on the worker thread - only hand the future over, never touch Tk here
+        future.add_done_callback(lambda f, job_id=job_id: self._results.put(job_id))
+        self._update_busy()
+        return job_id
+
+    def cancel(self, job_id):
+        """Forget a job; it is skipped if it hasn't started yet"""
+        job = self._jobs.pop(job_id, None)
+        if job:
+            job[1].cancel()
+        self._update_busy()
+
+    def cancel_group(self, group):
+        """Forget every pending job submitted with this group"""
+        for job_id in [job_id for job_id, job in self._jobs.items() if job[0] == group]:
+            self.cancel(job_id)
+
+    def cancel_all(self):
+        """Forget every pending job, e.g. when the page they belong to is gone"""
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def shutdown(self):
+        """Stop polling and let running queries finish in the background"""
+        self.cancel_all()
+        self.root.after_cancel(self._after_id)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _drain(self):
+        try:
+            self._deliver()
+        finally:
+            # Keep polling even if a callback raised
+            self._update_busy()
+            self._after_id = self.root.after(self.poll_ms, self._drain)
+
+    def _deliver(self):
+        while True:
+            try:
+                job_id = self._results.get_nowait()
+            except queue.Empty:
+                return
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                continue  # cancelled while running
+            _, future, on_done, on_error, _ = job
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"Background job failed: {error!r}")
+            elif on_done:
+                on_done(future.result())
+
+    def _update_busy(self):
+        if self.busy != self._busy:
+            self._busy = self.busy
+            if self.on_busy_change:
+                self.on_busy_change(self._busy)
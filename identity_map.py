@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+
+from storage import normalize_email
+
+
+class IdentityMap:
+    """Bounded map of appointment id -> the one Appointment object for it.
+
+    get() hydrates misses through load(appt_id), so an appointment can be
+    acted on without having been booked by this process. Least recently used
+    entries are evicted beyond maxsize. A secondary index by patient email
+    covers the entries currently held, so that lookup doesn't scan the whole
+    map.
+    """
+
+    def __init__(self, load, maxsize=1000):
+        self.load = load  # appt_id -> Appointment or None
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # appt_id -> Appointment, least recently used first
+        self._by_email = {}  # normalize_email(email) -> {appt_id}
+        self._lock = threading.RLock()
+
+    def __contains__(self, appt_id):
+        with self._lock:
+            return appt_id in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, appt_id):
+        """The appointment with this id, loading it on a miss - None if it doesn't exist"""
+        with self._lock:
+            appt = self._entries.get(appt_id)
+            if appt is not None:
+                self._entries.move_to_end(appt_id)
+                return appt
+        # Load outside the lock so a slow query doesn't block other lookups
+        appt = self.load(appt_id)
+        if appt is None:
+            return None
+        return self.add(appt)
+
+    def peek(self, appt_id):
+        """The held appointment with this id, without loading or touching recency"""
+        with self._lock:
+            return self._entries.get(appt_id)
+
+    def add(self, appt):
+        """Hold appt and return the canonical object for its id
+
+        If the id is already held, that object is updated from appt in place,
+        so everyone holding it sees the change.
+        """
+        with self._lock:
+            current = self._entries.get(appt.id)
+            if current is None:
+                self._entries[appt.id] = current = appt
+                self._index(appt)
+                while len(self._entries) > self.maxsize:
+                    self._remove(next(iter(self._entries)))
+            else:
+                self._unindex(current)
+                current.patient = appt.patient
+                current.date = appt.date
+                current.time = appt.time
+                current.dentist = appt.dentist
+                current.status = appt.status
+                current.duration = appt.duration
+                self._index(current)
+            self._entries.move_to_end(appt.id)
+            return current
+
+    def refresh(self, appt):
+        """Update the held copy of appt if there is one, else return appt unchanged"""
+        with self._lock:
+            if appt.id in self._entries:
+                return self.add(appt)
+            return appt
+
+    def discard(self, appt_id):
+        with self._lock:
+            if appt_id in self._entries:
+                self._remove(appt_id)
+
+    def by_email(self, email):
+        """Held appointments of one patient"""
+        with self._lock:
+            return [self._entries[appt_id] for appt_id in self._by_email.get(normalize_email(email), ())]
+
+    def _remove(self, appt_id):
+        self._unindex(self._entries.pop(appt_id))
+
+    def _index(self, appt):
+        self._by_email.setdefault(normalize_email(appt.patient.email), set()).add(appt.id)
+
+    def _unindex(self, appt):
+        key = normalize_email(appt.patient.email)
+        ids = self._by_email.get(key)
+        if ids is not None:
+            ids.discard(appt.id)
+            if not ids:
+                del self._by_email[key]
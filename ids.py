@@ -0,0 +1,104 @@
+import os
+import random
+import threading
+import time
+
+# Crockford base32: no I, L, O or U, so an id read over the phone can't be misheard as another
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# 50 bits = 10 characters: seconds since EPOCH | node | sequence within the second
+EPOCH = 1577836800  # 2020-01-01 UTC
+LENGTH = 10
+TIME_BITS, NODE_BITS, SEQUENCE_BITS = 32, 8, 10
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# Node reserved for ids assigned to existing rows by the migrations
+MIGRATION_NODE = 0
+
+# OS entropy, so processes forked from one parent don't draw the same node
+_random = random.SystemRandom()
+
+
+def encode(value, length=LENGTH):
+    chars = []
+    for _ in range(length):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode(text):
+    value = 0
+    for char in text:
+        value = (value << 5) | ALPHABET.index(char)
+    return value
+
+
+class IdGenerator:
+    """Short, k-sortable appointment ids.
+
+    Ids sort by creation second, so inserts append to the unique index
+    instead of landing at random pages. Within a second a per-node sequence
+    keeps them unique; if it runs out the generator borrows the next second,
+    and a clock stepping backwards never makes it reuse one. Distinct nodes
+    keep processes apart: set DENTAL_NODE_ID (1-255) per process to be sure,
+    else a random node is drawn. Two random nodes can still meet, so storage
+    rejects a duplicate and try_reserve() calls renew() before retrying.
+    """
+
+    def __init__(self, node=None):
+        self.pinned = node is not None or "DENTAL_NODE_ID" in os.environ
+        if node is None:
+            node = _node_from_env() if self.pinned else _random_node()
+        if not 0 <= node < 1 << NODE_BITS:
+            raise ValueError(f"Node must be 0-{(1 << NODE_BITS) - 1}, got {node}")
+        self.node = node
+        self._second = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next(self, timestamp=None):
+        """New id for now, or for a unix timestamp (migrations, oldest first)"""
+        second = max(int((time.time() if timestamp is None else timestamp) - EPOCH), 0)
+        with self._lock:
+            if second > self._second:
+                self._second, self._sequence = second, 0
+            elif self._sequence < MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._second, self._sequence = self._second + 1, 0
+            value = (self._second << (NODE_BITS + SEQUENCE_BITS)) | (self.node << SEQUENCE_BITS) | self._sequence
+        return encode(value)
+
+    def resume_after(self, last_id):
+        """Carry on from an id this node issued before (e.g. by an interrupted migration), so none is reused"""
+        value = decode(last_id)
+        with self._lock:
+            self._second, self._sequence = value >> (NODE_BITS + SEQUENCE_BITS), value & MAX_SEQUENCE
+
+    def renew(self):
+        """After a duplicate id: move to another random node, unless the node was set explicitly"""
+        if self.pinned:
+            return
+        with self._lock:
+            self.node = _random_node(exclude=self.node)
+
+
+def _random_node(exclude=None):
+    # Never MIGRATION_NODE
+    while True:
+        node = _random.randrange(1, 1 << NODE_BITS)
+        if node != exclude:
+            return node
+
+
+def _node_from_env():
+    value = os.environ["DENTAL_NODE_ID"]
+    try:
+        node = int(value)
+    except ValueError:
+        node = -1
+    if not 0 < node < 1 << NODE_BITS:
+        raise ValueError(f"DENTAL_NODE_ID must be 1-{(1 << NODE_BITS) - 1} "
+                         f"({MIGRATION_NODE} is kept for migrations), got {value!r}")
+    return node
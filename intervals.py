@@ -0,0 +1,43 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+def minutes(value):
+    """Minutes past midnight of a datetime.time"""
+    return value.hour * 60 + value.minute
+
+
+class DayIntervals:
+    """Booked [start, end) minute intervals of one dentist on one day.
+
+    Active bookings never overlap, so sorting by start also sorts by end and
+    a conflict check is two bisects: the first interval ending after start is
+    the only one that can overlap, and it does iff it starts before end.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            self.starts.append(start)
+            self.ends.append(end)
+
+    @classmethod
+    def from_booked(cls, booked):
+        """From a {time: duration_minutes} mapping as returned by get_booked_slots()"""
+        return cls((minutes(start), minutes(start) + duration) for start, duration in booked.items())
+
+    def __len__(self):
+        return len(self.starts)
+
+    def conflicts(self, start, end):
+        """True if [start, end) overlaps a booked interval"""
+        i = bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def add(self, start, end):
+        insort(self.starts, start)
+        insort(self.ends, end)
+
+    def remove(self, start, end):
+        del self.starts[bisect_left(self.starts, start)]
+        del self.ends[bisect_left(self.ends, end)]
@@ -0,0 +1,390 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, time
+from time import monotonic
+from heapq import nlargest
+
+from intervals import DayIntervals, minutes
+from text_index import TextIndex
+from storage import AppointmentStorage, normalize_email, BATCH_SIZE, DEFAULT_VIEW, ACTIVE_STATUSES, DEFAULT_DURATION, RESERVED, SLOT_TAKEN, DUPLICATE_ID, NOT_FOUND, STALE_WATERMARK, TOMBSTONE_RETENTION_SECONDS
+
+
+class InMemoryStorage(AppointmentStorage):
+    """Process-local backend for demos and tests - nothing is persisted.
+
+    Appointments are kept in a dict by uuid plus a list of
+    (date, time, appointment_id) keys kept sorted with bisect, so listing pages
+    are slices of that list. Active bookings are indexed per dentist-day as
+    sorted intervals, so conflict checks are a bisect. Reasons and patient
+    names go into an inverted index for full-text search. Watermarks are a
+    change counter.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.patients = {}  # normalize_email(email) -> [patient_id, name, gender, created_at, email]
+        self.appointments = {}  # uuid -> [appointment_id, patient key, date, time, dentist, status, reason, duration]
+        self.by_key = {}  # (date, time, appointment_id) -> uuid
+        self.keys = []  # sorted (date, time, appointment_id)
+        self.booked_at = {}  # uuid -> datetime
+        self.days = {}  # (dentist, date) -> DayIntervals of Pending/Confirmed bookings
+        self.text = TextIndex()  # uuid -> reason and patient name
+        self.updated = {}  # uuid -> change counter
+        self.tombstones = {}  # uuid -> (change counter, monotonic time), oldest first
+        self.purged = 0  # change counter up to which tombstones may have been purged
+        self.clock = 0
+        self.dentists = {}  # name -> active, in insertion order
+        self.hours = {}  # (dentist, weekday) -> (start, end)
+        self.breaks = []  # (dentist, weekday, start, end)
+        self.leave = {}  # (dentist, date) -> reason, dentist None for clinic holidays
+        self._next_patient = 0
+        self._next_appointment = 0
+
+    def add_patient(self, name, email, gender):
+        """Add new patient to database"""
+        with self.lock:
+            if normalize_email(email) in self.patients:
+                print(f"Error adding patient: duplicate email {email}")
+                return False
+            self._next_patient += 1
+            self.patients[normalize_email(email)] = [self._next_patient, name, gender, datetime.now(), email]
+            return True
+
+    def get_patient_by_email(self, email):
+        """Get patient ID from email"""
+        with self.lock:
+            patient = self.patients.get(normalize_email(email))
+            return (patient[0], patient[1]) if patient else None
+
+    def get_patients(self, after=None, limit=BATCH_SIZE):
+        """Get one keyset page of patients by patient_id"""
+        with self.lock:
+            # Ids are handed out in insertion order, which dicts keep
+            rows = [(patient[0], patient[1], patient[4]) for patient in self.patients.values()
+                    if patient[0] > (after or 0)]
+        return rows[:limit]
+
+    def find_patients(self, prefix, limit=10):
+        """Get patients whose name or email starts with prefix, ignoring case"""
+        prefix = prefix.casefold()
+        with self.lock:
+            rows = [(patient[1], patient[4]) for patient in self.patients.values()
+                    if patient[1].casefold().startswith(prefix) or patient[4].casefold().startswith(prefix)]
+        return sorted(rows, key=lambda row: row[0].casefold())[:limit]
+
+    def get_appointment_by_uuid(self, appointment_uuid):
+        """Get one appointment as a listing row, or None"""
+        with self.lock:
+            return self._row(appointment_uuid) if appointment_uuid in self.appointments else None
+
+    def get_appointment_details(self, appointment_uuid):
+        """Get the fields the listing leaves out - (reason, booked_at, gender, patient_created_at)"""
+        with self.lock:
+            appointment = self.appointments.get(appointment_uuid)
+            if appointment is None:
+                return None
+            gender, created_at = self.patients[appointment[1]][2:4]
+            return appointment[6], self.booked_at[appointment_uuid], gender, created_at
+
+    def reserve_appointment(self, name, email, gender, appointment_uuid, date, time, dentist, reason,
+                            duration=DEFAULT_DURATION):
+        """Upsert the patient and book duration minutes from time"""
+        with self.lock:
+            if appointment_uuid in self.appointments:
+                return DUPLICATE_ID
+            day = self.days.setdefault((dentist, date), DayIntervals())
+            if day.conflicts(minutes(time), minutes(time) + duration):
+                return SLOT_TAKEN
+            patient_key = normalize_email(email)
+            if patient_key not in self.patients:
+                self.add_patient(name, email, gender)
+            self._next_appointment += 1
+            appointment_id = self._next_appointment
+            self.appointments[appointment_uuid] = [appointment_id, patient_key, date, time, dentist, "Pending", reason,
+                                                   duration]
+            key = (date, time, appointment_id)
+            self.by_key[key] = appointment_uuid
+            insort(self.keys, key)
+            self.booked_at[appointment_uuid] = datetime.now()
+            self.text.add(appointment_uuid, reason, self.patients[patient_key][1])
+            day.add(minutes(time), minutes(time) + duration)
+            self._touch(appointment_uuid)
+            return RESERVED
+
+    def move_appointment(self, appointment_uuid, date, time, dentist, duration=DEFAULT_DURATION, reason=None):
+        """Move a booking to a new dentist/date/time, keeping its id"""
+        with self.lock:
+            appointment = self.appointments.get(appointment_uuid)
+            if appointment is None:
+                return NOT_FOUND
+            appointment_id, _, old_date, old_time, old_dentist, status, _, old_duration = appointment
+            old_day = self.days[(old_dentist, old_date)] if status in ACTIVE_STATUSES else None
+            if old_day is not None:
+                old_day.remove(minutes(old_time), minutes(old_time) + old_duration)
+            day = self.days.setdefault((dentist, date), DayIntervals())
+            if day.conflicts(minutes(time), minutes(time) + duration):
+                if old_day is not None:
+                    old_day.add(minutes(old_time), minutes(old_time) + old_duration)
+                return SLOT_TAKEN
+            day.add(minutes(time), minutes(time) + duration)
+
+            old_key = (old_date, old_time, appointment_id)
+            del self.by_key[old_key]
+            del self.keys[bisect_left(self.keys, old_key)]
+            key = (date, time, appointment_id)
+            self.by_key[key] = appointment_uuid
+            insort(self.keys, key)
+            appointment[2:6] = [date, time, dentist, "Pending"]
+            appointment[7] = duration
+            if reason is not None:
+                appointment[6] = reason
+                self.text.add(appointment_uuid, reason, self.patients[appointment[1]][1])
+            self._touch(appointment_uuid)
+            return RESERVED
+
+    def get_patient_appointments(self, email):
+        """Get one patient's appointments as listing rows, newest first"""
+        with self.lock:
+            rows = [self._row(u) for u, a in self.appointments.items() if a[1] == normalize_email(email)]
+        rows.sort(key=lambda row: (row[3], row[4], row[-1]), reverse=True)
+        return rows
+
+    def get_booked_slots(self, dentists, dates):
+        """Get booked times for many dentists/dates"""
+        dates = set(dates)
+        return self._booked(dentists, lambda day: day in dates)
+
+    def get_booked_range(self, dentists, start, end):
+        """Get booked times for many dentists over a date range"""
+        return self._booked(dentists, lambda day: start <= day <= end)
+
+    def check_slot_available(self, dentist, date, time, duration=DEFAULT_DURATION):
+        """Check if duration minutes from time are free"""
+        with self.lock:
+            day = self.days.get((dentist, date))
+            return day is None or not day.conflicts(minutes(time), minutes(time) + duration)
+
+    def update_appointment_status(self, appointment_uuid, status):
+        """Update appointment status"""
+        with self.lock:
+            appointment = self.appointments.get(appointment_uuid)
+            if appointment is None:
+                return True  # like an UPDATE matching no rows
+            _, _, date, time, dentist, current, _, duration = appointment
+            interval = (minutes(time), minutes(time) + duration)
+            day = self.days.setdefault((dentist, date), DayIntervals())
+            if status in ACTIVE_STATUSES and current not in ACTIVE_STATUSES:
+                if day.conflicts(*interval):
+                    print("Error updating status: slot already booked")
+                    return False
+                day.add(*interval)
+            elif status not in ACTIVE_STATUSES and current in ACTIVE_STATUSES:
+                day.remove(*interval)
+            appointment[5] = status
+            self._touch(appointment_uuid)
+            return True
+
+    def update_appointments_status(self, appointment_uuids, status):
+        """Update many appointments' status, all or nothing - [(uuid, dentist, date, time)] updated"""
+        with self.lock:
+            updated, previous = [], []
+            for appointment_uuid in dict.fromkeys(appointment_uuids):
+                appointment = self.appointments.get(appointment_uuid)
+                if appointment is None:
+                    continue
+                current = appointment[5]
+                if not self.update_appointment_status(appointment_uuid, status):
+                    # Put back what this batch already changed
+                    for undo_uuid, undo_status in reversed(previous):
+                        self.update_appointment_status(undo_uuid, undo_status)
+                    return False
+                previous.append((appointment_uuid, current))
+                updated.append((appointment_uuid, appointment[4], appointment[2], appointment[3]))
+            return updated
+
+    def delete_appointments(self, appointment_uuids):
+        """Delete many appointments - [(uuid, dentist, date, time)] deleted"""
+        with self.lock:
+            deleted = []
+            for appointment_uuid in dict.fromkeys(appointment_uuids):
+                if appointment_uuid in self.appointments:
+                    _, _, date, time, dentist, _, _, _ = self.appointments[appointment_uuid]
+                    deleted.append((appointment_uuid, dentist, date, time))
+                    self._delete(appointment_uuid)
+            return deleted
+
+    def delete_appointment_by_email(self, email):
+        """Delete patient's appointments by email - [(uuid, dentist, date, time)] deleted"""
+        email = normalize_email(email)
+        with self.lock:
+            if email not in self.patients:
+                return False
+            deleted = []
+            for appointment_uuid in [u for u, a in self.appointments.items() if a[1] == email]:
+                _, _, date, time, dentist, _, _, _ = self.appointments[appointment_uuid]
+                deleted.append((appointment_uuid, dentist, date, time))
+                self._delete(appointment_uuid)
+            return deleted
+
+    def delete_appointment_by_uuid(self, appointment_uuid):
+        """Delete specific appointment by UUID"""
+        with self.lock:
+            if appointment_uuid in self.appointments:
+                self._delete(appointment_uuid)
+            return True
+
+    def count_appointments(self, view=None):
+        """Count all appointments, or those passing view's filters"""
+        with self.lock:
+            if view is None or not view.filtered:
+                return len(self.appointments)
+            return sum(1 for u in self.appointments if view.matches(self._row(u)))
+
+    def get_appointments_page(self, after=None, limit=50, before=None, view=None):
+        """Get one keyset page of appointments in view's order (default newest first)
+
+        The default view slices the sorted key list; any other filters and
+        sorts a snapshot first - there are no indexes to push it down to.
+        """
+        view = view or DEFAULT_VIEW
+        with self.lock:
+            if view == DEFAULT_VIEW:
+                keys = self.keys
+                row_of = lambda key: self._row(self.by_key[key])
+            else:
+                by_key = {view.order_key(view.cursor(row)): row
+                          for row in map(self._row, self.appointments) if view.matches(row)}
+                keys = sorted(by_key)
+                row_of = by_key.__getitem__
+                after = after and view.order_key(after)
+                before = before and view.order_key(before)
+
+            # keys ascend; a descending view reads them backwards
+            if view.descending:
+                if after is not None:
+                    end = bisect_left(keys, tuple(after))
+                    start = max(end - limit, 0)
+                elif before is not None:
+                    start = bisect_right(keys, tuple(before))
+                    end = min(start + limit, len(keys))
+                else:
+                    end = len(keys)
+                    start = max(end - limit, 0)
+                return [row_of(key) for key in reversed(keys[start:end])]
+            if after is not None:
+                start = bisect_right(keys, tuple(after))
+                end = min(start + limit, len(keys))
+            elif before is not None:
+                end = bisect_left(keys, tuple(before))
+                start = max(end - limit, 0)
+            else:
+                start, end = 0, min(limit, len(keys))
+            return [row_of(key) for key in keys[start:end]]
+
+    def search_appointments(self, query, limit=20, offset=0):
+        """Full-text search over reasons and patient names, best match first"""
+        with self.lock:
+            scores = self.text.search(query)
+            rows = [self._row(u) for u in scores]
+        # Only the rows up to the end of the page need ordering
+        return nlargest(offset + limit, rows, key=lambda row: (scores[row[0]], row[3], row[4], row[-1]))[offset:]
+
+    def get_changes_since(self, watermark=None):
+        """Get appointments changed and ids deleted since a watermark"""
+        with self.lock:
+            cutoff = monotonic() - TOMBSTONE_RETENTION_SECONDS
+            while self.tombstones:
+                oldest = next(iter(self.tombstones))
+                tick, deleted_at = self.tombstones[oldest]
+                if deleted_at >= cutoff:
+                    break
+                del self.tombstones[oldest]
+                self.purged = tick
+            if watermark is None:
+                return [], [], self.clock
+            if watermark < self.purged:
+                return STALE_WATERMARK
+            changed = [self._row(u) for u, tick in self.updated.items() if tick > watermark]
+            deleted = [u for u, (tick, _) in self.tombstones.items() if tick > watermark]
+            return changed, deleted, self.clock
+
+    def get_roster(self):
+        """Get active dentists with their weekly hours and breaks"""
+        with self.lock:
+            dentists = [name for name, active in self.dentists.items() if active]
+            hours = [(dentist, weekday, start, end) for (dentist, weekday), (start, end) in self.hours.items()
+                     if self.dentists.get(dentist)]
+            breaks = [entry for entry in self.breaks if self.dentists.get(entry[0])]
+            return dentists, hours, breaks
+
+    def get_leave(self):
+        """Get leave days, dentist None for clinic holidays"""
+        with self.lock:
+            return list(self.leave)
+
+    def add_dentist(self, name):
+        """Add a dentist, or re-activate one"""
+        with self.lock:
+            self.dentists[name] = True
+            return True
+
+    def set_working_hours(self, dentist, weekday, start, end):
+        """Set a dentist's hours for a weekday; start None makes it a day off"""
+        with self.lock:
+            if dentist not in self.dentists:
+                return True  # like an INSERT ... SELECT matching no dentist
+            if start is None:
+                self.hours.pop((dentist, weekday), None)
+            else:
+                self.hours[(dentist, weekday)] = (start, end)
+            return True
+
+    def add_break(self, dentist, weekday, start, end):
+        """Add a recurring break to a dentist's weekday"""
+        with self.lock:
+            if dentist in self.dentists:
+                self.breaks.append((dentist, weekday, start, end))
+            return True
+
+    def set_leave(self, dentist, day, on_leave=True, reason=""):
+        """Record or clear a leave day; dentist None is a clinic holiday"""
+        with self.lock:
+            if not on_leave:
+                self.leave.pop((dentist, day), None)
+            elif dentist is None or dentist in self.dentists:
+                self.leave.setdefault((dentist, day), reason)
+            return True
+
+    def _touch(self, appointment_uuid):
+        self.clock += 1
+        self.updated[appointment_uuid] = self.clock
+        self.tombstones.pop(appointment_uuid, None)
+
+    def _booked(self, dentists, wanted):
+        booked = {}
+        dentists = set(dentists)
+        with self.lock:
+            for (dentist, date), day in self.days.items():
+                if day and dentist in dentists and wanted(date):
+                    # Bookings don't overlap, so the i-th start and i-th end belong together
+                    booked[(dentist, date)] = {time(start // 60, start % 60): end - start
+                                               for start, end in zip(day.starts, day.ends)}
+        return booked
+
+    def _delete(self, appointment_uuid):
+        appointment_id, _, date, time, dentist, status, _, duration = self.appointments.pop(appointment_uuid)
+        key = (date, time, appointment_id)
+        del self.by_key[key]
+        del self.keys[bisect_left(self.keys, key)]
+        if status in ACTIVE_STATUSES:
+            self.days[(dentist, date)].remove(minutes(time), minutes(time) + duration)
+        self.updated.pop(appointment_uuid, None)
+        self.booked_at.pop(appointment_uuid, None)
+        self.text.remove(appointment_uuid)
+        self.clock += 1
+        self.tombstones[appointment_uuid] = (self.clock, monotonic())
+
+    def _row(self, appointment_uuid):
+        appointment_id, patient_key, date, time, dentist, status, _, duration = self.appointments[appointment_uuid]
+        _, name, _, _, email = self.patients[patient_key]
+        return (appointment_uuid, name, email, date, time, dentist, status, duration, appointment_id)
@@ -0,0 +1,85 @@
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+
+def normalize(text):
+    """Case- and accent-insensitive form of text, for prefix matching"""
+    text = " ".join(text.split()).casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def word_suffixes(text):
+    """text and every tail of it starting at a word, so "Ana de Leon" is found by "leon" too"""
+    words = text.split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """Values looked up by any prefix of their keys, as you type.
+
+    Does a trie's job with a sorted list of (key, value) pairs: one bisect
+    finds the first key at or after the prefix and the matches are the run
+    that follows, so a lookup is O(log n + k) over flat tuples rather than a
+    node per character. Keys are normalize()d; a value can have several.
+    """
+
+    def __init__(self):
+        self._entries = []  # sorted (key, value)
+        self._keys = {}  # value -> its keys
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+    def __contains__(self, value):
+        with self._lock:
+            return value in self._keys
+
+    def add(self, value, keys):
+        """Index value under keys, replacing the keys it had"""
+        keys = {normalize(key) for key in keys} - {""}
+        with self._lock:
+            self._remove(value)
+            for key in keys:
+                insort(self._entries, (key, value))
+            self._keys[value] = keys
+
+    def add_many(self, items):
+        """add() for many (value, keys) at once - one sort instead of an insort per key"""
+        items = {value: {normalize(key) for key in keys} - {""} for value, keys in items}
+        with self._lock:
+            for value in items:
+                self._remove(value)
+            for value, keys in items.items():
+                self._entries.extend((key, value) for key in keys)
+                self._keys[value] = keys
+            self._entries.sort()
+
+    def remove(self, value):
+        with self._lock:
+            self._remove(value)
+
+    def search(self, prefix, limit=10):
+        """Up to limit distinct values with a key starting with prefix, in key order"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found = {}
+        with self._lock:
+            i = bisect_left(self._entries, (prefix,))
+            while i < len(self._entries) and len(found) < limit:
+                key, value = self._entries[i]
+                if not key.startswith(prefix):
+                    break
+                found.setdefault(value)
+                i += 1
+        return list(found)
+
+    def _remove(self, value):
+        for key in self._keys.pop(value, ()):
+            del self._entries[bisect_left(self._entries, (key, value))]
@@ -0,0 +1,80 @@
+from datetime import time
+
+from intervals import minutes
+from schedule import SlotGrid
+
+# Seeded into an empty roster - the clinic's original line-up and hours
+DEFAULT_DENTISTS = [
+    "Dr. Jhunsoy Love Jun",
+    "Dr. Jograd Ballesteros",
+    "Dr. Beyoncé Calubaquib",
+    "Dr. Estanislao Manansala",
+    "Dr. Federico Liwanag VII",
+    "Dr. Vergamino Antiporda",
+    "Dr. Princess Payapa Pamplona"
+]
+DEFAULT_HOURS = [(weekday, time(8, 0), time(18, 0)) for weekday in range(6)]  # Monday-Saturday
+DEFAULT_BREAKS = [(weekday, time(12, 0), time(13, 0)) for weekday in range(6)]  # lunch
+
+
+def _clock(offset):
+    return time(offset // 60, offset % 60)
+
+
+class Roster:
+    """Dentists, weekly working hours, breaks and leave compiled to slot masks.
+
+    Each dentist's weekday template (hours minus breaks) is compiled once into
+    a SlotGrid mask. working_mask() applies leave and clinic holidays on top
+    with two set lookups, so nothing is kept per date - scanning months ahead
+    for a free slot doesn't grow memory, and leave changes need no invalidation.
+    """
+
+    def __init__(self, dentists, hours, breaks, leave=(), slot_minutes=30):
+        self.dentists = list(dentists)
+        self.slot_minutes = slot_minutes
+
+        # Cells anyone works in, as minute offsets - the bookable time slots
+        working = {}  # (dentist, weekday) -> {offset}
+        for dentist, weekday, start, end in hours:
+            cells = working.setdefault((dentist, weekday), set())
+            offset = minutes(start)
+            while offset + slot_minutes <= minutes(end):
+                cells.add(offset)
+                offset += slot_minutes
+        for dentist, weekday, start, end in breaks:
+            cells = working.get((dentist, weekday), set())
+            cells.difference_update({offset for offset in list(cells)
+                                     if offset < minutes(end) and offset + slot_minutes > minutes(start)})
+
+        self.time_slots = [_clock(offset) for offset in sorted(set().union(*working.values()))]
+        self.grid = SlotGrid(self.time_slots, slot_minutes)
+        self._templates = {key: self.grid.mask([_clock(offset) for offset in cells])
+                           for key, cells in working.items()}
+
+        self._leave = set()  # (dentist, date)
+        self._holidays = set()  # dates the whole clinic is closed
+        for dentist, day in leave:
+            if dentist is None:
+                self._holidays.add(day)
+            else:
+                self._leave.add((dentist, day))
+
+    def working_mask(self, dentist, day):
+        """Cells the dentist works on that date (0 on leave, holidays and days off)"""
+        if day in self._holidays or (dentist, day) in self._leave:
+            return 0
+        return self._templates.get((dentist, day.weekday()), 0)
+
+    def is_working(self, dentist, day, start, duration):
+        """True if the dentist works the whole of duration minutes from start"""
+        bit = self.grid.bit(start)
+        return bool(bit and self.grid.fits(self.working_mask(dentist, day), duration) & bit)
+
+    def set_leave(self, dentist, day, on_leave=True):
+        """Record (or clear) leave - dentist None is a clinic holiday. working_mask() sees it at once"""
+        target, key = (self._holidays, day) if dentist is None else (self._leave, (dentist, day))
+        if on_leave:
+            target.add(key)
+        else:
+            target.discard(key)
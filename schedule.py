@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right
+from datetime import time, timedelta
+
+from intervals import minutes as _minutes
+
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+
+class SlotGrid:
+    """The clinic's bookable slots as bit positions.
+
+    Slot i is the slot_minutes-long cell starting at the i-th start time
+    (minutes past midnight), so a dentist-day is one int whose set bits are
+    occupied (or free) cells. Times that aren't on the grid map to no bit.
+    """
+
+    def __init__(self, slots, slot_minutes=30):
+        self.slot_minutes = slot_minutes
+        self.offsets = sorted({_minutes(slot) for slot in slots})
+        self._bits = {offset: 1 << i for i, offset in enumerate(self.offsets)}
+        self.full = (1 << len(self.offsets)) - 1
+        # Bit i set when cell i+1 starts right as cell i ends (no lunch break between)
+        self._adjacent = 0
+        for i in range(len(self.offsets) - 1):
+            if self.offsets[i + 1] == self.offsets[i] + slot_minutes:
+                self._adjacent |= 1 << i
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def bit(self, slot):
+        """Bit for a start time, 0 if it isn't a slot"""
+        return self._bits.get(_minutes(slot), 0)
+
+    def mask(self, slots):
+        mask = 0
+        for slot in slots:
+            mask |= self.bit(slot)
+        return mask
+
+    def occupied(self, booked):
+        """Mask of the cells overlapped by {start time: duration_minutes} bookings"""
+        mask = 0
+        for start, duration in booked.items():
+            start = _minutes(start)
+            first = bisect_right(self.offsets, start - self.slot_minutes)
+            last = bisect_left(self.offsets, start + duration)
+            mask |= ((1 << last) - 1) & ~((1 << first) - 1)
+        return mask
+
+    def fits(self, free, duration):
+        """Mask of the start cells where duration minutes fit in free, without a break"""
+        cells = -(-duration // self.slot_minutes)
+        starts, chain = free, self.full
+        for j in range(1, cells):
+            starts &= free >> j
+            chain &= self._adjacent >> (j - 1)
+        return starts & chain
+
+    def times(self, mask):
+        """Start times of the set bits, earliest first"""
+        result = []
+        while mask:
+            low = mask & -mask
+            offset = self.offsets[low.bit_length() - 1]
+            result.append(time(offset // 60, offset % 60))
+            mask ^= low
+        return result
+
+    def first(self, mask):
+        """Earliest start time in mask, or None"""
+        if not mask:
+            return None
+        offset = self.offsets[(mask & -mask).bit_length() - 1]
+        return time(offset // 60, offset % 60)
+
+    def from_time(self, slot):
+        """Mask of the slots starting at or after slot"""
+        return self.full & ~((1 << bisect_left(self.offsets, _minutes(slot))) - 1)
+
+
+class Schedule:
+    """Occupied-cell bitmasks for a set of dentists over a date range.
+
+    Built from one bulk query; every question after that is bit arithmetic.
+    duration (minutes, default one cell) asks where a longer service fits.
+    """
+
+    def __init__(self, grid, dentists, start, end, booked, working=None):
+        self.grid = grid
+        self.dentists = list(dentists)
+        self.start = start
+        self.end = end
+        self.booked = booked  # (dentist, date) -> mask of occupied cells
+        self.working = working or (lambda dentist, day: grid.full)  # (dentist, date) -> mask of working cells
+
+    def days(self):
+        day = self.start
+        while day <= self.end:
+            yield day
+            day += timedelta(days=1)
+
+    def free_mask(self, dentist, day, duration=None):
+        """Mask of the start cells free for duration minutes"""
+        free = self.working(dentist, day) & ~self.booked.get((dentist, day), 0)
+        if duration is None:
+            return free
+        return self.grid.fits(free, duration)
+
+    def free_slots(self, dentist, day, duration=None):
+        return self.grid.times(self.free_mask(dentist, day, duration))
+
+    def is_free(self, dentist, day, slot, duration=None):
+        return bool(self.free_mask(dentist, day, duration) & self.grid.bit(slot))
+
+    def first_free(self, dentist, day, after=None, duration=None):
+        """Earliest free start time that day (at or after after), or None"""
+        mask = self.free_mask(dentist, day, duration)
+        if after is not None:
+            mask &= self.grid.from_time(after)
+        return self.grid.first(mask)
+
+    def common_free(self, dentists, day, duration=None):
+        """Start times free for every one of dentists"""
+        mask = self.grid.full
+        for dentist in dentists:
+            mask &= self.free_mask(dentist, day, duration)
+        return self.grid.times(mask)
+
+    def any_free(self, dentists, day, duration=None):
+        """Start times at which at least one of dentists is free"""
+        mask = 0
+        for dentist in dentists:
+            mask |= self.free_mask(dentist, day, duration)
+        return self.grid.times(mask)
+
+    def occupancy(self, dentist, day):
+        """Number of occupied cells that day"""
+        return _popcount(self.booked.get((dentist, day), 0) & self.grid.full)
+
+    def free_count(self, dentist, day):
+        """Number of free working cells that day"""
+        return _popcount(self.free_mask(dentist, day))
+
+    def days_with_free(self, dentist, duration=None):
+        """Dates in the range where the dentist has room for duration minutes"""
+        return [day for day in self.days() if self.free_mask(dentist, day, duration)]
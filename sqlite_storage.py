@@ -0,0 +1,714 @@
+import sqlite3
+import threading
+from datetime import date, datetime, time
+
+from intervals import DayIntervals, minutes
+from ids import IdGenerator, MIGRATION_NODE
+from text_index import tokenize
+from storage import (AppointmentStorage, chunks, like_prefix, listing_clauses, normalize_email, BATCH_SIZE, DEFAULT_VIEW, DEFAULT_DURATION, RESERVED, SLOT_TAKEN, RESERVE_FAILED, DUPLICATE_ID,
+                     NOT_FOUND, ACTIVE_STATUSES, STALE_WATERMARK, TOMBSTONE_RETENTION_SECONDS)
+
+# updated_at/deleted_at values - sortable text with millisecond precision
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS patients (
+        patient_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        email_normalized TEXT NOT NULL,
+        gender TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS appointments (
+        appointment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        appointment_uuid TEXT UNIQUE NOT NULL,
+        legacy_uuid TEXT,
+        patient_id INTEGER NOT NULL REFERENCES patients(patient_id) ON DELETE CASCADE,
+        appointment_date TEXT NOT NULL,
+        appointment_time TEXT NOT NULL,
+        duration_minutes INTEGER NOT NULL DEFAULT 30,
+        dentist TEXT NOT NULL,
+        status TEXT DEFAULT 'Pending',
+        reason_for_visit TEXT,
+        booked_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT NOT NULL DEFAULT ({_NOW})
+    );
+
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_active_slot
+        ON appointments (dentist, appointment_date, appointment_time)
+        WHERE status IN ('Pending', 'Confirmed');
+    CREATE INDEX IF NOT EXISTS idx_date_time ON appointments (appointment_date, appointment_time);
+    CREATE INDEX IF NOT EXISTS idx_status_date ON appointments (status, appointment_date, appointment_time);
+    CREATE INDEX IF NOT EXISTS idx_dentist_date ON appointments (dentist, appointment_date, appointment_time);
+    -- LIKE is case-insensitive, so prefix searches need NOCASE indexes to seek
+    CREATE INDEX IF NOT EXISTS idx_name ON patients (name COLLATE NOCASE);
+    CREATE INDEX IF NOT EXISTS idx_email_nocase ON patients (email COLLATE NOCASE);
+    CREATE INDEX IF NOT EXISTS idx_patient ON appointments (patient_id);
+    CREATE INDEX IF NOT EXISTS idx_updated_at ON appointments (updated_at);
+
+    -- Full-text index over visit reasons and patient names, rowid = appointment_id,
+    -- kept in step with both tables by triggers
+    CREATE VIRTUAL TABLE IF NOT EXISTS appointment_search USING fts5(reason, name);
+    CREATE TRIGGER IF NOT EXISTS search_insert AFTER INSERT ON appointments BEGIN
+        INSERT INTO appointment_search (rowid, reason, name)
+        SELECT new.appointment_id, new.reason_for_visit, name FROM patients WHERE patient_id = new.patient_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_update AFTER UPDATE OF reason_for_visit, patient_id ON appointments BEGIN
+        UPDATE appointment_search
+        SET reason = new.reason_for_visit, name = (SELECT name FROM patients WHERE patient_id = new.patient_id)
+        WHERE rowid = new.appointment_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_delete AFTER DELETE ON appointments BEGIN
+        DELETE FROM appointment_search WHERE rowid = old.appointment_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_rename AFTER UPDATE OF name ON patients BEGIN
+        UPDATE appointment_search SET name = new.name
+        WHERE rowid IN (SELECT appointment_id FROM appointments WHERE patient_id = new.patient_id);
+    END;
+
+    CREATE TABLE IF NOT EXISTS appointment_tombstones (
+        appointment_uuid TEXT PRIMARY KEY,
+        deleted_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_deleted_at ON appointment_tombstones (deleted_at);
+
+    CREATE TABLE IF NOT EXISTS dentists (
+        dentist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        active INTEGER NOT NULL DEFAULT 1
+    );
+
+    CREATE TABLE IF NOT EXISTS dentist_hours (
+        dentist_id INTEGER NOT NULL REFERENCES dentists(dentist_id) ON DELETE CASCADE,
+        weekday INTEGER NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        PRIMARY KEY (dentist_id, weekday)
+    );
+
+    CREATE TABLE IF NOT EXISTS dentist_breaks (
+        break_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dentist_id INTEGER NOT NULL REFERENCES dentists(dentist_id) ON DELETE CASCADE,
+        weekday INTEGER NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_break_dentist ON dentist_breaks (dentist_id, weekday);
+
+    CREATE TABLE IF NOT EXISTS dentist_leave (
+        dentist_id INTEGER NOT NULL REFERENCES dentists(dentist_id) ON DELETE CASCADE,
+        leave_date TEXT NOT NULL,
+        reason TEXT,
+        PRIMARY KEY (dentist_id, leave_date)
+    );
+
+    CREATE TABLE IF NOT EXISTS clinic_holidays (
+        holiday_date TEXT PRIMARY KEY,
+        name TEXT
+    );
+"""
+
+_LISTING = """
+    SELECT a.appointment_uuid, p.name, p.email, a.appointment_date,
+           a.appointment_time, a.dentist, a.status, a.duration_minutes, a.appointment_id
+    FROM appointments a
+    JOIN patients p ON a.patient_id = p.patient_id
+"""
+
+_TOMBSTONE_INSERT = f"""
+    INSERT OR REPLACE INTO appointment_tombstones (appointment_uuid, deleted_at)
+    SELECT appointment_uuid, {_NOW} FROM appointments
+"""
+
+
+def _day(value):
+    return value.isoformat()
+
+
+def _clock(value):
+    return value.strftime("%H:%M:%S")
+
+
+def _listing_row(row):
+    return row[:3] + (date.fromisoformat(row[3]), time.fromisoformat(row[4])) + row[5:]
+
+
+class SQLiteStorage(AppointmentStorage):
+    """Embedded SQLite backend - a file for single-chair clinics, ":memory:" for tests.
+
+    One connection is shared by every thread behind a lock; SQLite serialises
+    writers anyway, and this keeps ":memory:" databases visible to all of them.
+    """
+
+    def __init__(self, path="dental_clinic.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            if path != ":memory:":
+                self.conn.execute("PRAGMA journal_mode = WAL")
+            searchable = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'appointment_search'").fetchone()
+            self.conn.executescript(_SCHEMA)
+            # Files created before services had durations
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(appointments)")]
+            if "duration_minutes" not in columns:
+                self.conn.execute("ALTER TABLE appointments ADD COLUMN duration_minutes INTEGER NOT NULL DEFAULT 30")
+            if "legacy_uuid" not in columns:
+                self.conn.execute("ALTER TABLE appointments ADD COLUMN legacy_uuid TEXT")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_legacy_uuid ON appointments (legacy_uuid)")
+            self._migrate_ids()
+            self._migrate_emails()
+            if not searchable:
+                # Files created before full-text search - index the rows already there
+                with self.conn:
+                    self.conn.execute("""
+                        INSERT INTO appointment_search (rowid, reason, name)
+                        SELECT a.appointment_id, a.reason_for_visit, p.name
+                        FROM appointments a JOIN patients p ON a.patient_id = p.patient_id
+                    """)
+
+    def _migrate_ids(self):
+        """Re-key rows still carrying a random 8-character id with time-ordered ones, oldest first
+
+        The old id is kept in legacy_uuid, so the rows are skipped on the next
+        start and lookups by the old id still find them.
+        """
+        rows = self.conn.execute("""
+            SELECT appointment_id, CAST(strftime('%s', COALESCE(booked_at, 'now')) AS INTEGER) FROM appointments
+            WHERE legacy_uuid IS NULL AND length(appointment_uuid) <> 10
+            ORDER BY booked_at, appointment_id
+        """).fetchall()
+        if not rows:
+            return
+        generator = IdGenerator(MIGRATION_NODE)
+        with self.conn:
+            self.conn.executemany("""
+                UPDATE appointments SET legacy_uuid = appointment_uuid, appointment_uuid = ?
+                WHERE appointment_id = ?
+            """, [(generator.next(booked), appointment_id) for appointment_id, booked in rows])
+
+    def _migrate_emails(self, batch_size=BATCH_SIZE):
+        """Fill email_normalized on files created before it, merge the duplicates it exposes, then make it UNIQUE
+
+        Each batch commits on its own so other threads get the lock in between.
+        """
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'uq_email_normalized'").fetchone():
+            return
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(patients)")]
+        if "email_normalized" not in columns:
+            self.conn.execute("ALTER TABLE patients ADD COLUMN email_normalized TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_email_normalized ON patients (email_normalized)")
+        while True:
+            rows = self.conn.execute("SELECT patient_id, email FROM patients WHERE email_normalized IS NULL LIMIT ?",
+                                     (batch_size,)).fetchall()
+            if not rows:
+                break
+            with self.conn:
+                self.conn.executemany("UPDATE patients SET email_normalized = ? WHERE patient_id = ?",
+                                      [(normalize_email(email), patient_id) for patient_id, email in rows])
+
+        last = ""
+        while True:
+            groups = [row[0] for row in self.conn.execute("""
+                SELECT email_normalized FROM patients WHERE email_normalized > ?
+                GROUP BY email_normalized HAVING COUNT(*) > 1
+                ORDER BY email_normalized LIMIT ?
+            """, (last, batch_size))]
+            if not groups:
+                break
+            last = groups[-1]
+            # The oldest patient of each group keeps its appointments and gains the others'
+            keep, merges = {}, []
+            for patient_id, email in self.conn.execute(f"""
+                SELECT patient_id, email_normalized FROM patients
+                WHERE email_normalized IN ({", ".join("?" * len(groups))}) ORDER BY patient_id
+            """, groups):
+                if email in keep:
+                    merges.append((keep[email], patient_id))
+                else:
+                    keep[email] = patient_id
+            with self.conn:
+                self.conn.executemany(f"""
+                    UPDATE appointments SET patient_id = ?, updated_at = {_NOW} WHERE patient_id = ?
+                """, merges)
+                self.conn.executemany("DELETE FROM patients WHERE patient_id = ?",
+                                      [(duplicate,) for _, duplicate in merges])
+
+        with self.conn:
+            self.conn.execute("CREATE UNIQUE INDEX uq_email_normalized ON patients (email_normalized)")
+            self.conn.execute("DROP INDEX idx_email_normalized")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def add_patient(self, name, email, gender):
+        """Add new patient to database"""
+        try:
+            with self.lock, self.conn:
+                self.conn.execute("INSERT INTO patients (name, email, email_normalized, gender) VALUES (?, ?, ?, ?)",
+                                  (name, email, normalize_email(email), gender))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error adding patient: {e}")
+            return False
+
+    def get_patient_by_email(self, email):
+        """Get patient ID from email"""
+        with self.lock:
+            return self.conn.execute("SELECT patient_id, name FROM patients WHERE email_normalized = ?",
+                                     (normalize_email(email),)).fetchone()
+
+    def get_patients(self, after=None, limit=BATCH_SIZE):
+        """Get one keyset page of patients by patient_id"""
+        with self.lock:
+            return self.conn.execute("""
+                SELECT patient_id, name, email FROM patients
+                WHERE patient_id > ? ORDER BY patient_id LIMIT ?
+            """, (after or 0, limit)).fetchall()
+
+    def find_patients(self, prefix, limit=10):
+        """Get patients whose name or email starts with prefix, through the NOCASE indexes"""
+        pattern = like_prefix(prefix)
+        with self.lock:
+            return self.conn.execute("""
+                SELECT name, email FROM (
+                    SELECT name, email FROM patients WHERE name LIKE ? ESCAPE '!'
+                    ORDER BY name COLLATE NOCASE LIMIT ?)
+                UNION
+                SELECT name, email FROM (
+                    SELECT name, email FROM patients WHERE email LIKE ? ESCAPE '!'
+                    ORDER BY email COLLATE NOCASE LIMIT ?)
+                ORDER BY name COLLATE NOCASE
+                LIMIT ?
+            """, (pattern, limit, pattern, limit, limit)).fetchall()
+
+    def get_appointment_by_uuid(self, appointment_uuid):
+        """Get one appointment as a listing row, or None - also by the id it had before re-keying"""
+        with self.lock:
+            row = self.conn.execute(f"{_LISTING} WHERE a.appointment_uuid = ? OR a.legacy_uuid = ?",
+                                    (appointment_uuid, appointment_uuid)).fetchone()
+        return _listing_row(row) if row else None
+
+    def get_appointment_details(self, appointment_uuid):
+        """Get the columns the listing leaves out - (reason, booked_at, gender, patient_created_at)"""
+        try:
+            with self.lock:
+                row = self.conn.execute("""
+                    SELECT a.reason_for_visit, a.booked_at, p.gender, p.created_at
+                    FROM appointments a
+                    JOIN patients p ON a.patient_id = p.patient_id
+                    WHERE a.appointment_uuid = ? OR a.legacy_uuid = ?
+                """, (appointment_uuid, appointment_uuid)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error fetching appointment details: {e}")
+            return None
+        if not row:
+            return None
+        reason, booked_at, gender, created_at = row
+        return (reason, booked_at and datetime.fromisoformat(booked_at), gender,
+                created_at and datetime.fromisoformat(created_at))
+
+    def reserve_appointment(self, name, email, gender, appointment_uuid, date, time, dentist, reason,
+                            duration=DEFAULT_DURATION):
+        """Upsert the patient and book duration minutes from time in one transaction"""
+        try:
+            with self.lock, self.conn:
+                self.conn.execute("""
+                    INSERT OR IGNORE INTO patients (name, email, email_normalized, gender) VALUES (?, ?, ?, ?)
+                """, (name, email, normalize_email(email), gender))
+                patient_id = self.conn.execute("SELECT patient_id FROM patients WHERE email_normalized = ?",
+                                               (normalize_email(email),)).fetchone()[0]
+                # Every writer holds self.lock, so nothing can book between check and insert
+                if self._day_intervals(dentist, date).conflicts(minutes(time), minutes(time) + duration):
+                    return SLOT_TAKEN
+                self.conn.execute("""
+                    INSERT INTO appointments
+                    (patient_id, appointment_uuid, appointment_date, appointment_time, duration_minutes,
+                     dentist, status, reason_for_visit)
+                    VALUES (?, ?, ?, ?, ?, ?, 'Pending', ?)
+                """, (patient_id, appointment_uuid, _day(date), _clock(time), duration, dentist, reason))
+            return RESERVED
+        except sqlite3.IntegrityError as e:
+            if "appointments.dentist" in str(e):
+                return SLOT_TAKEN
+            if "appointments.appointment_uuid" in str(e):
+                return DUPLICATE_ID
+            print(f"Error reserving appointment: {e}")
+            return RESERVE_FAILED
+        except sqlite3.Error as e:
+            print(f"Error reserving appointment: {e}")
+            return RESERVE_FAILED
+
+    def move_appointment(self, appointment_uuid, date, time, dentist, duration=DEFAULT_DURATION, reason=None):
+        """Move a booking to a new dentist/date/time in one transaction, keeping its id"""
+        try:
+            with self.lock, self.conn:
+                row = self.conn.execute("SELECT appointment_id FROM appointments WHERE appointment_uuid = ?",
+                                        (appointment_uuid,)).fetchone()
+                if not row:
+                    return NOT_FOUND
+                if self._day_intervals(dentist, date, exclude=row[0]).conflicts(minutes(time),
+                                                                               minutes(time) + duration):
+                    return SLOT_TAKEN
+                self.conn.execute(f"""
+                    UPDATE appointments
+                    SET dentist = ?, appointment_date = ?, appointment_time = ?, duration_minutes = ?,
+                        status = 'Pending', reason_for_visit = COALESCE(?, reason_for_visit), updated_at = {_NOW}
+                    WHERE appointment_id = ?
+                """, (dentist, _day(date), _clock(time), duration, reason, row[0]))
+            return RESERVED
+        except sqlite3.IntegrityError as e:
+            if "appointments.dentist" in str(e):
+                return SLOT_TAKEN
+            print(f"Error moving appointment: {e}")
+            return RESERVE_FAILED
+        except sqlite3.Error as e:
+            print(f"Error moving appointment: {e}")
+            return RESERVE_FAILED
+
+    def get_patient_appointments(self, email):
+        """Get one patient's appointments as listing rows, newest first"""
+        try:
+            with self.lock:
+                rows = self.conn.execute(f"""
+                    {_LISTING}
+                    WHERE p.email_normalized = ?
+                    ORDER BY a.appointment_date DESC, a.appointment_time DESC, a.appointment_id DESC
+                """, (normalize_email(email),)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching appointments: {e}")
+            return None
+        return [_listing_row(row) for row in rows]
+
+    def get_booked_slots(self, dentists, dates):
+        """Get booked times for many dentists/dates in a single query"""
+        dentists = list(dict.fromkeys(dentists))
+        days = list(dict.fromkeys(_day(d) for d in dates))
+        if not dentists or not days:
+            return {}
+
+        try:
+            with self.lock:
+                rows = self.conn.execute(f"""
+                    SELECT dentist, appointment_date, appointment_time, duration_minutes FROM appointments
+                    WHERE dentist IN ({", ".join("?" * len(dentists))})
+                    AND appointment_date IN ({", ".join("?" * len(days))})
+                    AND status IN ('Pending', 'Confirmed')
+                """, (*dentists, *days)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching booked slots: {e}")
+            return None
+
+        booked = {}
+        for dentist, day, clock, duration in rows:
+            booked.setdefault((dentist, date.fromisoformat(day)), {})[time.fromisoformat(clock)] = duration
+        return booked
+
+    def get_booked_range(self, dentists, start, end):
+        """Get booked times for many dentists over a date range in a single query"""
+        dentists = list(dict.fromkeys(dentists))
+        if not dentists or start > end:
+            return {}
+
+        try:
+            with self.lock:
+                rows = self.conn.execute(f"""
+                    SELECT dentist, appointment_date, appointment_time, duration_minutes FROM appointments
+                    WHERE appointment_date BETWEEN ? AND ?
+                    AND dentist IN ({", ".join("?" * len(dentists))})
+                    AND status IN ('Pending', 'Confirmed')
+                """, (_day(start), _day(end), *dentists)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching booked slots: {e}")
+            return None
+
+        booked = {}
+        for dentist, day, clock, duration in rows:
+            booked.setdefault((dentist, date.fromisoformat(day)), {})[time.fromisoformat(clock)] = duration
+        return booked
+
+    def check_slot_available(self, dentist, date, time, duration=DEFAULT_DURATION):
+        """Check if duration minutes from time are free"""
+        try:
+            with self.lock:
+                return not self._day_intervals(dentist, date).conflicts(minutes(time), minutes(time) + duration)
+        except sqlite3.Error as e:
+            print(f"Error checking slot: {e}")
+            return False
+
+    def _day_intervals(self, dentist, day, exclude=None):
+        rows = self.conn.execute("""
+            SELECT appointment_time, duration_minutes FROM appointments
+            WHERE dentist = ? AND appointment_date = ? AND status IN ('Pending', 'Confirmed')
+            AND appointment_id IS NOT ?
+        """, (dentist, _day(day), exclude)).fetchall()
+        return DayIntervals.from_booked({time.fromisoformat(clock): duration for clock, duration in rows})
+
+    def _check_reactivation(self, appointment_uuids, status):
+        """Raise if status would make an inactive one of appointment_uuids overlap an active booking"""
+        if status not in ACTIVE_STATUSES:
+            return
+        rows = self.conn.execute(f"""
+            SELECT appointment_id, dentist, appointment_date, appointment_time, duration_minutes
+            FROM appointments
+            WHERE appointment_uuid IN ({", ".join("?" * len(appointment_uuids))})
+            AND status NOT IN ('Pending', 'Confirmed')
+        """, appointment_uuids).fetchall()
+        days = {}
+        for appointment_id, dentist, day, clock, duration in rows:
+            if (dentist, day) not in days:
+                days[(dentist, day)] = self._day_intervals(dentist, date.fromisoformat(day), exclude=appointment_id)
+            start = minutes(time.fromisoformat(clock))
+            if days[(dentist, day)].conflicts(start, start + duration):
+                raise sqlite3.IntegrityError("slot already booked")
+            # Taken for the rest of this batch too
+            days[(dentist, day)].add(start, start + duration)
+
+    def update_appointment_status(self, appointment_uuid, status):
+        """Update appointment status, refusing to reactivate a booking over another one"""
+        try:
+            with self.lock, self.conn:
+                self._check_reactivation([appointment_uuid], status)
+                self.conn.execute(f"""
+                    UPDATE appointments SET status = ?, updated_at = {_NOW}
+                    WHERE appointment_uuid = ?
+                """, (status, appointment_uuid))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating status: {e}")
+            return False
+
+    def update_appointments_status(self, appointment_uuids, status):
+        """Update many appointments' status in one transaction - [(uuid, dentist, date, time)] updated"""
+        return self._bulk_write(appointment_uuids, "updating status", [
+            f"UPDATE appointments SET status = ?, updated_at = {_NOW} WHERE appointment_uuid IN ({{ids}})"
+        ], (status,), check=lambda batch: self._check_reactivation(batch, status))
+
+    def delete_appointments(self, appointment_uuids):
+        """Delete many appointments in one transaction - [(uuid, dentist, date, time)] deleted"""
+        return self._bulk_write(appointment_uuids, "deleting appointments", [
+            f"{_TOMBSTONE_INSERT} WHERE appointment_uuid IN ({{ids}})",
+            "DELETE FROM appointments WHERE appointment_uuid IN ({ids})"
+        ])
+
+    def _bulk_write(self, appointment_uuids, action, statements, params=(), check=None):
+        """Run statements (with {ids} as placeholders) per batch of ids, all in one transaction
+
+        check(batch), if given, runs before each batch's statements; raising
+        from it rolls the whole transaction back.
+        """
+        appointment_uuids = list(dict.fromkeys(appointment_uuids))
+        affected = []
+        try:
+            with self.lock, self.conn:
+                for batch in chunks(appointment_uuids):
+                    ids = ", ".join("?" * len(batch))
+                    affected += self.conn.execute(f"""
+                        SELECT appointment_uuid, dentist, appointment_date, appointment_time
+                        FROM appointments WHERE appointment_uuid IN ({ids})
+                    """, batch).fetchall()
+                    if check:
+                        check(batch)
+                    for statement in statements:
+                        self.conn.execute(statement.format(ids=ids), (*params, *batch))
+        except sqlite3.Error as e:
+            print(f"Error {action}: {e}")
+            return False
+        return [(uuid, dentist, date.fromisoformat(day), time.fromisoformat(clock))
+                for uuid, dentist, day, clock in affected]
+
+    def delete_appointment_by_email(self, email):
+        """Delete patient's appointments by email - [(uuid, dentist, date, time)] deleted"""
+        try:
+            with self.lock, self.conn:
+                result = self.conn.execute("SELECT patient_id FROM patients WHERE email_normalized = ?",
+                                           (normalize_email(email),)).fetchone()
+                if not result:
+                    return False
+                rows = self.conn.execute("""
+                    SELECT appointment_uuid, dentist, appointment_date, appointment_time
+                    FROM appointments WHERE patient_id = ?
+                """, result).fetchall()
+                self.conn.execute(f"{_TOMBSTONE_INSERT} WHERE patient_id = ?", result)
+                self.conn.execute("DELETE FROM appointments WHERE patient_id = ?", result)
+            return [(uuid, dentist, date.fromisoformat(day), time.fromisoformat(clock))
+                    for uuid, dentist, day, clock in rows]
+        except sqlite3.Error as e:
+            print(f"Error deleting appointment: {e}")
+            return False
+
+    def delete_appointment_by_uuid(self, appointment_uuid):
+        """Delete specific appointment by UUID, or by the id it had before re-keying"""
+        try:
+            with self.lock, self.conn:
+                self.conn.execute(f"{_TOMBSTONE_INSERT} WHERE appointment_uuid = ? OR legacy_uuid = ?",
+                                  (appointment_uuid, appointment_uuid))
+                self.conn.execute("DELETE FROM appointments WHERE appointment_uuid = ? OR legacy_uuid = ?",
+                                  (appointment_uuid, appointment_uuid))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error deleting appointment: {e}")
+            return False
+
+    def count_appointments(self, view=None):
+        """Count all appointments, or those passing view's filters"""
+        with self.lock:
+            if view is None or not view.filtered:
+                return self.conn.execute("SELECT COUNT(*) FROM appointments").fetchone()[0]
+            where, _, params = listing_clauses(view, mark="?", day=_day)
+            return self.conn.execute(f"""
+                SELECT COUNT(*) FROM appointments a
+                JOIN patients p ON a.patient_id = p.patient_id
+                {where}
+            """, params).fetchone()[0]
+
+    def get_appointments_page(self, after=None, limit=50, before=None, view=None):
+        """Get one keyset page of appointments in view's order (default newest first)"""
+        upwards = after is None and before is not None
+        where, order, params = listing_clauses(view or DEFAULT_VIEW, after if after is not None else before,
+                                               before=upwards, mark="?", day=_day, clock=_clock,
+                                               nocase=" COLLATE NOCASE")
+        with self.lock:
+            rows = self.conn.execute(f"""
+                {_LISTING}
+                {where}
+                {order}
+                LIMIT ?
+            """, (*params, limit)).fetchall()
+        rows = [_listing_row(row) for row in rows]
+        if upwards:
+            rows.reverse()
+        return rows
+
+    def search_appointments(self, query, limit=20, offset=0):
+        """Full-text search over reasons and patient names, best match (lowest bm25) first"""
+        # Quote each word so FTS5 operators typed into the search box stay plain text
+        match = " OR ".join(f'"{word}"' for word in tokenize(query))
+        if not match:
+            return []
+        try:
+            with self.lock:
+                rows = self.conn.execute(f"""
+                    {_LISTING}
+                    JOIN appointment_search s ON s.rowid = a.appointment_id
+                    WHERE appointment_search MATCH ?
+                    ORDER BY s.rank, a.appointment_date DESC, a.appointment_time DESC, a.appointment_id DESC
+                    LIMIT ? OFFSET ?
+                """, (match, limit, offset)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching appointments: {e}")
+            return []
+        return [_listing_row(row) for row in rows]
+
+    def get_changes_since(self, watermark=None):
+        """Get appointments changed and ids deleted since a watermark - STALE_WATERMARK if too old"""
+        try:
+            with self.lock:
+                # Writers hold the same lock, so nothing can commit behind the watermark
+                new_watermark, cutoff = self.conn.execute(f"""
+                    SELECT {_NOW}, strftime('%Y-%m-%d %H:%M:%f', 'now', '-{TOMBSTONE_RETENTION_SECONDS} seconds')
+                """).fetchone()
+                with self.conn:
+                    self.conn.execute("DELETE FROM appointment_tombstones WHERE deleted_at < ?", (cutoff,))
+                if watermark is None:
+                    return [], [], new_watermark
+                if watermark < cutoff:
+                    return STALE_WATERMARK
+                changed = self.conn.execute(f"{_LISTING} WHERE a.updated_at >= ?", (watermark,)).fetchall()
+                deleted = self.conn.execute(
+                    "SELECT appointment_uuid FROM appointment_tombstones WHERE deleted_at >= ?",
+                    (watermark,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching changes: {e}")
+            return None
+        return [_listing_row(row) for row in changed], [row[0] for row in deleted], new_watermark
+
+    def get_roster(self):
+        """Get active dentists with their weekly hours and breaks"""
+        try:
+            with self.lock:
+                dentists = [row[0] for row in self.conn.execute(
+                    "SELECT name FROM dentists WHERE active ORDER BY dentist_id")]
+                periods = [self.conn.execute(f"""
+                    SELECT d.name, t.weekday, t.start_time, t.end_time
+                    FROM {table} t JOIN dentists d ON t.dentist_id = d.dentist_id
+                    WHERE d.active
+                """).fetchall() for table in ("dentist_hours", "dentist_breaks")]
+        except sqlite3.Error as e:
+            print(f"Error fetching roster: {e}")
+            return None
+        hours, breaks = ([(name, weekday, time.fromisoformat(start), time.fromisoformat(end))
+                          for name, weekday, start, end in rows] for rows in periods)
+        return dentists, hours, breaks
+
+    def get_leave(self):
+        """Get leave days, dentist None for clinic holidays"""
+        try:
+            with self.lock:
+                rows = self.conn.execute("""
+                    SELECT d.name, l.leave_date FROM dentist_leave l
+                    JOIN dentists d ON l.dentist_id = d.dentist_id
+                    UNION ALL
+                    SELECT NULL, holiday_date FROM clinic_holidays
+                """).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching leave: {e}")
+            return None
+        return [(dentist, date.fromisoformat(day)) for dentist, day in rows]
+
+    def add_dentist(self, name):
+        """Add a dentist, or re-activate one"""
+        return self._write_roster("""
+            INSERT INTO dentists (name) VALUES (?)
+            ON CONFLICT (name) DO UPDATE SET active = 1
+        """, (name,))
+
+    def set_working_hours(self, dentist, weekday, start, end):
+        """Set a dentist's hours for a weekday; start None makes it a day off"""
+        if start is None:
+            return self._write_roster("""
+                DELETE FROM dentist_hours
+                WHERE dentist_id = (SELECT dentist_id FROM dentists WHERE name = ?) AND weekday = ?
+            """, (dentist, weekday))
+        return self._write_roster("""
+            INSERT OR REPLACE INTO dentist_hours (dentist_id, weekday, start_time, end_time)
+            SELECT dentist_id, ?, ?, ? FROM dentists WHERE name = ?
+        """, (weekday, _clock(start), _clock(end), dentist))
+
+    def add_break(self, dentist, weekday, start, end):
+        """Add a recurring break to a dentist's weekday"""
+        return self._write_roster("""
+            INSERT INTO dentist_breaks (dentist_id, weekday, start_time, end_time)
+            SELECT dentist_id, ?, ?, ? FROM dentists WHERE name = ?
+        """, (weekday, _clock(start), _clock(end), dentist))
+
+    def set_leave(self, dentist, day, on_leave=True, reason=""):
+        """Record or clear a leave day; dentist None is a clinic holiday"""
+        if dentist is None:
+            if on_leave:
+                return self._write_roster("INSERT OR IGNORE INTO clinic_holidays (holiday_date, name) VALUES (?, ?)",
+                                          (_day(day), reason))
+            return self._write_roster("DELETE FROM clinic_holidays WHERE holiday_date = ?", (_day(day),))
+        if on_leave:
+            return self._write_roster("""
+                INSERT OR IGNORE INTO dentist_leave (dentist_id, leave_date, reason)
+                SELECT dentist_id, ?, ? FROM dentists WHERE name = ?
+            """, (_day(day), reason, dentist))
+        return self._write_roster("""
+            DELETE FROM dentist_leave
+            WHERE dentist_id = (SELECT dentist_id FROM dentists WHERE name = ?) AND leave_date = ?
+        """, (dentist, _day(day)))
+
+    def _write_roster(self, query, params):
+        try:
+            with self.lock, self.conn:
+                self.conn.execute(query, params)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating roster: {e}")
+            return False
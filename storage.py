@@ -0,0 +1,354 @@
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+from intervals import DayIntervals, minutes
+
+# reserve_appointment() outcomes
+RESERVED = "reserved"
+SLOT_TAKEN = "slot_taken"
+RESERVE_FAILED = "failed"
+UNAVAILABLE = "unavailable"  # outside the dentist's hours, or on leave
+DUPLICATE_ID = "duplicate_id"  # appointment_uuid already in use - retry with a new id
+NOT_FOUND = "not_found"  # move_appointment() on an id that doesn't exist
+STALE_WATERMARK = "stale_watermark"  # get_changes_since() from before the tombstones kept - reload instead
+
+# Deletes are remembered this long for get_changes_since() - far longer than the dashboard's poll interval
+TOMBSTONE_RETENTION_SECONDS = 3600
+
+# Statuses that hold a slot; Declined appointments free it
+ACTIVE_STATUSES = ("Pending", "Confirmed")
+
+# Length of a booking made without a service, in minutes (one slot)
+DEFAULT_DURATION = 30
+
+# Most ids bound into one IN (...) list by the bulk operations
+BATCH_SIZE = 500
+
+
+def normalize_email(email):
+    """Form an email is looked up by - case and surrounding spaces don't make another patient"""
+    return email.strip().lower()
+
+
+def chunks(items, size=BATCH_SIZE):
+    """items (a list) in consecutive slices of at most size"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Sortable listing columns -> (row index, SQL column); every sort ends with date, time, appointment_id
+SORT_COLUMNS = {
+    "name": (1, "p.name"),
+    "email": (2, "p.email"),
+    "dentist": (5, "a.dentist"),
+    "status": (6, "a.status"),
+}
+
+
+@dataclass(frozen=True)
+class ListingView:
+    """Filters and sort order of an appointment listing - the default is everything, newest first
+
+    search is a prefix of the patient's name or email, matched without case.
+    start/end bound the appointment date, inclusive. sort is "date" or a key
+    of SORT_COLUMNS, whose text is ordered without case (see order_key()).
+    """
+    status: Optional[str] = None
+    dentist: Optional[str] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    search: Optional[str] = None
+    sort: str = "date"
+    descending: bool = True
+
+    @property
+    def filtered(self):
+        return bool(self.status or self.dentist or self.start or self.end or self.search)
+
+    def cursor(self, row):
+        """Keyset cursor of a listing row in this view's order"""
+        key = (row[3], row[4], row[-1])
+        if self.sort == "date":
+            return key
+        return (row[SORT_COLUMNS[self.sort][0]],) + key
+
+    def order_key(self, cursor):
+        """What a cursor is ordered by: the sort column's text without case, as MySQL's collation does"""
+        if self.sort == "date":
+            return tuple(cursor)
+        return (cursor[0].casefold(),) + tuple(cursor[1:])
+
+    def matches(self, row):
+        """True if a listing row passes the filters"""
+        if self.status and row[6] != self.status or self.dentist and row[5] != self.dentist:
+            return False
+        if self.start and row[3] < self.start or self.end and row[3] > self.end:
+            return False
+        if self.search:
+            prefix = self.search.casefold()
+            return row[1].casefold().startswith(prefix) or row[2].casefold().startswith(prefix)
+        return True
+
+
+DEFAULT_VIEW = ListingView()
+
+
+def like_prefix(text):
+    """LIKE pattern for values starting with text, for use with ESCAPE '!'"""
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+
+
+def listing_clauses(view, key=None, before=False, mark="%s", day=lambda d: d, clock=lambda t: t, nocase=""):
+    """WHERE and ORDER BY for a view over appointments a JOIN patients p, plus the parameters
+
+    key is the keyset cursor to continue from - rows after it in the view's
+    order, or just before it with before=True (then ORDER BY runs backwards
+    and the caller reverses the rows). day/clock convert dates/times to the
+    driver's representation. nocase is appended to the text sort column
+    where the database's default collation minds case (" COLLATE NOCASE").
+    """
+    conditions, params = [], []
+    for column, value in (("a.status", view.status), ("a.dentist", view.dentist)):
+        if value:
+            conditions.append(f"{column} = {mark}")
+            params.append(value)
+    if view.start:
+        conditions.append(f"a.appointment_date >= {mark}")
+        params.append(day(view.start))
+    if view.end:
+        conditions.append(f"a.appointment_date <= {mark}")
+        params.append(day(view.end))
+    if view.search:
+        # Prefix LIKE can use the name and email indexes
+        prefix = like_prefix(view.search)
+        conditions.append(f"(p.name LIKE {mark} ESCAPE '!' OR p.email LIKE {mark} ESCAPE '!')")
+        params += [prefix, prefix]
+
+    columns = ["a.appointment_date", "a.appointment_time", "a.appointment_id"]
+    if view.sort != "date":
+        columns.insert(0, SORT_COLUMNS[view.sort][1] + nocase)
+    descending = view.descending != before
+    if key is not None:
+        # Spelled out as c1 < v1 OR (c1 = v1 AND (c2 < v2 OR ...)) so the index can seek on it
+        *lead, key_day, key_clock, key_id = key
+        values = [*lead, day(key_day), clock(key_clock), key_id]
+        op = "<" if descending else ">"
+        condition = f"{columns[-1]} {op} {mark}"
+        params_tail = [values[-1]]
+        for column, value in zip(reversed(columns[:-1]), reversed(values[:-1])):
+            condition = f"{column} {op} {mark} OR ({column} = {mark} AND ({condition}))"
+            params_tail = [value, value] + params_tail
+        conditions.append(f"({condition})")
+        params += params_tail
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order = "ORDER BY " + ", ".join(f"{column} {'DESC' if descending else 'ASC'}" for column in columns)
+    return where, order, params
+
+
+class AppointmentStorage(ABC):
+    """Storage backend used by AppointmentManager.
+
+    Implemented by DatabaseManager (MySQL), SQLiteStorage and InMemoryStorage
+    with the same semantics: one active (Pending/Confirmed) booking per
+    dentist at any moment (bookings are [time, time + duration) intervals),
+    appointments removed with their patient, and deletes recorded as
+    tombstones for get_changes_since(), kept TOMBSTONE_RETENTION_SECONDS.
+
+    Listing rows are tuples of
+    (appointment_uuid, name, email, date, time, dentist, status, duration_minutes, appointment_id)
+    with date/time as datetime.date/datetime.time, newest first - only what
+    the admin table shows; get_appointment_details() has the rest.
+    """
+
+    # How many calls may usefully run at once (e.g. the connection pool size)
+    concurrency = 1
+
+    @abstractmethod
+    def add_patient(self, name, email, gender):
+        """Add new patient - True on success"""
+
+    @abstractmethod
+    def get_patient_by_email(self, email):
+        """(patient_id, name) for an email, or None"""
+
+    @abstractmethod
+    def get_patients(self, after=None, limit=BATCH_SIZE):
+        """(patient_id, name, email) of the patients with patient_id above after, in id order"""
+
+    @abstractmethod
+    def find_patients(self, prefix, limit=10):
+        """(name, email) of patients whose name or email starts with prefix, ignoring case"""
+
+    @abstractmethod
+    def get_appointment_by_uuid(self, appointment_uuid):
+        """Listing row of one appointment, or None"""
+
+    @abstractmethod
+    def get_appointment_details(self, appointment_uuid):
+        """(reason, booked_at, gender, patient_created_at) of one appointment, or None"""
+
+    @abstractmethod
+    def reserve_appointment(self, name, email, gender, appointment_uuid, date, time, dentist, reason,
+                            duration=DEFAULT_DURATION):
+        """Upsert the patient and book the interval atomically - RESERVED, SLOT_TAKEN, DUPLICATE_ID or RESERVE_FAILED"""
+
+    @abstractmethod
+    def move_appointment(self, appointment_uuid, date, time, dentist, duration=DEFAULT_DURATION, reason=None):
+        """Move a booking to a new interval atomically, keeping its id - RESERVED, SLOT_TAKEN, NOT_FOUND or RESERVE_FAILED
+
+        The moved appointment goes back to Pending; reason None keeps the old one.
+        """
+
+    @abstractmethod
+    def get_patient_appointments(self, email):
+        """Listing rows of one patient's appointments, newest first ([] if none, None on error)"""
+
+    @abstractmethod
+    def get_booked_slots(self, dentists, dates):
+        """{(dentist, date): {time: duration_minutes}} of active bookings, or None on error"""
+
+    @abstractmethod
+    def update_appointment_status(self, appointment_uuid, status):
+        """Set an appointment's status - True on success"""
+
+    @abstractmethod
+    def update_appointments_status(self, appointment_uuids, status):
+        """Set the status of many appointments in one transaction
+
+        Returns the updated [(uuid, dentist, date, time)], or False if the
+        update failed (then none of them changed).
+        """
+
+    @abstractmethod
+    def delete_appointments(self, appointment_uuids):
+        """Delete many appointments in one transaction - the deleted [(uuid, dentist, date, time)], or False"""
+
+    @abstractmethod
+    def delete_appointment_by_email(self, email):
+        """Delete every appointment of the patient with this email
+
+        Returns the deleted [(uuid, dentist, date, time)], or False if there is
+        no such patient or the delete failed.
+        """
+
+    @abstractmethod
+    def delete_appointment_by_uuid(self, appointment_uuid):
+        """Delete one appointment - True on success"""
+
+    @abstractmethod
+    def count_appointments(self, view=None):
+        """Number of appointments (passing view's filters)"""
+
+    @abstractmethod
+    def get_appointments_page(self, after=None, limit=50, before=None, view=None):
+        """Listing rows just past the cursor after in view's order (default newest first), or just before before
+
+        Cursors are ListingView.cursor() of a row - (date, time, appointment_id)
+        for the default view.
+        """
+
+    @abstractmethod
+    def search_appointments(self, query, limit=20, offset=0):
+        """Listing rows whose visit reason or patient name has a word of query, best match first
+
+        Ties go newest first. Ranked results have no stable keyset, so pages
+        are limit/offset.
+        """
+
+    @abstractmethod
+    def get_changes_since(self, watermark=None):
+        """(changed_rows, deleted_uuids, new_watermark), or None on error
+
+        Purges tombstones past the retention window; a watermark older than
+        that gets STALE_WATERMARK, as deletes since then may be forgotten.
+        """
+
+    @abstractmethod
+    def get_roster(self):
+        """(dentists, hours, breaks) with hours/breaks as [(dentist, weekday, start, end)], or None on error"""
+
+    @abstractmethod
+    def get_leave(self):
+        """[(dentist, date)] of leave days, dentist None for clinic holidays - None on error"""
+
+    @abstractmethod
+    def add_dentist(self, name):
+        """Add a dentist (or re-activate one) - True on success"""
+
+    @abstractmethod
+    def set_working_hours(self, dentist, weekday, start, end):
+        """Set a dentist's hours for a weekday (Monday = 0); start None makes it a day off"""
+
+    @abstractmethod
+    def add_break(self, dentist, weekday, start, end):
+        """Add a recurring break to a dentist's weekday - True on success"""
+
+    @abstractmethod
+    def set_leave(self, dentist, day, on_leave=True, reason=""):
+        """Record or clear a leave day; dentist None is a clinic holiday - True on success"""
+
+    def get_all_appointments(self):
+        """Every listing row, newest first"""
+        return list(self.iter_appointments())
+
+    def get_booked_times(self, dentist, date):
+        """{time: duration_minutes} booked for one dentist on one date, or None on error"""
+        booked = self.get_booked_slots([dentist], [date])
+        if booked is None:
+            return None
+        return booked.get((dentist, date), {})
+
+    def check_slot_available(self, dentist, date, time, duration=DEFAULT_DURATION):
+        """True if no active booking overlaps duration minutes from time (False on error)"""
+        booked = self.get_booked_times(dentist, date)
+        if booked is None:
+            return False
+        return not DayIntervals.from_booked(booked).conflicts(minutes(time), minutes(time) + duration)
+
+    def get_booked_range(self, dentists, start, end):
+        """get_booked_slots() for every date from start to end inclusive"""
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return self.get_booked_slots(dentists, dates)
+
+    def iter_appointments(self, batch_size=500):
+        """Yield every listing row newest first, one keyset page at a time"""
+        after = None
+        while True:
+            rows = self.get_appointments_page(after, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][3], rows[-1][4], rows[-1][-1])
+
+    def pool_stats(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+def open_storage(url=None, pool_size=5, pool_timeout=10.0):
+    """Create a storage backend from a URL (default: $DENTAL_DB, else MySQL)
+
+    "mysql"                       - DatabaseManager on the local MySQL server
+    "sqlite:///clinic.db"         - SQLiteStorage on a file (four slashes for an absolute path)
+    "sqlite:///:memory:"          - SQLiteStorage in memory
+    "memory"                      - InMemoryStorage
+
+    pool_size/pool_timeout only apply to MySQL.
+    """
+    url = url or os.environ.get("DENTAL_DB", "mysql")
+    if url == "mysql":
+        from database_manager import DatabaseManager
+        return DatabaseManager(pool_size=pool_size, pool_timeout=pool_timeout)
+    if url.startswith("sqlite:///"):
+        from sqlite_storage import SQLiteStorage
+        return SQLiteStorage(url[len("sqlite:///"):])
+    if url == "memory":
+        from memory_storage import InMemoryStorage
+        return InMemoryStorage()
+    raise ValueError(f"Unknown storage URL: {url}")
@@ -0,0 +1,68 @@
+import math
+import re
+from collections import Counter
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lower-cased words of text"""
+    return _WORD.findall((text or "").casefold())
+
+
+class TextIndex:
+    """Inverted index of word -> documents, for ranked full-text search.
+
+    A document (here an appointment id) is indexed from one or more text
+    fields. search() only visits the postings of the query's words and scores
+    them with BM25, so its cost follows the matches rather than the number of
+    documents. Not thread-safe - the owner holds its own lock.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings = {}  # word -> {doc: occurrences}
+        self.words = {}  # doc -> its distinct words, to unindex it
+        self.lengths = {}  # doc -> number of words
+        self._total = 0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, doc, *texts):
+        """Index doc from texts, replacing whatever it was indexed from before"""
+        self.remove(doc)
+        counts = Counter(word for text in texts for word in tokenize(text))
+        for word, occurrences in counts.items():
+            self.postings.setdefault(word, {})[doc] = occurrences
+        self.words[doc] = tuple(counts)
+        self.lengths[doc] = length = sum(counts.values())
+        self._total += length
+
+    def remove(self, doc):
+        for word in self.words.pop(doc, ()):
+            docs = self.postings[word]
+            del docs[doc]
+            if not docs:
+                del self.postings[word]
+        self._total -= self.lengths.pop(doc, 0)
+
+    def search(self, query):
+        """{doc: score} of the documents holding any word of query - higher is a better match"""
+        if not self.lengths:
+            return {}
+        count = len(self.lengths)
+        average = self._total / count or 1
+        scores = {}
+        for word in set(tokenize(query)):
+            docs = self.postings.get(word)
+            if not docs:
+                continue
+            # Rare words weigh more; repeats saturate and long documents are damped
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, occurrences in docs.items():
+                damping = self.K1 * (1 - self.B + self.B * self.lengths[doc] / average)
+                scores[doc] = scores.get(doc, 0.0) + idf * occurrences * (self.K1 + 1) / (occurrences + damping)
+        return scores